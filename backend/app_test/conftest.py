@@ -4,10 +4,13 @@ from typing import List
 from uuid import UUID
 
 import pytest
+import pytest_asyncio
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
-from sqlmodel import Session, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.api.core import logger, in_test_ctx
 from src.api.core.config import get_settings
@@ -38,7 +41,7 @@ async def on_startup_test(app: FastAPI):
 # -----------------------------
 @pytest.fixture(scope="function")
 def test_engine(tmp_path):
-    """Provide a temporary SQLite engine for testing."""
+    """Provide a temporary SQLite engine for testing (used for schema setup)."""
     url = f"sqlite:///{tmp_path}/test.db"
     engine = create_engine(
         url,
@@ -50,16 +53,24 @@ def test_engine(tmp_path):
     engine.dispose()
 
 
-@pytest.fixture(scope="function")
-def db_session(test_engine):
-    """Provide a new SQLModel session for each test with isolation."""
-    with Session(test_engine, expire_on_commit=False) as session:
+@pytest_asyncio.fixture(scope="function")
+async def async_test_engine(test_engine):
+    """Provide an async engine on the same temporary SQLite database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{test_engine.url.database}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session(async_test_engine):
+    """Provide a new async SQLModel session for each test with isolation."""
+    async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
         yield session
-        session.rollback()
+        await session.rollback()
 
 
 @pytest.fixture(autouse=True)
-def _clean_db(db_session, test_engine):
+def _clean_db(test_engine):
     """Automatically reset database tables between tests."""
     logger.debug("Cleaning Database")
     Base.metadata.drop_all(test_engine)
@@ -149,7 +160,7 @@ def get_storage_service(storage_mode, cloud_storage_service, local_storage):
 
 
 @pytest.fixture(scope="function")
-def test_client(db_session, get_storage_service, storage_mode,):
+def test_client(async_test_engine, get_storage_service, storage_mode,):
     """
     Provide a configured FastAPI TestClient with overridden dependencies
     for both local and cloud storage modes.
@@ -158,11 +169,15 @@ def test_client(db_session, get_storage_service, storage_mode,):
     app.router.lifespan_context = on_startup_test
     # patch_app_settings # type: ignore
 
-    def override_get_db():
-        yield db_session
+    # The client serves requests on its own event loop, so each request gets
+    # its own session on the test database
+    async def override_get_db():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            yield session
 
     async def override_qm():
-        yield QuestionManager(db_session)
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as session:
+            yield QuestionManager(session)
 
     async def override_storage():
         yield get_storage_service
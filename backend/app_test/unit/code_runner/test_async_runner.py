@@ -0,0 +1,111 @@
+# --- Standard Library ---
+import asyncio
+import sys
+import time
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import async_runner, run_py
+from src.code_runner.async_runner import AdmissionGate, run_with_admission
+from src.code_runner.models import CodeRunException
+from src.code_runner.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Fixture: one running slot and one queue slot."""
+    gate = AdmissionGate(max_concurrency=1, max_queue=1)
+    monkeypatch.setattr(async_runner, "_gate", gate)
+    return gate
+
+
+@pytest.mark.asyncio
+async def test_event_loop_is_not_blocked(gate):
+    """Other coroutines keep running while question code blocks."""
+    run = asyncio.create_task(run_with_admission(time.sleep, 0.5))
+    started = time.monotonic()
+    await asyncio.sleep(0.05)
+    assert time.monotonic() - started < 0.3
+    await run
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected(gate):
+    running = asyncio.create_task(run_with_admission(time.sleep, 0.3))
+    queued = asyncio.create_task(run_with_admission(time.sleep, 0.01))
+    await asyncio.sleep(0.05)
+    with pytest.raises(CodeRunException) as excinfo:
+        await run_with_admission(time.sleep, 0.01)
+    assert excinfo.value.response.http_status_code == 429
+    await asyncio.gather(running, queued)
+    assert gate.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_kills_pooled_runtime(gate, monkeypatch, tmp_path):
+    """A client disconnect cancels the run and kills the worker executing it."""
+    pool = WorkerPool(
+        name="Python",
+        command=[sys.executable, "-m", "src.code_runner.py_worker"],
+        size=1,
+        timeout=30,
+        cwd=run_py.PROJECT_ROOT,
+    )
+    monkeypatch.setattr(run_py, "get_py_worker_pool", lambda: pool)
+    path = tmp_path / "server.py"
+    path.write_text("def generate():\n    while True:\n        pass\n")
+
+    disconnected = False
+
+    async def is_disconnected():
+        return disconnected
+
+    async def disconnect_soon():
+        nonlocal disconnected
+        await asyncio.sleep(0.5)
+        disconnected = True
+
+    try:
+        asyncio.create_task(disconnect_soon())
+        with pytest.raises(CodeRunException) as excinfo:
+            await run_with_admission(
+                run_py.run_generate_py_pooled, str(path), is_disconnected=is_disconnected
+            )
+        assert excinfo.value.response.http_status_code == 499
+        for _ in range(40):
+            if gate.stats()["running"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        assert pool.stats()["workers"] == 0
+        assert gate.stats()["running"] == 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hard_timeout(gate):
+    with pytest.raises(CodeRunException) as excinfo:
+        await run_with_admission(time.sleep, 0.5, timeout=0.1)
+    assert excinfo.value.response.http_status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_timed_out_thread_run_keeps_its_slot(gate, tmp_path):
+    """In-process code cannot be interrupted, so its slot is freed only once it returns."""
+    path = tmp_path / "server.py"
+    path.write_text(
+        "import time\n\ndef generate():\n    time.sleep(0.5)\n"
+        "    return {'params': {}, 'correct_answers': {}}\n"
+    )
+    with pytest.raises(CodeRunException) as excinfo:
+        await run_with_admission(run_py.run_generate_py, str(path), timeout=0.1)
+    assert excinfo.value.response.http_status_code == 504
+    assert gate.stats()["running"] == 1
+
+    # The next run waits for the abandoned one instead of running next to it
+    started = time.monotonic()
+    await run_with_admission(time.sleep, 0)
+    assert time.monotonic() - started >= 0.3
+    assert gate.stats()["running"] == 0
@@ -0,0 +1,101 @@
+# --- Standard Library ---
+import json
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.api.database import question as qdb
+from src.api.web.run_question_server import collect_catalog_targets
+from src.code_runner.catalog_tests import (
+    find_server_files,
+    iter_catalog_report,
+    main,
+    run_catalog_test,
+)
+
+TEMPLATE = """
+def generate(n=None):
+    return {{"params": {{}}, "correct_answers": {{}}, "test_results": {{"pass": {passed}, "message": "checked"}}}}
+"""
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Fixture: a catalog with a passing, a failing and a broken question."""
+    for name, source in {
+        "passes": TEMPLATE.format(passed="True"),
+        "fails": TEMPLATE.format(passed="False"),
+        "broken": "def generate(:\n",
+    }.items():
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "server.py").write_text(source)
+    (tmp_path / "no_server").mkdir()
+    return tmp_path
+
+
+def test_find_server_files_names_targets_by_directory(catalog):
+    targets = list(find_server_files(catalog, ["python"]))
+    assert [t.question_id for t in targets] == ["broken", "fails", "passes"]
+    assert {t.language for t in targets} == {"python"}
+
+
+def test_run_catalog_test_classifies_outcomes(catalog):
+    results = {
+        t.question_id: run_catalog_test(t) for t in find_server_files(catalog)
+    }
+    assert results["passes"].status == "pass"
+    assert results["fails"].status == "fail"
+    assert results["broken"].status == "error"
+    assert results["broken"].error
+    assert all(r.duration_ms >= 0 for r in results.values())
+
+
+def test_report_streams_one_line_per_question_then_summary(catalog):
+    lines = [json.loads(line) for line in iter_catalog_report(find_server_files(catalog), 2)]
+    assert sorted(line["question_id"] for line in lines[:-1]) == [
+        "broken",
+        "fails",
+        "passes",
+    ]
+    assert lines[-1]["summary"]["total"] == 3
+    assert lines[-1]["summary"]["passed"] == 1
+    assert lines[-1]["summary"]["failed"] == 1
+    assert lines[-1]["summary"]["errors"] == 1
+
+
+def test_cli_writes_report_and_fails_on_failures(catalog, tmp_path):
+    output = tmp_path / "report.jsonl"
+    assert main([str(catalog), "-p", "1", "-o", str(output)]) == 1
+    assert len(output.read_text().splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_collect_catalog_targets_reads_stored_server_files(
+    question_manager, local_storage, tmp_path, monkeypatch
+):
+    rows = [qdb.prepare_question({"title": t}) for t in ("server", "empty", "no path")]
+    rows[0][0].local_path = "questions/server"
+    rows[1][0].local_path = "questions/empty"
+    await question_manager.bulk_create_questions(rows, [], {})
+    local_storage.create_storage_path("questions/server")
+    local_storage.save_file(
+        "questions/server", "server.py", TEMPLATE.format(passed="True")
+    )
+    local_storage.create_storage_path("questions/empty")
+
+    async def no_path_query(*args, **kwargs):
+        raise AssertionError("the storage path is read from the question row")
+
+    monkeypatch.setattr(question_manager, "get_question_path", no_path_query)
+    targets = await collect_catalog_targets(
+        question_manager,
+        local_storage,
+        "local",
+        tmp_path / "work",
+        ["python", "javascript"],
+    )
+    assert [(t.question_id, t.language) for t in targets] == [
+        (str(rows[0][0].id), "python")
+    ]
+    assert "generate" in open(targets[0].path).read()
@@ -0,0 +1,61 @@
+# --- Standard Library ---
+import sys
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.api.core.config import get_settings
+from src.code_runner import forkserver, run_py
+from src.code_runner.models import CodeRunException
+from src.utils import logs_contain
+
+pytestmark = pytest.mark.skipif(
+    not forkserver.forkserver_available(), reason="forkserver start method unavailable"
+)
+
+
+def test_forked_execution_matches_in_process(py_script_path):
+    forked = forkserver.run_generate_py_forked(str(py_script_path))
+    direct = run_py.run_generate_py(str(py_script_path))
+    assert forked.success is True
+    assert forked.quiz_response == direct.quiz_response
+    assert logs_contain(forked.quiz_response.logs, "This is the value of a", "1")
+
+
+def test_runs_are_isolated(tmp_path):
+    """Module state set by one run is not visible to the next."""
+    path = tmp_path / "server.py"
+    path.write_text(
+        "import sys\n"
+        "def generate():\n"
+        "    seen = getattr(sys, 'seen', 0)\n"
+        "    sys.seen = seen + 1\n"
+        "    return {'params': {'seen': seen}, 'correct_answers': {}}\n"
+    )
+    first = forkserver.run_generate_py_forked(str(path))
+    second = forkserver.run_generate_py_forked(str(path))
+    assert first.quiz_response.params["seen"] == 0
+    assert second.quiz_response.params["seen"] == 0
+    assert not hasattr(sys, "seen")
+
+
+def test_batch_matches_in_process(tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text(
+        "import random\n"
+        "def generate():\n"
+        "    return {'params': {'a': random.random()}, 'correct_answers': {}}\n"
+    )
+    forked = forkserver.run_generate_py_forked_batch(str(path), [1, 2])
+    direct = run_py.run_generate_py_batch(str(path), [1, 2])
+    assert [r.quiz_response for r in forked] == [r.quiz_response for r in direct]
+
+
+def test_timeout_kills_child(monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "PY_WORKER_TIMEOUT", 1)
+    path = tmp_path / "server.py"
+    path.write_text("def generate():\n    while True:\n        pass\n")
+    with pytest.raises(CodeRunException) as excinfo:
+        forkserver.run_generate_py_forked(str(path))
+    assert excinfo.value.response.http_status_code == 504
@@ -0,0 +1,82 @@
+# --- Third-Party ---
+import numpy as np
+import pytest
+
+# --- Internal ---
+from src.code_runner.grading import grade_batch, numbers_within_tolerance
+from src.code_runner.models import GradeSubmission, QuizData
+
+
+def variant(correct_answers, nDigits=3, sigfigs=3) -> QuizData:
+    return QuizData(
+        params={}, correct_answers=correct_answers, nDigits=nDigits, sigfigs=sigfigs
+    )
+
+
+def test_numbers_use_the_looser_of_decimals_and_sigfigs():
+    correct = np.array([1234.0, 1234.0, 0.001234, 0.001234, 2.0, np.inf, np.nan])
+    submitted = np.array([1230.0, 1200.0, 0.0012, 0.002, 2.0004, np.inf, np.nan])
+    ok = numbers_within_tolerance(
+        correct, submitted, np.full(7, 3.0), np.full(7, 3.0)
+    )
+    assert ok.tolist() == [True, False, True, False, True, True, True]
+
+
+def test_batch_is_columnar_and_scored_per_submission():
+    variants = [
+        variant({"x": 3.14159, "unit": "m/s"}),
+        variant({"x": 2.71828, "v": [1, 2]}),
+    ]
+    submissions = [
+        GradeSubmission(variant=0, answers={"x": "3.14", "unit": " m/s"}),
+        GradeSubmission(variant=1, answers={"x": 2.9, "v": [1.0, 2.0]}),
+        GradeSubmission(variant=0, answers={"x": True}),
+    ]
+    result = grade_batch(variants, submissions)
+    assert result.count == 3
+    assert result.correct == {
+        "x": [True, False, False],
+        "unit": [True, None, False],
+        "v": [None, True, None],
+    }
+    assert result.score == [1.0, 0.5, 0.0]
+
+
+@pytest.mark.parametrize(
+    "correct, submitted, ok",
+    [
+        ({"a": 1, "b": 2}, {"a": 1, "b": 2.0001}, True),
+        ({"a": 1, "b": 2}, {"a": 1}, False),
+        ([1, 2, 3], [1, 2], False),
+        (True, 1, False),
+        ("A", "a", False),
+    ],
+)
+def test_nested_and_non_numeric_answers(correct, submitted, ok):
+    result = grade_batch(
+        [variant({"ans": correct})], [GradeSubmission(variant=0, answers={"ans": submitted})]
+    )
+    assert result.correct["ans"] == [ok]
+
+
+@pytest.mark.parametrize(
+    "correct, submitted, ok",
+    [
+        (3.0, 10**400, False),
+        (3.0, str(10**400), False),
+        (10**400, 10**400, True),
+        (10**400, 10**400 + 1, False),
+        (10**400, 1e308, False),
+        ([10**400, 2], [10**400, 2.0001], True),
+    ],
+)
+def test_integers_beyond_float64_are_graded(correct, submitted, ok):
+    result = grade_batch(
+        [variant({"ans": correct})], [GradeSubmission(variant=0, answers={"ans": submitted})]
+    )
+    assert result.correct["ans"] == [ok]
+
+
+def test_unknown_variant_is_rejected():
+    with pytest.raises(ValueError):
+        grade_batch([variant({"x": 1})], [GradeSubmission(variant=1, answers={})])
@@ -0,0 +1,121 @@
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import run_js
+from src.code_runner.models import CodeRunException
+from src.code_runner.worker_pool import WorkerPool
+from src.utils import logs_contain
+
+
+@pytest.fixture
+def js_pool():
+    """Fixture: a small Node.js worker pool torn down after each test."""
+    pool = WorkerPool(
+        name="JavaScript",
+        command=["node", str(run_js.JS_WORKER_SCRIPT)],
+        size=2,
+        timeout=5,
+        max_runs=3,
+    )
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def use_js_pool(monkeypatch, js_pool):
+    """Fixture: route `execute_javascript_pooled` through the test pool."""
+    monkeypatch.setattr(run_js, "get_js_worker_pool", lambda: js_pool)
+    return js_pool
+
+
+def test_pooled_execution_matches_execjs(use_js_pool, js_script_path):
+    """The pooled runner returns the same quiz data and logs as execjs."""
+    pooled = run_js.execute_javascript_pooled(js_script_path)
+    direct = run_js.execute_javascript(js_script_path)
+    assert pooled.success is True
+    assert pooled.quiz_response == direct.quiz_response
+    assert logs_contain(pooled.quiz_response.logs, "This is the value of a", "1")
+
+
+def test_pooled_execution_test_mode(use_js_pool, js_script_path):
+    resp = run_js.execute_javascript_pooled(js_script_path, isTesting=True)
+    assert resp.success is True
+    assert resp.quiz_response.test_results["pass"] == 1
+
+
+def test_worker_keeps_module_resident(use_js_pool, js_script_path):
+    """The second run on the same worker does not resend the source."""
+    run_js.execute_javascript_pooled(js_script_path)
+    run_js.execute_javascript_pooled(js_script_path)
+    (worker,) = use_js_pool._workers
+    assert len(worker.loaded) == 1
+    assert worker.runs == 2
+
+
+def test_worker_recycled_after_max_runs(use_js_pool, js_script_path):
+    for _ in range(use_js_pool.max_runs):
+        run_js.execute_javascript_pooled(js_script_path)
+    assert use_js_pool.stats()["workers"] == 0
+
+
+def test_missing_generate_is_rejected(use_js_pool, tmp_path):
+    path = tmp_path / "server.js"
+    path.write_text("var notGenerate = 1;")
+    with pytest.raises(CodeRunException) as excinfo:
+        run_js.execute_javascript_pooled(path)
+    assert excinfo.value.response.http_status_code == 422
+
+
+def test_compile_error_is_rejected(use_js_pool, tmp_path):
+    path = tmp_path / "server.js"
+    path.write_text("function generate( {")
+    with pytest.raises(CodeRunException) as excinfo:
+        run_js.execute_javascript_pooled(path)
+    assert "compile error" in excinfo.value.response.error
+
+
+def test_timeout_kills_worker(use_js_pool, tmp_path):
+    """An infinite loop times out and the stuck worker is replaced."""
+    use_js_pool.timeout = 1
+    path = tmp_path / "server.js"
+    path.write_text("function generate() { while (true) {} }")
+    with pytest.raises(CodeRunException) as excinfo:
+        run_js.execute_javascript_pooled(path)
+    assert excinfo.value.response.http_status_code == 504
+    assert use_js_pool.stats()["workers"] == 0
+
+
+def test_missing_runtime_reports_failed_dependency():
+    pool = WorkerPool(name="Missing", command=["definitely-not-a-runtime"], size=1)
+    with pytest.raises(CodeRunException) as excinfo:
+        pool.run("function generate() {}")
+    assert excinfo.value.response.http_status_code == 424
+
+
+def test_batch_is_reproducible(use_js_pool, tmp_path):
+    """Seeded batches replace Math.random, so the same seeds give the same variants."""
+    path = tmp_path / "server.js"
+    path.write_text(
+        "function generate() {"
+        " return { params: { a: Math.random() }, correct_answers: {} }; }"
+    )
+    first = run_js.execute_javascript_pooled_batch(path, [1, 2, 3])
+    second = run_js.execute_javascript_pooled_batch(path, [1, 2, 3])
+    assert [r.quiz_response for r in first] == [r.quiz_response for r in second]
+    assert len({r.quiz_response.params["a"] for r in first}) == 3
+
+
+def test_batch_reports_failed_variants_in_place(use_js_pool, tmp_path):
+    """A variant that fails validation does not fail the rest of the batch."""
+    path = tmp_path / "server.js"
+    path.write_text(
+        "if (Math.random() < 0.5) { throw new Error('bad seed'); }\n"
+        "function generate() {"
+        " const a = Math.random();"
+        " return a < 0.5 ? { params: { a }, correct_answers: {} } : { params: 'x' }; }"
+    )
+    responses = run_js.execute_javascript_pooled_batch(path, list(range(20)))
+    assert len(responses) == 20
+    assert {r.http_status_code for r in responses} == {200, 422, 500}
+    assert any("bad seed" in (r.error or "") for r in responses)
@@ -0,0 +1,156 @@
+# --- Standard Library ---
+import sys
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.api.core.config import get_settings
+from src.code_runner import run_js, run_py
+from src.code_runner.generate_call import call_generate
+from src.code_runner.limits import batch_timeout
+from src.code_runner.models import CodeRunException
+from src.code_runner.worker_pool import WorkerPool
+
+SPIN_PY = "def generate():\n    while True:\n        pass\n"
+HOG_PY = (
+    "def generate():\n"
+    "    data = bytearray(2 * 1024**3)\n"
+    "    return {'params': {}, 'correct_answers': {}}\n"
+)
+SLEEP_PY = "import time\n\ndef generate():\n    time.sleep(5)\n"
+SPIN_JS = "function generate() { while (true) {} }"
+SLOW_BODY_SPIN_JS = (
+    "const end = Date.now() + 600; while (Date.now() < end) {}\n" + SPIN_JS
+)
+
+
+@pytest.fixture
+def limited_py_pool(monkeypatch):
+    """Fixture: a one-worker Python pool with a 1 s CPU and 512 MB memory limit."""
+    pool = WorkerPool(
+        name="Python",
+        command=[sys.executable, "-m", "src.code_runner.py_worker"],
+        size=1,
+        timeout=10,
+        cwd=run_py.PROJECT_ROOT,
+        env={"RUNNER_MAX_CPU_SECONDS": "1", "RUNNER_MAX_MEMORY_MB": "512"},
+    )
+    monkeypatch.setattr(run_py, "get_py_worker_pool", lambda: pool)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def limited_js_pool(monkeypatch):
+    """Fixture: a one-worker Node.js pool with a 500 ms run limit."""
+    pool = WorkerPool(
+        name="JavaScript",
+        command=["node", str(run_js.JS_WORKER_SCRIPT)],
+        size=1,
+        timeout=10,
+        env={"JS_WORKER_RUN_TIMEOUT_MS": "500", "JS_WORKER_MAX_LOG_BYTES": "64"},
+    )
+    monkeypatch.setattr(run_js, "get_js_worker_pool", lambda: pool)
+    yield pool
+    pool.shutdown()
+
+
+def test_captured_logs_are_truncated():
+    def generate():
+        for i in range(100):
+            print("line", i)
+        return {}
+
+    _, logs = call_generate(generate, False, max_log_bytes=32)
+    assert len("\n".join(logs[:-1])) <= 32
+    assert logs[-1] == "[output truncated after 32 bytes]"
+
+
+def test_pooled_run_reports_metrics(limited_py_pool, py_script_path):
+    response = run_py.run_generate_py_pooled(str(py_script_path))
+    assert response.success is True
+    assert response.metrics.wall_time_ms >= response.metrics.cpu_time_ms * 0.5
+    assert response.metrics.peak_memory_bytes > 0
+
+
+def test_in_process_run_has_no_memory_figure(py_script_path):
+    metrics = run_py.run_generate_py(str(py_script_path)).metrics
+    assert metrics.wall_time_ms > 0
+    assert metrics.peak_memory_bytes is None
+
+
+def test_cpu_limit_stops_runaway_worker_code(limited_py_pool, tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text(SPIN_PY)
+    response = run_py.run_generate_py_pooled(str(path))
+    assert response.http_status_code == 422
+    assert "CPU limit" in response.error
+    # The worker survives and keeps serving
+    assert limited_py_pool.stats()["workers"] == 1
+
+
+def test_memory_limit_fails_the_run(limited_py_pool, tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text(HOG_PY)
+    response = run_py.run_generate_py_pooled(str(path))
+    assert response.http_status_code == 422
+    assert "memory limit" in response.error
+
+
+def test_wall_time_limit_ends_each_batch_variant(monkeypatch, tmp_path):
+    """A 1 s worker timeout gives every variant 0.8 s, however large the batch."""
+    pool = WorkerPool(
+        name="Python",
+        command=[sys.executable, "-m", "src.code_runner.py_worker"],
+        size=1,
+        timeout=10,
+        cwd=run_py.PROJECT_ROOT,
+        env={"PY_WORKER_TIMEOUT": "1"},
+    )
+    monkeypatch.setattr(run_py, "get_py_worker_pool", lambda: pool)
+    path = tmp_path / "server.py"
+    path.write_text(SLEEP_PY)
+    try:
+        responses = run_py.run_generate_py_pooled_batch(str(path), [1, 2, 3])
+    finally:
+        pool.shutdown()
+    assert [r.http_status_code for r in responses] == [422] * 3
+    assert all("time limit of 0.8 seconds" in r.error for r in responses)
+
+
+def test_batch_timeout_is_capped():
+    assert batch_timeout(10, 1, ceiling=30) == 10
+    assert batch_timeout(10, 500, ceiling=30) == 30
+    assert batch_timeout(10, 500, ceiling=5) == 10
+
+
+def test_js_time_limit_interrupts_generate(limited_js_pool, tmp_path):
+    path = tmp_path / "server.js"
+    path.write_text(SPIN_JS)
+    with pytest.raises(CodeRunException) as excinfo:
+        run_js.execute_javascript_pooled(path)
+    assert excinfo.value.response.http_status_code == 422
+    assert "time limit" in excinfo.value.response.error
+    assert limited_js_pool.stats()["workers"] == 1
+
+
+def test_js_run_budget_ends_before_the_pool_timeout(monkeypatch, tmp_path):
+    """Module body and generate share one budget that is shorter than the pool timeout."""
+    monkeypatch.setattr(get_settings(), "JS_WORKER_TIMEOUT", 1.0)
+    monkeypatch.setattr(run_js, "_js_pool", None)
+    path = tmp_path / "server.js"
+    path.write_text(SLOW_BODY_SPIN_JS)
+    try:
+        with pytest.raises(CodeRunException) as excinfo:
+            run_js.execute_javascript_pooled(path)
+    finally:
+        run_js.get_js_worker_pool().shutdown()
+    assert excinfo.value.response.http_status_code == 422
+    assert "time limit of 800 ms" in excinfo.value.response.error
+
+
+def test_js_run_reports_metrics_and_truncates_logs(limited_js_pool, js_script_path):
+    response = run_js.execute_javascript_pooled(js_script_path)
+    assert response.metrics.cpu_time_ms >= 0
+    assert response.quiz_response.logs[-1] == "[output truncated after 64 bytes]"
@@ -0,0 +1,91 @@
+# --- Standard Library ---
+import sys
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import module_cache, run_py
+from src.code_runner.module_cache import ModuleCache, invalidate_server_file
+from src.code_runner.utils import hash_source
+from src.code_runner.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fixture: a small cache registered for invalidation only during the test."""
+    cache = ModuleCache("test", max_entries=2)
+    monkeypatch.setattr(module_cache, "_CACHES", [cache])
+    return cache
+
+
+def test_cache_hit_skips_loader(cache):
+    calls = []
+    loader = lambda s: calls.append(s) or s.upper()
+    assert cache.get_or_load("a = 1", loader) == "A = 1"
+    assert cache.get_or_load("a = 1", loader) == "A = 1"
+    assert calls == ["a = 1"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_is_evicted(cache):
+    for source in ("a", "b", "a", "c"):
+        cache.get_or_load(source, str.upper)
+    assert cache.lookup(hash_source("b")) is None
+    assert cache.lookup(hash_source("a")) == "A"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_is_enforced():
+    cache = ModuleCache("bytes", max_bytes=sys.getsizeof("x" * 100) + 100)
+    cache.get_or_load("x" * 100, str)
+    cache.get_or_load("y" * 100, str)
+    assert cache.stats()["entries"] == 1
+
+
+def test_server_file_write_invalidates(cache):
+    cache.get_or_load("def generate(): pass", str)
+    assert invalidate_server_file("server.py", b"def generate(): pass") is True
+    assert cache.stats()["entries"] == 0
+
+
+def test_other_files_are_ignored(cache):
+    cache.get_or_load("{}", str)
+    assert invalidate_server_file("info.json", "{}") is False
+    assert cache.stats()["entries"] == 1
+
+
+def test_in_process_runner_reuses_compiled_code(monkeypatch, py_script_path):
+    """A second run of the same file compiles nothing but still executes fresh."""
+    cache = ModuleCache("python", max_entries=4)
+    monkeypatch.setattr(run_py, "PY_CODE_CACHE", cache)
+    first = run_py.run_generate_py(str(py_script_path))
+    second = run_py.run_generate_py(str(py_script_path))
+    assert first.quiz_response == second.quiz_response
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_pool_evicts_invalidated_module(monkeypatch, tmp_path):
+    """Invalidation makes the next run resend the source to the worker."""
+    pool = WorkerPool(
+        name="Python",
+        command=[sys.executable, "-m", "src.code_runner.py_worker"],
+        size=1,
+        cwd=run_py.PROJECT_ROOT,
+    )
+    monkeypatch.setattr(module_cache, "_CACHES", [pool])
+    monkeypatch.setattr(run_py, "get_py_worker_pool", lambda: pool)
+    path = tmp_path / "server.py"
+    source = "def generate():\n    return {'params': {}, 'correct_answers': {}}\n"
+    path.write_text(source)
+    try:
+        run_py.run_generate_py_pooled(str(path))
+        run_py.run_generate_py_pooled(str(path))
+        assert invalidate_server_file("server.py", source) is True
+        assert run_py.run_generate_py_pooled(str(path)).success is True
+        stats = pool.stats()
+        assert (stats["module_hits"], stats["module_misses"]) == (1, 2)
+    finally:
+        pool.shutdown()
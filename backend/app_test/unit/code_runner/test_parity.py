@@ -0,0 +1,85 @@
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner.models import QuizData
+from src.code_runner.parity import check_parity, compare_quiz_data, numbers_match
+
+PY = """
+def generate(n=None):
+    return {
+        "params": {"a": 2, "values": [1.0, 2.0]},
+        "correct_answers": {"x": 3.14159},
+        "test_results": {"pass": 1},
+    }
+"""
+JS = """
+function generate() {
+  return {
+    params: { a: 2, values: [1.0, %s] },
+    correct_answers: { x: 3.1416 },
+    test_results: { pass: 1 },
+  };
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        (3.14159, 3.1416, True),  # equal at 3 significant figures
+        (1000.0, 1001.0, True),  # within 3 significant figures
+        (1000.0, 1010.0, False),
+        (0.0001, 0.0004, True),  # below the nDigits resolution
+        (2.0, 2.5, False),
+        (float("nan"), float("nan"), True),
+    ],
+)
+def test_numbers_match_at_display_precision(a, b, expected):
+    assert numbers_match(a, b, nDigits=3, sigfigs=3) is expected
+
+
+def test_compare_reports_paths_of_divergences():
+    py = QuizData(params={"a": 1, "b": [1, 2]}, correct_answers={"x": "yes"})
+    js = QuizData(params={"a": 1, "b": [1, 3]}, correct_answers={"y": "yes"})
+    divergences = {d.path: d.reason for d in compare_quiz_data(py, js)}
+    assert divergences == {
+        "params.b[1]": "value",
+        "correct_answers.x": "missing in javascript",
+        "correct_answers.y": "missing in python",
+    }
+
+
+def test_type_mismatch_is_a_divergence():
+    py = QuizData(params={"a": "2"}, correct_answers={})
+    js = QuizData(params={"a": 2}, correct_answers={})
+    assert [d.reason for d in compare_quiz_data(py, js)] == ["type"]
+
+
+def test_equivalent_server_files_match(tmp_path):
+    (tmp_path / "server.py").write_text(PY)
+    (tmp_path / "server.js").write_text(JS % "2.0")
+    report = check_parity(tmp_path / "server.py", tmp_path / "server.js")
+    assert report.match is True
+    assert report.isTesting is True
+    assert report.python_metrics and report.javascript_metrics
+
+
+def test_divergent_server_files_are_reported(tmp_path):
+    (tmp_path / "server.py").write_text(PY)
+    (tmp_path / "server.js").write_text(JS % "2.5")
+    report = check_parity(tmp_path / "server.py", tmp_path / "server.js")
+    assert report.match is False
+    assert [(d.path, d.python, d.javascript) for d in report.divergences] == [
+        ("params.values[1]", 2.0, 2.5)
+    ]
+
+
+def test_failed_runtime_is_reported_not_diffed(tmp_path):
+    (tmp_path / "server.py").write_text("def generate(:\n")
+    (tmp_path / "server.js").write_text(JS % "2.0")
+    report = check_parity(tmp_path / "server.py", tmp_path / "server.js")
+    assert report.match is False
+    assert report.python_error
+    assert report.javascript_error is None
+    assert report.divergences == []
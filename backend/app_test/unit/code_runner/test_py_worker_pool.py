@@ -0,0 +1,129 @@
+# --- Standard Library ---
+import sys
+import threading
+import time
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import run_py
+from src.code_runner.models import CodeRunException
+from src.code_runner.worker_pool import WorkerPool
+from src.utils import logs_contain
+
+
+@pytest.fixture
+def py_pool():
+    """Fixture: a small Python worker pool torn down after each test."""
+    pool = WorkerPool(
+        name="Python",
+        command=[sys.executable, "-m", "src.code_runner.py_worker"],
+        size=2,
+        timeout=10,
+        max_runs=3,
+        max_queue=1,
+        cwd=run_py.PROJECT_ROOT,
+    )
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def use_py_pool(monkeypatch, py_pool):
+    """Fixture: route `run_generate_py_pooled` through the test pool."""
+    monkeypatch.setattr(run_py, "get_py_worker_pool", lambda: py_pool)
+    return py_pool
+
+
+def test_pooled_execution_matches_in_process(use_py_pool, py_script_path):
+    """The worker returns the same response as the in-process runner."""
+    pooled = run_py.run_generate_py_pooled(str(py_script_path))
+    direct = run_py.run_generate_py(str(py_script_path))
+    assert pooled.success is True
+    assert pooled.quiz_response == direct.quiz_response
+    assert logs_contain(pooled.quiz_response.logs, "This is the value of a", "1")
+
+
+def test_pooled_execution_does_not_leak_modules(use_py_pool, py_script_path):
+    before = set(sys.modules)
+    run_py.run_generate_py_pooled(str(py_script_path))
+    assert "generate" not in set(sys.modules) - before
+
+
+def test_syntax_error_reported(use_py_pool, tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text("def generate(:\n")
+    resp = run_py.run_generate_py_pooled(str(path))
+    assert resp.success is False
+    assert "Import error" in resp.error
+    assert resp.http_status_code == 500
+
+
+@pytest.mark.parametrize(
+    "kind, prefix, status_code",
+    [
+        ("compile", "Import error: ", 500),
+        ("runtime", "Error executing 'generate': ", 500),
+        ("limit", "", 422),
+        ("protocol", "Python worker protocol error: ", 500),
+    ],
+)
+def test_worker_error_kinds_are_mapped(kind, prefix, status_code):
+    resp = run_py.worker_error_response({"ok": False, "kind": kind, "error": "boom"})
+    assert resp.success is False
+    assert resp.error == f"{prefix}boom"
+    assert resp.http_status_code == status_code
+
+
+def test_missing_file_reported(use_py_pool, tmp_path):
+    resp = run_py.run_generate_py_pooled(str(tmp_path / "server.py"))
+    assert resp.http_status_code == 404
+
+
+def test_timeout_kills_worker(use_py_pool, tmp_path):
+    use_py_pool.timeout = 1
+    path = tmp_path / "server.py"
+    path.write_text("def generate():\n    while True:\n        pass\n")
+    with pytest.raises(CodeRunException) as excinfo:
+        run_py.run_generate_py_pooled(str(path))
+    assert excinfo.value.response.http_status_code == 504
+    assert use_py_pool.stats()["workers"] == 0
+
+
+def test_queue_is_bounded(use_py_pool, tmp_path):
+    """Once every worker is busy and the queue is full, callers get 503."""
+    path = tmp_path / "server.py"
+    path.write_text("import time\ndef generate():\n    time.sleep(1)\n")
+    threads = [
+        threading.Thread(target=run_py.run_generate_py_pooled, args=(str(path),))
+        for _ in range(use_py_pool.size + use_py_pool.max_queue)
+    ]
+    for t in threads:
+        t.start()
+    while use_py_pool.stats()["queued"] < use_py_pool.max_queue:
+        time.sleep(0.01)
+    with pytest.raises(CodeRunException) as excinfo:
+        run_py.run_generate_py_pooled(str(path))
+    assert excinfo.value.response.http_status_code == 503
+    for t in threads:
+        t.join()
+
+
+SEEDED_PY = """import random
+
+def generate():
+    return {"params": {"a": random.randint(0, 10**9)}, "correct_answers": {}}
+"""
+
+
+def test_batch_is_reproducible(use_py_pool, tmp_path):
+    """The same seeds produce the same variants, in process and on the pool."""
+    path = tmp_path / "server.py"
+    path.write_text(SEEDED_PY)
+    pooled = run_py.run_generate_py_pooled_batch(str(path), [1, 2, 3])
+    direct = run_py.run_generate_py_batch(str(path), [1, 2, 3])
+    assert [r.quiz_response for r in pooled] == [r.quiz_response for r in direct]
+    values = [r.quiz_response.params["a"] for r in pooled]
+    assert len(set(values)) == 3
+    assert use_py_pool._workers[0].runs == 1
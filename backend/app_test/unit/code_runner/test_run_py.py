@@ -45,3 +45,49 @@ def test_py_execution_logs_expected_output(py_execution_result):
     assert logs_contain(qr.logs, "This is a structure", "'params'")
     assert logs_contain(qr.logs, "This is a structure", "'a'", "1")
     assert logs_contain(qr.logs, "This is a structure", "'b'", "2")
+
+
+SEEDED_SLOW_PY = """
+import random
+import time
+import numpy as np
+from numpy.random import randint
+
+def generate():
+    a = random.randint(0, 10**9)
+    time.sleep(0.01)
+    b = np.random.randint(0, 10**6)
+    c = randint(0, 10**6)
+    return {"params": {"a": a, "b": int(b), "c": int(c)}, "correct_answers": {}}
+"""
+
+
+def test_seeded_in_process_runs_keep_global_generators(tmp_path):
+    """In-process runs draw from their own generators, not the shared global ones."""
+    import random
+
+    import numpy as np
+
+    path = tmp_path / "server.py"
+    path.write_text(SEEDED_SLOW_PY)
+    random_state, numpy_state = random.getstate(), np.random.get_state()[1].copy()
+    first = run_py.run_generate_py(str(path), seed=7)
+    second = run_py.run_generate_py(str(path), seed=7)
+    assert first.success is True
+    assert first.quiz_response == second.quiz_response
+    assert random.getstate() == random_state
+    assert (np.random.get_state()[1] == numpy_state).all()
+
+
+def test_seeded_in_process_runs_are_reproducible_concurrently(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "server.py"
+    path.write_text(SEEDED_SLOW_PY)
+    seeds = list(range(8))
+    expected = [run_py.run_generate_py(str(path), seed=s).quiz_response for s in seeds]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        concurrent = list(
+            executor.map(lambda s: run_py.run_generate_py(str(path), seed=s), seeds * 2)
+        )
+    assert [r.quiz_response for r in concurrent] == expected * 2
@@ -2,8 +2,8 @@ import pytest
 from pathlib import Path
 
 # --- Internal Imports ---
-from src.code_runner.runtime_switcher import run_generate
-from src.code_runner.models import CodeRunResponse, CodeRunException
+from src.code_runner.runtime_switcher import run_generate, run_generate_batch
+from src.code_runner.models import CodeRunResponse, CodeRunException, ServerSource
 
 
 # --- Fixtures ---
@@ -46,3 +46,30 @@ def test_execution_fails_with_wrong_runtime(script_path_wrong):
     path, language = script_path_wrong
     with pytest.raises(CodeRunException) as excinfo:
         resp = run_generate(path, language)
+
+
+def test_batch_returns_one_response_per_seed(script_path):
+    path, language = script_path
+    responses = run_generate_batch(path, language, [0, 1])
+    assert [r.success for r in responses] == [True, True]
+
+
+def test_in_memory_source_matches_file(script_path):
+    """A ServerSource runs like the file it was read from, without touching disk."""
+    path, language = script_path
+    source = ServerSource(filename=Path(path).name, content=Path(path).read_bytes())
+    from_file = run_generate(path, language, seed=3)
+    from_memory = run_generate(source, language, seed=3)
+    assert from_memory.success is True
+    assert from_memory.quiz_response == from_file.quiz_response
+    assert run_generate_batch(source, language, [3])[0].quiz_response == (
+        from_file.quiz_response
+    )
+
+
+def test_in_memory_source_with_wrong_extension_fails(script_path_wrong):
+    path, language = script_path_wrong
+    source = ServerSource(filename=Path(path).name, content=Path(path).read_bytes())
+    with pytest.raises(CodeRunException) as excinfo:
+        run_generate(source, language)
+    assert excinfo.value.response.http_status_code == 415
@@ -0,0 +1,150 @@
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner.generate_call import generate_args
+from src.code_runner.models import CodeRunException, ServerSource
+from src.code_runner.run_py import run_generate_py
+from src.code_runner.runtime_switcher import run_generate
+from src.code_runner.static_analysis import (
+    analyze_javascript_source,
+    analyze_python_source,
+    analyze_server_source,
+    known_generate_args,
+)
+
+PY = """
+import math
+from collections import OrderedDict
+import numpy.linalg as la
+
+def helper():
+    return 1
+
+def generate(n, scale=1, *, k=2):
+    return {"params": {"n": n}, "correct_answers": {}, "test_results": {"pass": 1}}
+"""
+
+
+def test_python_signature_and_imports():
+    analysis = analyze_python_source(PY)
+    assert analysis.valid and analysis.has_generate
+    assert (analysis.arity, analysis.required_args) == (3, 1)
+    assert analysis.imports == ["collections", "math", "numpy"]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "def generate():\n    pass\n",
+        "def generate(a, b=1):\n    pass\n",
+        "def generate(*args):\n    pass\n",
+        "def generate(a=0, /, b=1, **kw):\n    pass\n",
+    ],
+)
+def test_static_args_match_introspection(source):
+    analysis = analyze_python_source(source)
+    namespace: dict = {}
+    exec(source, namespace)
+    for isTesting in (True, False):
+        source_file = ServerSource(
+            filename="server.py", content=source.encode(), analysis=analysis
+        )
+        assert known_generate_args(source_file, isTesting) == generate_args(
+            namespace["generate"], isTesting
+        )
+
+
+def test_python_syntax_error_is_flagged():
+    analysis = analyze_python_source("def generate(:\n    pass\n")
+    assert not analysis.valid
+    assert "Syntax error in 'server.py' line 1" in analysis.error
+
+
+def test_python_missing_generate_is_flagged():
+    analysis = analyze_python_source("def make():\n    return {}\n")
+    assert not analysis.valid and not analysis.has_generate
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "generate = lambda: {}\n",
+        "from helpers import generate\n",
+        "from helpers import *\n",
+        "try:\n    def generate():\n        pass\nexcept Exception:\n    pass\n",
+        "def deco(f):\n    return f\n\n@deco\ndef generate(n):\n    pass\n",
+    ],
+)
+def test_dynamic_python_generate_has_no_static_signature(source):
+    analysis = analyze_python_source(source)
+    assert analysis.valid
+    assert analysis.arity is None
+    source_file = ServerSource(filename="server.py", content=b"", analysis=analysis)
+    assert known_generate_args(source_file, False) is None
+
+
+def test_javascript_generate_and_imports():
+    source = """
+    // function generate(a, b, c) in a comment does not count
+    const math = require("mathjs");
+    import _ from 'lodash';
+    function generate(options) {
+      return { params: {}, correct_answers: {} };
+    }
+    """
+    analysis = analyze_javascript_source(source, check_syntax=False)
+    assert analysis.valid and analysis.arity == 1
+    assert analysis.imports == ["lodash", "mathjs"]
+
+
+@pytest.mark.parametrize(
+    "source, valid",
+    [
+        ("const generate = () => ({ params: {}, correct_answers: {} });", True),
+        ("globalThis.generate = function () {};", True),
+        ("function generated() {}\nconst s = 'function generate() {}';", False),
+        ("if (generate == null) {}", False),
+    ],
+)
+def test_javascript_generate_detection(source, valid):
+    assert analyze_javascript_source(source, check_syntax=False).valid is valid
+
+
+def test_javascript_syntax_error_is_flagged():
+    analysis = analyze_javascript_source("function generate( {")
+    assert not analysis.valid
+    assert analysis.error.startswith("Syntax error in 'server.js'")
+
+
+def test_only_server_files_are_analyzed():
+    assert analyze_server_source("notes.txt", "hello") is None
+    assert analyze_server_source("server.py", PY).language == "python"
+
+
+def test_runner_uses_recorded_arguments():
+    source = (
+        "def generate(*args):\n"
+        "    return {'params': {'args': list(args)}, 'correct_answers': {},"
+        " 'test_results': {'pass': 1}}\n"
+    )
+    analysis = analyze_python_source(source)
+    # Pretend the upload-time analysis found no parameters; the runner must trust it
+    analysis.arity, analysis.required_args = 0, 0
+    server_source = ServerSource(
+        filename="server.py", content=source.encode(), analysis=analysis
+    )
+    response = run_generate_py(server_source, isTesting=True)
+    assert response.quiz_response.params == {"args": []}
+
+
+def test_broken_analysis_is_rejected_without_running():
+    source = ServerSource(
+        filename="server.py",
+        content=b"def generate(:",
+        analysis=analyze_python_source("def generate(:"),
+    )
+    with pytest.raises(CodeRunException) as exc:
+        run_generate(source, "python")
+    assert exc.value.response.http_status_code == 422
+    assert "Syntax error" in exc.value.response.error
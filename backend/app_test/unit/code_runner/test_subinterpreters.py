@@ -0,0 +1,114 @@
+# --- Standard Library ---
+import sys
+import threading
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import run_py, subinterpreters
+from src.code_runner.subinterpreters import SubinterpreterPool
+
+pytestmark = pytest.mark.skipif(
+    not subinterpreters.subinterpreters_available(),
+    reason="subinterpreters unavailable",
+)
+
+
+@pytest.fixture
+def sub_pool(monkeypatch):
+    """Fixture: a two-interpreter pool torn down after each test."""
+    pool = SubinterpreterPool(size=2, allowed_imports=[])
+    monkeypatch.setattr(subinterpreters, "get_subinterpreter_pool", lambda: pool)
+    yield pool
+    pool.shutdown()
+
+
+def write_server(tmp_path, source: str) -> str:
+    path = tmp_path / "server.py"
+    path.write_text(source)
+    return str(path)
+
+
+def test_matches_in_process(sub_pool, py_script_path):
+    sub = subinterpreters.run_generate_py_subinterpreter(str(py_script_path))
+    assert sub.success is True
+    direct = run_py.run_generate_py(str(py_script_path))
+    assert sub.quiz_response == direct.quiz_response
+
+
+def test_seeded_batch_matches_in_process(sub_pool, tmp_path):
+    path = write_server(
+        tmp_path,
+        "import random\n"
+        "def generate():\n"
+        "    return {'params': {'a': random.random()}, 'correct_answers': {}}\n",
+    )
+    sub = subinterpreters.run_generate_py_subinterpreter_batch(path, [1, 2])
+    direct = run_py.run_generate_py_batch(path, [1, 2])
+    assert [r.quiz_response for r in sub] == [r.quiz_response for r in direct]
+
+
+def test_state_does_not_leak_into_api(sub_pool, tmp_path):
+    path = write_server(
+        tmp_path,
+        "import sys\n"
+        "sys.leaked = True\n"
+        "def generate():\n"
+        "    return {'params': {}, 'correct_answers': {}}\n",
+    )
+    assert subinterpreters.run_generate_py_subinterpreter(path).success is True
+    assert not hasattr(sys, "leaked")
+
+
+@pytest.mark.parametrize(
+    "source, status_code",
+    [
+        ("def generate(:\n", 500),
+        ("x = 1\n", 422),
+        ("def generate():\n    raise ValueError('boom')\n", 500),
+    ],
+)
+def test_errors_match_in_process(sub_pool, tmp_path, source, status_code):
+    path = write_server(tmp_path, source)
+    sub = subinterpreters.run_generate_py_subinterpreter(path)
+    assert sub.http_status_code == status_code
+    assert sub.success is False
+
+
+def test_extension_imports_use_fallback(sub_pool, monkeypatch, tmp_path):
+    """Imports outside the allow list are re-run on the fallback backend."""
+    calls = []
+    monkeypatch.setattr(
+        subinterpreters,
+        "_fallback_runners",
+        lambda: (lambda *args: calls.append(args) or run_py.run_generate_py(*args), None),
+    )
+    path = write_server(
+        tmp_path,
+        "import numpy as np\n"
+        "def generate():\n"
+        "    return {'params': {'a': float(np.sqrt(4))}, 'correct_answers': {}}\n",
+    )
+    resp = subinterpreters.run_generate_py_subinterpreter(path)
+    assert resp.success is True
+    assert len(calls) == 1
+    assert sub_pool.stats()["fallbacks"] == 1
+
+
+def test_runs_in_parallel_threads(sub_pool, py_script_path):
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                subinterpreters.run_generate_py_subinterpreter(str(py_script_path))
+            )
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [r.success for r in results] == [True] * 4
+    assert sub_pool.stats()["interpreters"] <= sub_pool.size
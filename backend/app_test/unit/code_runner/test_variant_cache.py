@@ -0,0 +1,75 @@
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner import runtime_switcher
+from src.code_runner.models import QuizData
+from src.code_runner.variant_cache import VariantCache
+
+SEEDED_PY = """import random
+
+def generate():
+    return {"params": {"a": random.random()}, "correct_answers": {}}
+"""
+
+
+@pytest.fixture
+def variant_cache(monkeypatch):
+    cache = VariantCache(max_entries=2)
+    monkeypatch.setattr(runtime_switcher, "VARIANT_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def seeded_py(tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text(SEEDED_PY)
+    return path
+
+
+def quiz(a: int) -> QuizData:
+    return QuizData(params={"a": a}, correct_answers={})
+
+
+def test_lru_bound():
+    cache = VariantCache(max_entries=2)
+    for seed in range(3):
+        cache.put("h", "python", seed, quiz(seed))
+    assert cache.get("h", "python", 0) is None
+    assert cache.get("h", "python", 2) == quiz(2)
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db = tmp_path / "variants.db"
+    VariantCache(db_path=db).put("h", "python", 1, quiz(1))
+    cache = VariantCache(db_path=db)
+    assert cache.get("h", "python", 1) == quiz(1)
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_evict_drops_every_seed(tmp_path):
+    cache = VariantCache(db_path=tmp_path / "variants.db")
+    cache.put("h", "python", 1, quiz(1))
+    cache.put("h", "python", 2, quiz(2))
+    assert cache.evict("h") is True
+    assert cache.get("h", "python", 1) is None
+    assert VariantCache(db_path=tmp_path / "variants.db").get("h", "python", 2) is None
+
+
+def test_seeded_run_is_memoized(variant_cache, seeded_py):
+    first = runtime_switcher.run_generate(seeded_py, "python", seed=5)
+    second = runtime_switcher.run_generate(seeded_py, "python", seed=5)
+    assert first.quiz_response == second.quiz_response
+    assert variant_cache.stats()["hits"] == 1
+
+
+def test_unseeded_run_is_not_cached(variant_cache, seeded_py):
+    runtime_switcher.run_generate(seeded_py, "python")
+    assert variant_cache.stats()["entries"] == 0
+
+
+def test_batch_only_generates_missing_seeds(variant_cache, seeded_py):
+    single = runtime_switcher.run_generate(seeded_py, "python", seed=1)
+    batch = runtime_switcher.run_generate_batch(seeded_py, "python", [1, 2])
+    assert batch[0].quiz_response == single.quiz_response
+    assert variant_cache.stats()["hits"] == 1
@@ -0,0 +1,114 @@
+# --- Standard Library ---
+import asyncio
+
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner.models import QuizData, ServerSource
+from src.code_runner.runtime_switcher import run_generate
+from src.code_runner.utils import hash_source
+from src.code_runner.variant_pool import VariantPool, VariantPoolRefiller
+
+PY = b"""
+import random
+
+def generate():
+    return {"params": {"a": random.randint(0, 10**9)}, "correct_answers": {}}
+"""
+
+
+def quiz(a: int) -> QuizData:
+    return QuizData(params={"a": a}, correct_answers={})
+
+
+def test_pool_is_fifo_and_bounded():
+    pool = VariantPool(size=2)
+    assert pool.add("h", "python", [(1, quiz(1)), (2, quiz(2)), (3, quiz(3))]) == 2
+    assert pool.take("h", "python") == (1, quiz(1))
+    assert pool.take("h", "python") == (2, quiz(2))
+    assert pool.take("h", "python") is None
+    assert pool.stats()["hits"] == 2 and pool.stats()["misses"] == 1
+
+
+def test_pools_persist_and_are_evicted(tmp_path):
+    db_path = tmp_path / "pools.sqlite"
+    VariantPool(size=5, db_path=db_path).add("h", "python", [(7, quiz(7)), (8, quiz(8))])
+
+    restarted = VariantPool(size=5, db_path=db_path)
+    assert restarted.take("h", "python") == (7, quiz(7))
+    assert VariantPool(size=5, db_path=db_path).level("h", "python") == 1
+
+    assert restarted.evict("h")
+    assert VariantPool(size=5, db_path=db_path).level("h", "python") == 0
+
+
+@pytest.mark.asyncio
+async def test_refiller_fills_pool_with_reproducible_variants():
+    refiller = VariantPoolRefiller(VariantPool(size=4), batch_size=2)
+    source = ServerSource(filename="server.py", content=PY)
+    try:
+        assert await refiller.take(source, "python") is None  # empty on first use
+        for _ in range(200):
+            if refiller.pool.level(hash_source(PY), "python") == 4:
+                break
+            await asyncio.sleep(0.05)
+        seed, quiz_data = await refiller.take(source, "python")
+        rerun = run_generate(source, "python", seed=seed)
+        assert rerun.quiz_response.params == quiz_data.params
+    finally:
+        await refiller.stop()
+
+
+@pytest.mark.asyncio
+async def test_refiller_gives_up_on_broken_questions():
+    refiller = VariantPoolRefiller(VariantPool(size=3))
+    source = ServerSource(filename="server.py", content=b"def generate():\n    1 / 0\n")
+    try:
+        await refiller.take(source, "python")
+        for _ in range(200):
+            if refiller.failures:
+                break
+            await asyncio.sleep(0.05)
+        assert refiller.stats()["questions"] == 0
+        assert refiller.pool.level(hash_source(source.content), "python") == 0
+    finally:
+        await refiller.stop()
+
+
+@pytest.mark.asyncio
+async def test_refiller_serves_persisted_pools_off_the_event_loop(tmp_path, monkeypatch):
+    db_path = tmp_path / "pools.sqlite"
+    source = ServerSource(filename="server.py", content=PY)
+    VariantPool(size=5, db_path=db_path).add(
+        hash_source(PY), "python", [(7, quiz(7)), (8, quiz(8))]
+    )
+    refiller = VariantPoolRefiller(VariantPool(size=5, db_path=db_path))
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args):
+        offloaded.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    try:
+        assert await refiller.take(source, "python") == (7, quiz(7))
+        assert offloaded[0] == "take"
+    finally:
+        await refiller.stop()
+
+
+@pytest.mark.asyncio
+async def test_untracked_questions_leave_memory(monkeypatch):
+    refiller = VariantPoolRefiller(VariantPool(size=2), max_questions=1)
+    monkeypatch.setattr(refiller, "_ensure_running", lambda: None)
+    monkeypatch.setattr(refiller, "_wakeup", asyncio.Event())
+    first = ServerSource(filename="server.py", content=PY)
+    second = ServerSource(filename="server.py", content=PY + b"\n# changed\n")
+    refiller.pool.add(hash_source(first.content), "python", [(1, quiz(1))])
+
+    refiller.watch(first, "python")
+    refiller.watch(second, "python")
+    assert refiller.stats()["questions"] == 1
+    assert refiller.pool.stats()["pools"] == 0
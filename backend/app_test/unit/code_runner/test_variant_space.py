@@ -0,0 +1,80 @@
+# --- Third-Party ---
+import pytest
+
+# --- Internal ---
+from src.code_runner.models import ServerSource
+from src.code_runner.variant_cache import VARIANT_CACHE
+from src.code_runner.variant_space import (
+    VARIANT_SPACE_CACHE,
+    analyze_variant_space,
+    flatten_values,
+)
+
+PY = b"""
+import math
+import random
+
+def generate():
+    a = random.randint(-2, 2)
+    if a == 2:
+        raise ValueError("a is two")
+    return {
+        "params": {"a": a, "unit": random.choice(["m", "cm"])},
+        "correct_answers": {"root": math.sqrt(a) if a >= 0 else float("nan"), "v": [a, 1]},
+    }
+"""
+
+
+def test_nested_values_are_flattened_to_paths():
+    assert list(flatten_values("p", {"a": [1, {"b": 2}], "c": None})) == [
+        ("p.a[0]", 1),
+        ("p.a[1].b", 2),
+        ("p.c", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_report_summarizes_every_column():
+    source = ServerSource(filename="server.py", content=PY)
+    VARIANT_CACHE.clear()
+    report = await analyze_variant_space(source, "python", n=200, seed=5, chunk_size=64)
+
+    assert report.samples == 200 and 0 < report.failures < 200
+    assert len(report.errors) == 1 and "a is two" in report.errors[0]
+    assert report.duplicates > 0  # only a handful of distinct variants exist
+
+    a = report.columns["params.a"]
+    assert a.kind == "number" and a.count == 200 - report.failures
+    assert (a.min, a.max, a.distinct) == (-2, 1, 4)
+    assert a.zeros > 0 and a.negatives > 0
+    assert sum(a.histogram["counts"]) == a.count
+
+    root = report.columns["correct_answers.root"]
+    assert root.non_finite == a.negatives
+    assert report.columns["correct_answers.v[1]"].distinct == 1
+
+    unit = report.columns["params.unit"]
+    assert unit.kind == "other" and {v for v, _ in unit.top} == {"m", "cm"}
+
+    # Samples do not end up in the variant cache
+    assert VARIANT_CACHE.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reports_are_cached_until_the_file_changes():
+    source = ServerSource(filename="server.py", content=PY)
+    first = await analyze_variant_space(source, "python", n=20, seed=1)
+    again = await analyze_variant_space(source, "python", n=20, seed=1)
+    assert not first.cached and again.cached
+    assert again.columns == first.columns
+
+    VARIANT_SPACE_CACHE.evict(first.code_hash)
+    assert not (await analyze_variant_space(source, "python", n=20, seed=1)).cached
+
+
+@pytest.mark.asyncio
+async def test_unloadable_file_fails_every_sample():
+    source = ServerSource(filename="server.py", content=b"import missing_module_xyz\n")
+    report = await analyze_variant_space(source, "python", n=10)
+    assert report.failures == 10 and report.columns == {}
+    assert "missing_module_xyz" in report.errors[0]
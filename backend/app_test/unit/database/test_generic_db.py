@@ -1,6 +1,8 @@
 from src.api.models.models import Question
 from src.api.database import generic_db as gdb
 import pytest
+from sqlalchemy import event
+from sqlmodel import select
 from src.api.models.models import Topic,Language, QType
 
 def test_get_all_model_relationships():
@@ -41,9 +43,10 @@ async def test_get_all_model_relationship_data(
         {"target_cls": QType, "value": "Not a Qtype", "lookup_field": "name"},
     ],
 )
-def test_create_or_resolve(db_session, payload):
+@pytest.mark.asyncio
+async def test_create_or_resolve(db_session, payload):
     # Act
-    created_model, existed = gdb.create_or_resolve(
+    created_model, existed = await gdb.create_or_resolve(
         target_cls=payload["target_cls"],
         target_value=payload["value"],
         session=db_session,
@@ -71,3 +74,35 @@ def test_is_relationship(rel_attributes):
     )
 
 
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_or_resolve(db_session):
+    existing, _ = await gdb.create_or_resolve(Topic, "math", db_session)
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resolved = await gdb.bulk_create_or_resolve(
+            Topic, ["Math", "physics", " Physics ", "chemistry"], db_session
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Lookup, one insert for all missing names, lookup of the inserted rows
+    assert len(statements) == 3
+    assert resolved["Math"].id == existing.id
+    assert resolved["physics"] is resolved[" Physics "]
+    assert resolved["chemistry"].name == "chemistry"
+    await db_session.commit()
+    assert len((await db_session.exec(select(Topic))).all()) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_or_resolve_without_create(db_session):
+    await gdb.create_or_resolve(Language, "python", db_session)
+    assert await gdb.bulk_create_or_resolve(Language, ["Python"], db_session, create=False)
+    with pytest.raises(ValueError):
+        await gdb.bulk_create_or_resolve(Language, ["python", "rust"], db_session, create=False)
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+from src.api.database import database as db
+from src.api.database import profiling
+
+
+def test_histogram_buckets_and_quantiles():
+    hist = profiling.Histogram(bounds=(1, 10, 100))
+    for duration in [0.5] * 90 + [5] * 8 + [50, 500]:
+        hist.add(duration)
+    stats = hist.stats()
+    assert stats["buckets"] == {"<=1": 90, "<=10": 8, "<=100": 1, ">100": 1}
+    assert stats["p50_ms"] == 1
+    assert stats["p95_ms"] == 10
+    assert stats["p99_ms"] == 100
+    assert hist.quantile(1.0) == stats["max_ms"] == 500
+    assert profiling.Histogram().quantile(0.5) is None
+
+
+@pytest.mark.parametrize(
+    "parameters, executemany, shape",
+    [
+        ({"id": 1, "name": "x"}, False, "{id: int, name: str}"),
+        (("a",) * 500 + (3,), False, "(str x 500, int)"),
+        ([{"a": 1}, {"a": 2}], True, "2 rows of {a: int}"),
+        ((), False, "none"),
+    ],
+)
+def test_parameter_shape_hides_values(parameters, executemany, shape):
+    assert profiling.parameter_shape(parameters, executemany) == shape
+
+
+def test_instrumented_engine_records_and_logs_slow_queries(monkeypatch):
+    logged = []
+    monkeypatch.setattr(profiling.logger, "warning", lambda *args: logged.append(args))
+    engine = create_engine("sqlite://")
+    timings = profiling.instrument_engine(engine, profiling.QueryTimings(slow_query_ms=0))
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (a INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (:a)"), [{"a": 1}, {"a": 2}])
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT a FROM t WHERE a = :a"), {"a": 1})
+
+    stats = timings.stats()
+    assert stats["count"] == stats["slow"] == 3  # the failed statement is not timed
+    assert set(stats["by_kind"]) == {"CREATE", "INSERT", "SELECT"}
+    assert "2 rows of (int)" in logged[1]
+    assert logged[2][2] == "SELECT a FROM t WHERE a = ?"
+
+    timings.reset()
+    assert timings.stats()["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engines_get_pragmas(tmp_path):
+    engine = db.configure_engine(
+        create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/pragmas.db", **db.engine_profile("dev")
+        ),
+        profiling.QueryTimings(),
+    )
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+    finally:
+        await engine.dispose()
+
+
+def test_engine_profiles():
+    assert db.engine_profile("production")["pool_pre_ping"] is True
+    assert "poolclass" in db.engine_profile("testing")
+    assert not any(db.engine_profile(mode)["echo"] for mode in ("testing", "dev"))
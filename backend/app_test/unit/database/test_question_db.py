@@ -1,6 +1,9 @@
 from src.api.database import question as qdb
 import pytest
-from src.api.models.models import Question
+from uuid import UUID
+from sqlalchemy import event, text
+from sqlmodel import select
+from src.api.models.models import Question, Topic
 from src.api.core.logging import logger
 from src.api.models.question import QuestionData, QuestionMeta
 
@@ -35,7 +38,7 @@ async def test_create_question_with_relationship_data(
 @pytest.mark.asyncio
 async def test_get_question(db_session, question_payload):
     qcreated = await qdb.create_question(question_payload, db_session)
-    assert qcreated == qdb.get_question(qcreated.id, db_session)
+    assert qcreated == await qdb.get_question(qcreated.id, db_session)
 
 
 @pytest.mark.asyncio
@@ -44,7 +47,7 @@ async def test_get_all_questions(db_session, combined_payload):
     for q in combined_payload:
         qcreated = await qdb.create_question(q, db_session)
         assert qcreated
-    questions = qdb.get_all_questions(db_session)
+    questions = await qdb.get_all_questions(db_session)
     assert isinstance(questions, list)
     assert all(isinstance(q, Question) for q in questions)
     assert len(combined_payload) == len(questions)
@@ -56,8 +59,8 @@ async def test_delete_all_questions(db_session, combined_payload):
     for q in combined_payload:
         qcreated = await qdb.create_question(q, db_session)
         assert qcreated
-    qdb.delete_all_questions(db_session)
-    questions = qdb.get_all_questions(db_session)
+    await qdb.delete_all_questions(db_session)
+    questions = await qdb.get_all_questions(db_session)
     assert isinstance(questions, list)
     assert questions == []
 
@@ -69,9 +72,9 @@ async def test_delete_single(db_session, combined_payload):
         assert qcreated
 
         # Get the question
-        assert qdb.get_question(qcreated.id, db_session)
-        qdb.delete_question(qcreated.id, db_session)
-        assert qdb.get_question(qcreated.id, db_session) is None
+        assert await qdb.get_question(qcreated.id, db_session)
+        await qdb.delete_question(qcreated.id, db_session)
+        assert await qdb.get_question(qcreated.id, db_session) is None
 
 
 @pytest.mark.asyncio
@@ -81,6 +84,35 @@ async def test_get_question_data(create_question_with_relationship, db_session):
     assert data
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 10])
+async def test_all_question_data_query_count_is_constant(
+    db_session, question_payload, relationship_payload, page_size
+):
+    for i in range(page_size):
+        qdata = QuestionData(
+            **{**question_payload, "title": f"Question {i}"}, **relationship_payload
+        )
+        await qdb.create_question(qdata, db_session)
+    db_session.expunge_all()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        data = await qdb.get_all_question_data(db_session, limit=page_size)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # One query for the page plus one per eagerly loaded relationship
+    assert len(statements) == 1 + len(qdb.QUESTION_META_RELATIONSHIPS)
+    assert len(data) == page_size
+    for q in data:
+        assert {t.name for t in q.topics} == set(relationship_payload["topics"])
+        assert {t.name for t in q.qtypes} == set(relationship_payload["qtypes"])
+
+
 @pytest.mark.asyncio
 async def test_question_update(db_session, question_payload):
 
@@ -99,7 +131,7 @@ async def test_question_update(db_session, question_payload):
     assert isinstance(qupdate.topics, list)
     assert len(qupdate.topics) == 3
 
-    refetched = db_session.get(Question, qcreated.id)
+    refetched = await db_session.get(Question, qcreated.id)
     assert refetched.title == "new title"
 
 
@@ -146,6 +178,67 @@ async def test_filter_questions(
         assert all(isinstance(r, QuestionMeta) for r in results)
 
 
+@pytest.mark.asyncio
+async def test_filter_relationship_any_and_all(db_session):
+    rows = [
+        qdb.prepare_question({"title": "both", "topics": ["Math", "Physics"]}),
+        qdb.prepare_question({"title": "math", "topics": ["Math"], "isAdaptive": True}),
+        qdb.prepare_question({"title": "none", "languages": ["python"]}),
+    ]
+    await qdb.bulk_create_questions(rows, db_session)
+
+    async def titles(data, **kwargs):
+        results = await qdb.filter_questions(QuestionData(**data), db_session, **kwargs)
+        return sorted(r.title for r in results)
+
+    # Matching several topics does not duplicate a question
+    assert await titles({"topics": ["math", "physics"]}) == ["both", "math"]
+    assert await titles(
+        {"topics": ["math", "physics"]}, match_all=["topics"]
+    ) == ["both"]
+    # Facets combine with AND; False is a filter too
+    assert await titles({"topics": ["math"], "isAdaptive": False}) == ["both"]
+    assert await titles({"topics": ["math"], "languages": ["python"]}) == []
+    assert await titles({"title": ""}) == ["both", "math", "none"]
+    # Relationship names match whole, the title partially
+    assert await titles({"topics": ["mat"]}) == []
+    assert await titles({"title": "at"}) == ["math"]
+
+    with pytest.raises(ValueError):
+        await qdb.filter_questions(QuestionData(topics=["math"]), db_session, match_all=["title"])
+
+
+@pytest.mark.asyncio
+async def test_filter_question_path_by_storage_type(db_session):
+    local, cloud = qdb.prepare_question({"title": "local"}), qdb.prepare_question({"title": "cloud"})
+    local[0].local_path = "questions/local_1"
+    cloud[0].blob_path = "questions/cloud_1"
+    await qdb.bulk_create_questions([local, cloud], db_session)
+
+    async def titles(path, storage_type=None):
+        results = await qdb.filter_questions(
+            QuestionData(question_path=path), db_session, storage_type=storage_type
+        )
+        return sorted(r.title for r in results)
+
+    assert await titles("local_1", "local") == ["local"]
+    assert await titles("cloud_1", "local") == []
+    assert await titles("cloud_1", "cloud") == ["cloud"]
+    assert await titles("questions/") == ["cloud", "local"]
+
+
+@pytest.mark.asyncio
+async def test_topic_filter_uses_link_index(db_session):
+    condition = qdb.relationship_condition(
+        "topics", [qdb.filter_conditional(Topic, "name", "math")]
+    )
+    stmt = select(Question.id).where(condition)
+    sql = str(stmt.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True}))
+    result = await db_session.exec(text(f"EXPLAIN QUERY PLAN {sql}"))
+    plan = " ".join(str(row[-1]) for row in result.all())
+    assert "ix_questiontopiclink_topic_id_question_id" in plan
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "storage_type, expected_attr",
@@ -160,7 +253,7 @@ async def test_setting_path(db_session, question_payload, storage_type, expected
     assert qcreated
 
     # Run set_question_path for both storage types
-    q = qdb.set_question_path(
+    q = await qdb.set_question_path(
         qcreated.id,
         path="/test",
         storage_type=storage_type,
@@ -169,3 +262,77 @@ async def test_setting_path(db_session, question_payload, storage_type, expected
 
     # Validate based on storage type
     assert getattr(q, expected_attr) == "/test"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_questions(db_session, relationship_payload):
+    prepared = [
+        qdb.prepare_question({"title": f"Question {i}", **relationship_payload})
+        for i in range(20)
+    ]
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        created = await qdb.bulk_create_questions(prepared, db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Independent of the number of questions: the questions and their search text,
+    # plus per relationship model one lookup, one insert of missing names, one
+    # re-lookup and one insert of link rows
+    assert len(statements) <= 2 + 4 * len(qdb.QUESTION_META_RELATIONSHIPS)
+    assert len(created) == 20
+    db_session.expunge_all()
+    question = await qdb.get_question(created[0].id, db_session, eager=True)
+    assert question.ai_generated is False
+    assert {t.name for t in question.topics} == set(relationship_payload["topics"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"title": "x", "topics": [1, 2]}, {"title": "x", "isAdaptive": "maybe"}],
+)
+def test_prepare_question_rejects_invalid_data(payload):
+    with pytest.raises(ValueError):
+        qdb.prepare_question(payload)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_question_once(db_session):
+    created = await qdb.bulk_create_questions(
+        [qdb.prepare_question({"title": f"Question {i}"}) for i in range(25)], db_session
+    )
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = await qdb.get_question_page(db_session, limit=10, cursor=cursor)
+        seen.extend(q.id for q in rows)
+        pages += 1
+        if cursor is None:
+            break
+        # A row inserted before the cursor does not shift the following pages
+        await qdb.bulk_create_questions(
+            [qdb.prepare_question({"title": "late", "id": UUID(int=pages)})], db_session
+        )
+    assert pages == 3
+    assert seen == sorted(q.id for q in created)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(ValueError):
+        await qdb.get_question_page(db_session, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_iter_all_questions_allows_deleting(db_session):
+    await qdb.bulk_create_questions(
+        [qdb.prepare_question({"title": f"Question {i}"}) for i in range(12)], db_session
+    )
+    visited = 0
+    async for question in qdb.iter_all_questions(db_session, batch_size=5):
+        visited += 1
+        await qdb.delete_question(question.id, db_session)
+    assert visited == 12
+    assert await qdb.get_all_questions(db_session) == []
@@ -0,0 +1,49 @@
+import pytest
+from src.api.database import question as qdb
+from src.api.database import runner_metadata as rmdb
+from src.code_runner.static_analysis import analyze_python_source
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_get_runner_metadata(db_session, question_payload):
+    qcreated = await qdb.create_question(question_payload, db_session)
+    assert await rmdb.get_runner_metadata(qcreated.id, "python", db_session) is None
+
+    analysis = analyze_python_source("import math\n\ndef generate(n):\n    pass\n")
+    await rmdb.upsert_runner_metadata(qcreated.id, analysis, db_session)
+    record = await rmdb.get_runner_metadata(str(qcreated.id), "python", db_session)
+    assert record and record.valid and record.imports == ["math"]
+    assert rmdb.to_server_analysis(record) == analysis
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_previous_analysis(db_session, question_payload):
+    qcreated = await qdb.create_question(question_payload, db_session)
+    await rmdb.upsert_runner_metadata(
+        qcreated.id, analyze_python_source("def generate():\n    pass\n"), db_session
+    )
+    broken = analyze_python_source("def generate(:\n")
+    await rmdb.upsert_runner_metadata(qcreated.id, broken, db_session)
+
+    record = await rmdb.get_runner_metadata(qcreated.id, "python", db_session)
+    assert not record.valid
+    assert record.code_hash == broken.code_hash
+    assert await rmdb.get_runner_metadata(qcreated.id, "javascript", db_session) is None
+
+
+@pytest.mark.asyncio
+async def test_deleting_questions_removes_their_metadata(db_session, question_payload):
+    analysis = analyze_python_source("def generate():\n    pass\n")
+    first = await qdb.create_question(question_payload, db_session)
+    second = await qdb.create_question(question_payload, db_session)
+    third = await qdb.create_question(question_payload, db_session)
+    for question in (first, second, third):
+        await rmdb.upsert_runner_metadata(question.id, analysis, db_session)
+
+    assert await qdb.delete_question(first.id, db_session)
+    assert await rmdb.get_runner_metadata(first.id, "python", db_session) is None
+    assert await rmdb.get_runner_metadata(second.id, "python", db_session)
+
+    assert await qdb.delete_all_questions(db_session)
+    for question in (second, third):
+        assert await rmdb.get_runner_metadata(question.id, "python", db_session) is None
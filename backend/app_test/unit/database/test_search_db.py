@@ -0,0 +1,65 @@
+import pytest
+from src.api.database import question as qdb
+from src.api.database import search as sdb
+from src.api.models.question import QuestionData
+
+
+def test_html_to_text_drops_markup_and_scripts():
+    html = "<h1>Beam</h1><p>A <b>cantilever</b>\n beam.</p><script>var x = 1;</script>"
+    assert sdb.html_to_text(html.encode()) == "Beam A cantilever beam."
+    assert sdb.file_search_text("server.py", "def generate(): pass") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_highlights(db_session, question_payload):
+    beam = await qdb.create_question(
+        QuestionData(**question_payload | {"title": "Cantilever beam deflection"}),
+        db_session,
+    )
+    spring = await qdb.create_question(
+        QuestionData(**question_payload | {"title": "Spring", "topics": ["Statics"]}),
+        db_session,
+    )
+    await sdb.upsert_search_text(
+        spring.id,
+        db_session,
+        question_text=sdb.html_to_text("<p>A spring supports a <i>beam</i>.</p>"),
+    )
+
+    hits = await sdb.search_questions("beam", db_session)
+    assert [h[0] for h in hits] == [beam.id, spring.id]  # title outranks body text
+    assert hits[0][1] == "Cantilever <mark>beam</mark> deflection"
+    assert "<mark>beam</mark>" in hits[1][2]
+
+    # Every word must match; the last one may be a prefix
+    assert [h[0] for h in await sdb.search_questions("spring stat", db_session)] == [spring.id]
+    assert await sdb.search_questions("deflection stat", db_session) == []
+    # Operators and punctuation are treated as text
+    assert [h[0] for h in await sdb.search_questions('"beam" -(cantilever*', db_session)] == [beam.id]
+    assert await sdb.search_questions("***", db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_index_follows_updates_and_deletes(db_session, question_payload):
+    question = await qdb.create_question(
+        QuestionData(**question_payload | {"title": "Pendulum"}), db_session
+    )
+    await qdb.update_question(
+        question.id, QuestionData(title="Projectile", topics=["Kinematics"]), db_session
+    )
+    assert await sdb.search_questions("pendulum", db_session) == []
+    assert len(await sdb.search_questions("projectile kinematics", db_session)) == 1
+
+    await qdb.delete_question(question.id, db_session)
+    assert await sdb.search_questions("projectile", db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_created_questions_are_searchable(db_session):
+    rows = [qdb.prepare_question({"title": f"Circuit {i}"}) for i in range(3)]
+    first = rows[0][0].id
+    await qdb.bulk_create_questions(
+        rows, db_session, search_text={first: {"solution_text": "Ohm's law"}}
+    )
+    assert len(await sdb.search_questions("circuit", db_session)) == 3
+    assert [h[0] for h in await sdb.search_questions("ohm", db_session)] == [first]
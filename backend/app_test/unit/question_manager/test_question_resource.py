@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.models import FileData, QuestionImport
+from src.api.service.question_resource import QuestionResourceService
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_removes_files_when_insert_fails(
+    question_manager, local_storage, monkeypatch
+):
+    async def failing_insert(*args, **kwargs):
+        raise HTTPException(status_code=500, detail="Insert failed")
+
+    monkeypatch.setattr(question_manager, "bulk_create_questions", failing_insert)
+    service = QuestionResourceService(question_manager, local_storage, "local")
+    items = [
+        QuestionImport(
+            title=f"Bulk {i}",
+            files=[FileData(filename="question.html", content="<p>Hi</p>")],
+        )
+        for i in range(3)
+    ]
+
+    response = await service.create_questions(items)
+
+    assert response.created == 0
+    assert all(r.status == "failed" for r in response.results)
+    assert all(r.question_path is None for r in response.results)
+    assert list(local_storage.base_path.glob("*")) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_duplicate_and_existing_ids(
+    question_manager, local_storage
+):
+    service = QuestionResourceService(question_manager, local_storage, "local")
+    existing = await service.create_questions([QuestionImport(title="Existing")])
+    existing_id = existing.results[0].id
+    shared_id = uuid4()
+    items = [
+        QuestionImport(id=shared_id, title="First"),
+        QuestionImport(id=shared_id, title="Second"),
+        QuestionImport(id=existing_id, title="Clash"),
+        QuestionImport(
+            title="Fresh",
+            files=[FileData(filename="question.html", content="<p>Hi</p>")],
+        ),
+    ]
+
+    response = await service.create_questions(items)
+
+    assert [r.status for r in response.results] == [
+        "created",
+        "invalid",
+        "invalid",
+        "created",
+    ]
+    assert "Duplicate id" in response.results[1].error
+    assert "already exists" in response.results[2].error
+    assert response.created == 2
+    assert (await question_manager.get_question(existing_id)).title == "Existing"
+    assert len(list(local_storage.base_path.glob("*"))) == 3
@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark: fork-server children vs freshly spawned interpreters.
+
+Every run starts a new process that executes a typical generated `server.py`
+(math, random and numpy imports). With `spawn` each child starts an interpreter
+and imports everything itself; with the fork server the imports were done once
+and each child is a copy-on-write fork.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_forkserver --runs 20
+"""
+
+# --- Standard Library ---
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# --- Internal ---
+from src.code_runner import forkserver
+from src.code_runner.run_py import load_python_code
+
+SERVER_PY = '''import math
+import random
+
+import numpy as np
+
+
+def generate():
+    a = random.randint(1, 10)
+    b = np.float64(random.uniform(1, 5))
+    return {
+        "params": {"a": a, "b": float(b)},
+        "correct_answers": {"hyp": math.hypot(a, float(b))},
+    }
+'''
+
+
+def run_spawned(path: str) -> None:
+    """Baseline: a fresh interpreter per run via the `spawn` start method."""
+    code = load_python_code(path)
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=forkserver._run_in_child,
+        args=(sender, forkserver.marshal.dumps(code), False, [None]),
+    )
+    process.start()
+    sender.close()
+    receiver.recv()
+    process.join()
+
+
+def run_forked(path: str) -> None:
+    forkserver.run_generate_py_forked(path)
+
+
+def measure(label: str, func: Callable[[str], None], path: str, runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<12} mean={statistics.mean(timings):8.1f} ms  "
+        f"p50={statistics.median(timings):8.1f} ms  max={max(timings):8.1f} ms"
+    )
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "server.py")
+        Path(path).write_text(SERVER_PY)
+
+        # Start the fork server outside the measurement, as the API lifespan does
+        forkserver.prestart_forkserver()
+        spawned = measure("spawn", run_spawned, path, args.runs)
+        forked = measure("forkserver", run_forked, path, args.runs)
+        print(
+            f"forkserver cold start is {statistics.median(spawned) / statistics.median(forked):.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the Python execution backends on a warm, stdlib-only question.
+
+For every backend this measures single-call latency and the throughput of
+`--threads` concurrent callers (the API runs generators from a thread pool).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_python_backends --runs 200 --threads 4
+"""
+
+# --- Standard Library ---
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict
+
+# --- Internal ---
+from src.code_runner import forkserver, run_py, subinterpreters
+from src.code_runner.models import CodeRunResponse
+
+SERVER_PY = '''import math
+import random
+
+
+def generate():
+    a = random.randint(1, 10)
+    b = random.uniform(1, 5)
+    total = sum(math.sin(i * a) ** 2 for i in range(2000))
+    print("a =", a)
+    return {
+        "params": {"a": a, "b": b},
+        "correct_answers": {"hyp": math.hypot(a, b), "total": total},
+    }
+'''
+
+BACKENDS: Dict[str, Callable[[str], CodeRunResponse]] = {
+    "inprocess": run_py.run_generate_py,
+    "pool": run_py.run_generate_py_pooled,
+    "forkserver": forkserver.run_generate_py_forked,
+    "subinterpreter": subinterpreters.run_generate_py_subinterpreter,
+}
+
+
+def bench(name: str, runner: Callable[[str], CodeRunResponse], path: str, runs: int, threads: int) -> None:
+    # Warm up: start workers / interpreters and fill the code caches
+    for _ in range(threads * 2):
+        assert runner(path).success
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        runner(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: runner(path), range(runs)))
+    throughput = runs / (time.perf_counter() - start)
+
+    latencies.sort()
+    print(
+        f"{name:<15} p50={statistics.median(latencies):7.2f} ms  "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+        f"{throughput:8.1f} runs/s with {threads} threads"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--backends", nargs="*", default=list(BACKENDS))
+    args = parser.parse_args()
+
+    if not subinterpreters.subinterpreters_available():
+        print("subinterpreters unavailable, that row measures the fallback backend")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "server.py")
+        Path(path).write_text(SERVER_PY)
+        for name in args.backends:
+            bench(name, BACKENDS[name], path, args.runs, args.threads)
+
+
+if __name__ == "__main__":
+    main()
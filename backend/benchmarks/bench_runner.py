@@ -0,0 +1,226 @@
+"""
+Benchmark `run_generate` for both runtimes and compare against a stored baseline.
+
+Every generator under `benchmarks/questions/<case>/server.{py,js}` is measured:
+
+- cold: first run with fresh runtime workers and empty module caches
+- warm: sequential runs once workers and caches are warm
+- concurrent: `--threads` callers running at once (the API runs generators
+  from a thread pool)
+
+Each phase reports p50/p95/p99 latency in milliseconds and runs/sec. The report
+is written as JSON and, when a baseline exists, every latency and throughput
+figure is compared against it; the exit code is 1 if any regressed by more
+than `--tolerance`. Numbers are only comparable on the same machine; `meta`
+records where the baseline was taken.
+
+The Python backend is whatever PY_EXECUTION_BACKEND selects. Worker recycling
+(`*_WORKER_MAX_RUNS`) is left on, so a long phase includes the occasional
+respawn exactly as a long-running API process would; it shows up in p99.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_runner --runs 200 --threads 4 -o report.json
+    python -m benchmarks.bench_runner --save-baseline   # refresh baseline.json
+"""
+
+# --- Standard Library ---
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# --- Internal ---
+from src.api.core.config import get_settings
+from src.code_runner.module_cache import invalidate_server_file
+from src.code_runner.runtime_switcher import run_generate
+from src.code_runner.worker_pool import shutdown_worker_pools
+
+QUESTIONS_DIR = Path(__file__).with_name("questions")
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SERVER_FILES = {"python": "server.py", "javascript": "server.js"}
+
+# Figures compared against the baseline and whether a larger value is better
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "runs_per_sec": True}
+# Latency changes smaller than this are timer noise, whatever the percentage
+MIN_LATENCY_DELTA_MS = 0.25
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "runs": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "runs_per_sec": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def timed(call: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    response = call()
+    if not response.success:
+        raise RuntimeError(response.error)
+    return (time.perf_counter() - start) * 1000
+
+
+def find_cases(names: Optional[List[str]], languages: List[str]) -> Dict[str, Path]:
+    """Map `<language>/<case>` to its server file."""
+    cases = {}
+    for case_dir in sorted(p for p in QUESTIONS_DIR.iterdir() if p.is_dir()):
+        if names and case_dir.name not in names:
+            continue
+        for language in languages:
+            path = case_dir / SERVER_FILES[language]
+            if path.exists():
+                cases[f"{language}/{case_dir.name}"] = path
+    return cases
+
+
+def reset_runtimes(path: Path) -> None:
+    """Stop the worker pools and drop the case's compiled module from every cache."""
+    invalidate_server_file(path.name, path.read_bytes())
+    shutdown_worker_pools()
+
+
+def bench_case(
+    path: Path, language: str, runs: int, threads: int, cold_runs: int
+) -> Dict[str, Any]:
+    call = lambda: run_generate(path, language)  # type: ignore[arg-type]
+
+    cold = []
+    for _ in range(cold_runs):
+        reset_runtimes(path)
+        cold.append(timed(call))
+    cold_elapsed = sum(cold) / 1000
+
+    # Warm up every worker the concurrent phase will use
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: timed(call), range(threads * 2)))
+
+    start = time.perf_counter()
+    warm = [timed(call) for _ in range(runs)]
+    warm_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        concurrent = list(executor.map(lambda _: timed(call), range(runs)))
+    concurrent_elapsed = time.perf_counter() - start
+
+    return {
+        "cold": summarize(cold, cold_elapsed),
+        "warm": summarize(warm, warm_elapsed),
+        "concurrent": {
+            "threads": threads,
+            **summarize(concurrent, concurrent_elapsed),
+        },
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Return one line per figure that regressed by more than `tolerance` (a fraction)."""
+    regressions = []
+    for case, phases in report["results"].items():
+        base_phases = baseline.get("results", {}).get(case)
+        if not base_phases or "error" in phases:
+            continue
+        for phase, figures in phases.items():
+            base_figures = base_phases.get(phase, {})
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                new, old = figures.get(metric), base_figures.get(metric)
+                if not new or not old:
+                    continue
+                change = (new - old) / old
+                if higher_is_better:
+                    regressed = change < -tolerance
+                else:
+                    regressed = change > tolerance and new - old > MIN_LATENCY_DELTA_MS
+                figures.setdefault("vs_baseline", {})[metric] = round(change, 3)
+                if regressed:
+                    regressions.append(
+                        f"{case} {phase} {metric}: {old} -> {new} ({change:+.0%})"
+                    )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200, help="Runs per warm/concurrent phase")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers")
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--cases", nargs="*", default=None, help="Case names to run")
+    parser.add_argument(
+        "--languages", nargs="*", default=list(SERVER_FILES), choices=list(SERVER_FILES)
+    )
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed regression (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store this run as the baseline"
+    )
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "py_execution_backend": get_settings().PY_EXECUTION_BACKEND,
+            "runs": args.runs,
+            "threads": args.threads,
+            "cold_runs": args.cold_runs,
+        },
+        "results": {},
+    }
+    for case, path in find_cases(args.cases, args.languages).items():
+        language = case.split("/", 1)[0]
+        print(f"benchmarking {case} ...", file=sys.stderr)
+        try:
+            report["results"][case] = bench_case(
+                path, language, args.runs, args.threads, args.cold_runs
+            )
+        except Exception as e:
+            report["results"][case] = {"error": str(e)}
+
+    regressions: List[str] = []
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline written to {baseline_path}", file=sys.stderr)
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
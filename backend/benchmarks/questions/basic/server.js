@@ -0,0 +1,13 @@
+function generate(n) {
+  const a = Math.floor(Math.random() * 20) + 1;
+  const b = Math.floor(Math.random() * 20) + 1;
+  console.log("a =", a, "b =", b);
+  return {
+    params: { a: a, b: b },
+    correct_answers: { sum: a + b, product: a * b },
+    intermediate: { step: `${a} + ${b} = ${a + b}` },
+    test_results: { pass: 1, message: "Addition successful" },
+    nDigits: 3,
+    sigfigs: 3,
+  };
+}
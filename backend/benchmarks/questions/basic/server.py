@@ -0,0 +1,15 @@
+import random
+
+
+def generate(n=None):
+    a = random.randint(1, 20)
+    b = random.randint(1, 20)
+    print("a =", a, "b =", b)
+    return {
+        "params": {"a": a, "b": b},
+        "correct_answers": {"sum": a + b, "product": a * b},
+        "intermediate": {"step": f"{a} + {b} = {a + b}"},
+        "test_results": {"pass": 1, "message": "Addition successful"},
+        "nDigits": 3,
+        "sigfigs": 3,
+    }
@@ -0,0 +1,16 @@
+function generate(n) {
+  const k = Math.floor(Math.random() * 10) + 1;
+  const damping = 0.1 + Math.random() * 0.4;
+  // Numerically integrate a damped oscillation, as physics questions often do
+  let dt = 0.001, x = 1.0, v = 0.0;
+  for (let i = 0; i < 20000; i++) {
+    const a = -k * x - damping * v;
+    v += a * dt;
+    x += v * dt;
+  }
+  return {
+    params: { k: k, damping: Math.round(damping * 1000) / 1000 },
+    correct_answers: { x: x, period: (2 * Math.PI) / Math.sqrt(k) },
+    test_results: { pass: 1, message: "ok" },
+  };
+}
@@ -0,0 +1,18 @@
+import math
+import random
+
+
+def generate(n=None):
+    k = random.randint(1, 10)
+    damping = random.uniform(0.1, 0.5)
+    # Numerically integrate a damped oscillation, as physics questions often do
+    dt, x, v = 0.001, 1.0, 0.0
+    for _ in range(20000):
+        a = -k * x - damping * v
+        v += a * dt
+        x += v * dt
+    return {
+        "params": {"k": k, "damping": round(damping, 3)},
+        "correct_answers": {"x": x, "period": 2 * math.pi / math.sqrt(k)},
+        "test_results": {"pass": 1, "message": "ok"},
+    }
@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def generate(n=None):
+    samples = np.random.normal(loc=50, scale=8, size=200)
+    return {
+        "params": {"n": int(samples.size), "first": [round(float(s), 2) for s in samples[:5]]},
+        "correct_answers": {
+            "mean": float(samples.mean()),
+            "std": float(samples.std(ddof=1)),
+        },
+        "test_results": {"pass": 1, "message": "ok"},
+    }
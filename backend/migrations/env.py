@@ -29,6 +29,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the full-text search objects that are not SQLModel columns or tables to their migration."""
+    if type_ == "table" and reflected and name.startswith("question_search_fts"):
+        return False
+    if type_ == "column" and reflected and name == "document" and object.table.name == "question_search":
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +63,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -73,7 +84,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata,render_as_batch=True)
+        context.configure(connection=connection, target_metadata=target_metadata,render_as_batch=True, include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,44 @@
+"""Index question link tables by topic, language and qtype
+
+Revision ID: 7c1f3b9a2d10
+Revises: 344504f8cf72
+Create Date: 2026-10-17 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f3b9a2d10'
+down_revision: Union[str, Sequence[str], None] = '344504f8cf72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, target column); each index is (target column, question_id)
+LINK_TABLES = [
+    ("questiontopiclink", "topic_id"),
+    ("questionlanguagelink", "language_id"),
+    ("questionqtypelink", "qtype_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created after this revision already have them from create_all
+    for table, column in LINK_TABLES:
+        op.create_index(
+            f"ix_{table}_{column}_question_id",
+            table,
+            [column, "question_id"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in LINK_TABLES:
+        op.drop_index(f"ix_{table}_{column}_question_id", table_name=table, if_exists=True)
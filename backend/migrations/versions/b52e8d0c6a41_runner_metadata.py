@@ -0,0 +1,60 @@
+"""Add runner_metadata for the static analysis of question server files
+
+Revision ID: b52e8d0c6a41
+Revises: 7c1f3b9a2d10
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e8d0c6a41'
+down_revision: Union[str, Sequence[str], None] = '7c1f3b9a2d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created after this revision already have it from create_all.
+    # Existing questions get their metadata the next time a server file is saved.
+    op.create_table(
+        "runner_metadata",
+        sa.Column("question_id", sa.Uuid(), nullable=False),
+        sa.Column("language", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("code_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("valid", sa.Boolean(), nullable=False),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("has_generate", sa.Boolean(), nullable=False),
+        sa.Column("arity", sa.Integer(), nullable=True),
+        sa.Column("required_args", sa.Integer(), nullable=True),
+        sa.Column("imports", sa.JSON(), nullable=True),
+        sa.Column("analyzed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["question_id"], ["question.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("question_id", "language"),
+        if_not_exists=True,
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite does not enforce the cascade; same trigger as models.RunnerMetadata
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS runner_metadata_question_ad AFTER DELETE ON question BEGIN
+                DELETE FROM runner_metadata WHERE question_id = old.id;
+            END
+            """
+        )
+        op.execute(
+            "DELETE FROM runner_metadata WHERE question_id NOT IN (SELECT id FROM question)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS runner_metadata_question_ad")
+    op.drop_table("runner_metadata", if_exists=True)
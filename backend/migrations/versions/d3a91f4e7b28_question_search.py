@@ -0,0 +1,134 @@
+"""Add question_search and its full-text index
+
+Revision ID: d3a91f4e7b28
+Revises: b52e8d0c6a41
+Create Date: 2026-10-17 14:40:00.000000
+
+Existing questions get a search row holding their title and topic names. The
+text of their question.html and solution.html lives in storage, which a
+migration cannot read; run POST /questions/search/reindex once after upgrading
+to fill it in.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a91f4e7b28'
+down_revision: Union[str, Sequence[str], None] = 'b52e8d0c6a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same DDL as models.QuestionSearch attaches to create_all, made idempotent
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS question_search_fts USING fts5(
+        title, topics, question_text, solution_text,
+        content='question_search', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS question_search_ai AFTER INSERT ON question_search BEGIN
+        INSERT INTO question_search_fts(rowid, title, topics, question_text, solution_text)
+        VALUES (new.id, new.title, new.topics, new.question_text, new.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS question_search_ad AFTER DELETE ON question_search BEGIN
+        INSERT INTO question_search_fts(question_search_fts, rowid, title, topics, question_text, solution_text)
+        VALUES ('delete', old.id, old.title, old.topics, old.question_text, old.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS question_search_au AFTER UPDATE ON question_search BEGIN
+        INSERT INTO question_search_fts(question_search_fts, rowid, title, topics, question_text, solution_text)
+        VALUES ('delete', old.id, old.title, old.topics, old.question_text, old.solution_text);
+        INSERT INTO question_search_fts(rowid, title, topics, question_text, solution_text)
+        VALUES (new.id, new.title, new.topics, new.question_text, new.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS question_search_question_ad AFTER DELETE ON question BEGIN
+        DELETE FROM question_search WHERE question_id = old.id;
+    END
+    """,
+]
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE question_search ADD COLUMN IF NOT EXISTS document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(topics, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(question_text, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(solution_text, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_question_search_document ON question_search USING GIN (document)",
+]
+
+# Title and topic names of every question without a search row yet
+BACKFILL = """
+    INSERT INTO question_search (question_id, title, topics, question_text, solution_text)
+    SELECT q.id, coalesce(q.title, ''),
+           coalesce((SELECT {aggregate} FROM questiontopiclink AS l
+                     JOIN topic AS t ON t.id = l.topic_id
+                     WHERE l.question_id = q.id), ''),
+           '', ''
+    FROM question AS q
+    WHERE NOT EXISTS (SELECT 1 FROM question_search AS s WHERE s.question_id = q.id)
+"""
+TOPIC_AGGREGATE = {
+    "sqlite": "group_concat(t.name, ' ')",
+    "postgresql": "string_agg(t.name, ' ')",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created after this revision already have it from create_all
+    op.create_table(
+        "question_search",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("topics", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("question_text", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("solution_text", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.ForeignKeyConstraint(["question_id"], ["question.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_question_search_question_id"),
+        "question_search",
+        ["question_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+    if dialect in TOPIC_AGGREGATE:
+        op.execute(BACKFILL.format(aggregate=TOPIC_AGGREGATE[dialect]))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS question_search_question_ad")
+        op.execute("DROP TABLE IF EXISTS question_search_fts")
+    op.drop_index(
+        op.f("ix_question_search_question_id"),
+        table_name="question_search",
+        if_exists=True,
+    )
+    op.drop_table("question_search", if_exists=True)
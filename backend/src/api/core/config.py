@@ -2,7 +2,7 @@
 import os
 from pathlib import Path
 from functools import lru_cache
-from typing import Optional, Literal, Union, Sequence
+from typing import List, Optional, Literal, Union, Sequence
 
 # --- Third-Party ---
 from dotenv import load_dotenv
@@ -46,6 +46,14 @@ class AppSettings(BaseSettings):
     POSTGRES_URL: Optional[str] = None
     SQLITE_DB_PATH: Optional[str] = None
 
+    # Database engine; the pool settings apply to Postgres in production
+    DB_ECHO: bool = False  # log every statement
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; below typical server/proxy idle timeouts
+    DB_SLOW_QUERY_MS: float = 250.0  # statements slower than this are logged
+
     # Cloud Storage
     FIREBASE_CRED: Optional[str] = None
     STORAGE_BUCKET: Optional[str] = None
@@ -55,6 +63,67 @@ class AppSettings(BaseSettings):
     def assemble_db_connection(cls, v: Optional[str], info: ValidationInfo) -> str:
         return v or ":memory:"
 
+    # Code Runner
+    JS_WORKER_POOL_SIZE: int = 4
+    JS_WORKER_TIMEOUT: float = 10.0
+    JS_WORKER_MAX_RUNS: int = 500
+    JS_WORKER_MAX_QUEUE: int = 64
+
+    PY_EXECUTION_BACKEND: Literal["inprocess", "pool", "forkserver", "subinterpreter"] = (
+        "pool"
+    )
+    PY_WORKER_POOL_SIZE: Optional[int] = None  # defaults to the CPU count
+    PY_WORKER_TIMEOUT: float = 10.0
+    PY_WORKER_MAX_RUNS: int = 200
+    PY_WORKER_MAX_QUEUE: int = 64
+    # Imported once by the fork server so forked runs start with them loaded
+    PY_FORKSERVER_PRELOAD: List[str] = ["math", "random", "numpy", "sympy"]
+    # Non-stdlib imports allowed inside subinterpreters; anything else uses the fallback
+    PY_SUBINTERPRETER_POOL_SIZE: Optional[int] = None  # defaults to the CPU count
+    PY_SUBINTERPRETER_ALLOWED_IMPORTS: List[str] = ["sympy", "mpmath"]
+    PY_SUBINTERPRETER_FALLBACK: Literal["inprocess", "pool", "forkserver"] = "pool"
+
+    # Compiled server modules kept per cache (in-process) and per worker
+    RUNNER_CACHE_MAX_ENTRIES: int = 256
+    RUNNER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Per-run limits for question code. CPU, memory and wall time are enforced where
+    # a run has its own process (pool workers, forked children); a run may take 80%
+    # of its backend's *_TIMEOUT, and a call (or batch) at most RUNNER_HARD_TIMEOUT.
+    # In-process and subinterpreter runs cannot be stopped once started.
+    RUNNER_MAX_CPU_SECONDS: int = 10
+    RUNNER_MAX_MEMORY_MB: int = 1024  # address-space limit of the run's process
+    RUNNER_MAX_LOG_BYTES: int = 64 * 1024
+
+    # Admission control for question code runs made from API requests
+    RUNNER_MAX_CONCURRENCY: int = 8
+    RUNNER_MAX_QUEUE: int = 32
+    RUNNER_HARD_TIMEOUT: float = 30.0
+
+    # Memoized seeded variants; set a path to persist them in SQLite
+    VARIANT_CACHE_MAX_ENTRIES: int = 4096
+    VARIANT_CACHE_DB_PATH: Optional[str] = None
+
+    # Pre-generated variants served to adaptive questions in "pool" mode
+    VARIANT_POOL_SIZE: int = 20  # variants kept ready per question and language
+    VARIANT_POOL_REFILL_BATCH: int = 5
+    VARIANT_POOL_MAX_QUESTIONS: int = 256
+    VARIANT_POOL_DB_PATH: Optional[str] = None
+
+    # Variant-space analysis: seeds sampled per runner call, and reports kept
+    VARIANT_SPACE_MAX_SAMPLES: int = 5000
+    VARIANT_SPACE_CHUNK_SIZE: int = 250
+    VARIANT_SPACE_CACHE_ENTRIES: int = 64
+
+    # Largest number of submissions accepted by one /grade/batch request
+    GRADE_BATCH_MAX_SUBMISSIONS: int = 20000
+
+    # Largest number of questions accepted by one POST /questions/bulk request
+    QUESTION_BULK_MAX_ITEMS: int = 5000
+
+    # Processes used to self-test the whole question catalog
+    CATALOG_TEST_PARALLELISM: Optional[int] = None  # defaults to the CPU count
+
     # Static Directory
     QUESTIONS_DIRNAME: Union[str, Path]
     ROOT_PATH: Union[str, Path]
@@ -1,10 +1,16 @@
-from typing import Annotated, Generator
+from typing import Annotated, Any, AsyncGenerator, Dict
 from dotenv import load_dotenv
 from fastapi import Depends
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.api.core.config import get_settings
+from src.api.core.config import AppSettings, get_settings
 from src.api.core import logger
+from src.api.database.profiling import QueryTimings, instrument_engine
 
 app_settings = get_settings()
 
@@ -24,31 +30,103 @@ elif app_settings.MODE == "dev":
 else:
     raise ValueError(f"Unknown environment: {app_settings.MODE}")
 
+# Async driver per backend; DATABASE_URL itself stays synchronous for Alembic
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def to_async_url(url: str) -> str:
+    """The same database as `url`, reached through its asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    # asyncpg takes `ssl` instead of libpq's `sslmode`
+    if backend == "postgresql" and "sslmode" in parsed.query:
+        sslmode = parsed.query["sslmode"]
+        parsed = parsed.difference_update_query(["sslmode"]).update_query_dict(
+            {"ssl": sslmode}
+        )
+    return parsed.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+# Applied to every new SQLite connection
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",  # readers and the writer no longer block each other
+    "synchronous": "NORMAL",  # safe with WAL; only a power loss can drop the last commits
+    "cache_size": -64000,  # page cache in KiB (64 MB)
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms to wait for a lock instead of failing with "database is locked"
+}
+
+
+def engine_profile(mode: str, settings: AppSettings = app_settings) -> Dict[str, Any]:
+    """Keyword arguments of `create_async_engine` for a MODE."""
+    profile: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if mode == "testing":
+        # Every connection must see the same in-memory database
+        profile["poolclass"] = StaticPool
+    elif mode == "production":
+        profile.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            # Replace connections before the server or a proxy drops them as idle
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # Test a connection on checkout, so a database restart costs no failed request
+            pool_pre_ping=True,
+        )
+    return profile
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def configure_engine(engine: AsyncEngine, timings: QueryTimings) -> AsyncEngine:
+    """Apply the SQLite pragmas on connect and record statement timings."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    instrument_engine(engine, timings)
+    return engine
+
+
+QUERY_TIMINGS = QueryTimings(app_settings.DB_SLOW_QUERY_MS)
 
 logger.info(f"[DATABASE Intialization]: Database path set to {DATABASE_URL}")
 try:
-    connect_args = {}
-    if app_settings.MODE == "dev" and DATABASE_URL.startswith("sqlite"):
-        connect_args = {"check_same_thread": False}
-    engine = create_engine(
-        url=DATABASE_URL,
-        echo=True,
-        connect_args=connect_args,  # always a dict, never None
+    engine: AsyncEngine = configure_engine(
+        create_async_engine(
+            url=ASYNC_DATABASE_URL,
+            **engine_profile(app_settings.MODE),
+        ),
+        QUERY_TIMINGS,
     )
     Base = SQLModel
 except Exception as e:
     raise RuntimeError(f"Error initializing database engine {e}")
 
 
-def create_db_and_tables(engine=engine):
-    Base.metadata.create_all(engine)
+def database_stats() -> Dict[str, Any]:
+    """Statement timings and the state of the connection pool."""
+    return {"queries": QUERY_TIMINGS.stats(), "pool": engine.pool.status()}
+
+
+async def create_db_and_tables(engine: AsyncEngine = engine) -> AsyncEngine:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     return engine
 
 
-def get_session() -> Generator[Session, None, None]:
-    """Yield a SQLModel session per request."""
-    with Session(engine, expire_on_commit=False) as session:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async SQLModel session per request."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
@@ -1,8 +1,9 @@
 # --- Standard Library ---
-from typing import Any, Dict, List, Type, TypeVar
+from typing import Any, Dict, Iterable, List, Type, TypeVar
 
 # --- Third-Party ---
-from sqlalchemy import func
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm.properties import RelationshipProperty
@@ -16,7 +17,7 @@ from src.api.database.database import SessionDep
 T = TypeVar("T", bound=SQLModel)
 
 
-def create_or_resolve(
+async def create_or_resolve(
     target_cls: Type[T],
     target_value: str,
     session: SessionDep,
@@ -32,18 +33,18 @@ def create_or_resolve(
     stmt = select(target_cls).where(
         func.lower(getattr(target_cls, lookup_field)) == target_value
     )
-    result = session.exec(stmt).first()
+    result = (await session.exec(stmt)).first()
     if result:
         return result, True
     if create:
         try:
             obj: SQLModel = target_cls(**{lookup_field: target_value.strip()})
             session.add(obj)
-            session.commit()
-            session.refresh(obj)
+            await session.commit()
+            await session.refresh(obj)
             return obj, False
         except SQLAlchemyError as e:
-            session.rollback()
+            await session.rollback()
             logger.error(f"[DB] could not create {target_cls} {e}")
             raise ValueError(f"[DB] failed to create {target_cls} an error occured {e}")
     raise ValueError(
@@ -53,6 +54,106 @@ def create_or_resolve(
     
 
 
+async def _insert_missing(
+    target_cls: Type[T], rows: List[Dict[str, Any]], lookup_field: str, session: SessionDep
+) -> None:
+    """Insert `rows` in one statement, skipping any another writer inserted first."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(target_cls).on_conflict_do_nothing(
+            index_elements=[lookup_field]
+        )
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(target_cls).on_conflict_do_nothing(
+            index_elements=[lookup_field]
+        )
+    else:
+        stmt = insert(target_cls)
+    await session.exec(stmt.values(rows))  # type: ignore[call-overload]
+
+
+async def bulk_create_or_resolve(
+    target_cls: Type[T],
+    target_values: Iterable[str],
+    session: SessionDep,
+    lookup_field: str = "name",
+    create: bool = True,
+) -> Dict[str, T]:
+    """
+    Resolve many names of one model at once, creating the missing ones.
+
+    Existing rows are found with a single case-insensitive `IN` query and the
+    missing ones are inserted with a single statement, so the cost does not grow
+    with the number of names. Nothing is committed; the rows become part of the
+    caller's transaction.
+
+    Args:
+        target_cls: Model to resolve, e.g. Topic.
+        target_values: Names to resolve; duplicates and case variants share a row.
+        session: Database session dependency.
+        lookup_field: Unique column the names are matched against.
+        create: Create missing rows; if False a missing name raises ValueError.
+
+    Returns:
+        Dict mapping every input value to its row.
+    """
+    try:
+        column = getattr(target_cls, lookup_field)
+    except AttributeError:
+        raise ValueError(f"{lookup_field} is not a property of {target_cls}")
+
+    values = list(target_values)
+    keys = {value: value.strip().lower() for value in values}
+    if not keys:
+        return {}
+
+    async def lookup(wanted: Iterable[str]) -> Dict[str, T]:
+        stmt = select(target_cls).where(func.lower(column).in_(set(wanted)))
+        return {
+            getattr(row, lookup_field).strip().lower(): row
+            for row in (await session.exec(stmt)).all()
+        }
+
+    try:
+        found = await lookup(keys.values())
+        missing: Dict[str, str] = {}
+        for value, key in keys.items():
+            if key not in found:
+                missing.setdefault(key, value.strip())
+        if missing and not create:
+            raise ValueError(
+                f"Objects of type '{target_cls.__name__}' with {lookup_field} in "
+                f"{sorted(missing.values())} not found and create=False"
+            )
+        if missing:
+            rows = [
+                target_cls(**{lookup_field: name}).model_dump()
+                for name in missing.values()
+            ]
+            await _insert_missing(target_cls, rows, lookup_field, session)
+            found.update(await lookup(missing))
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] could not resolve {target_cls} {e}")
+        raise ValueError(f"[DB] failed to resolve {target_cls} an error occured {e}")
+    return {value: found[key] for value, key in keys.items()}
+
+
+async def resolve_relationship_values(
+    target_cls: Type[T], value: Any, session: SessionDep
+) -> T | List[T]:
+    """Resolve a relationship value (a name or list of names) to rows in one round trip."""
+    if isinstance(value, str):
+        return (await bulk_create_or_resolve(target_cls, [value], session))[value]
+    if isinstance(value, list):
+        resolved = await bulk_create_or_resolve(target_cls, value, session)
+        # Names differing only in case resolve to the same row; attach it once
+        return list({id(resolved[v]): resolved[v] for v in value}.values())
+    raise ValueError(
+        f"Got value of type {type(value)} not expected and not implemented yet"
+    )
+
+
 def get_all_model_relationships(model: Type[SQLModel]) -> Dict[str, Type[SQLModel]]:
     mapper = inspect(model)
     relationships = {}
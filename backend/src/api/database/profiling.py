@@ -0,0 +1,181 @@
+"""
+Per-statement query timings.
+
+`instrument_engine` hooks an engine's cursor events and records how long every
+statement took in a `QueryTimings` histogram, split by statement kind (SELECT,
+INSERT, ...). Statements slower than a threshold are logged with their SQL and
+the shape of their parameters (types and counts, never the values).
+"""
+
+# --- Standard Library ---
+import bisect
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# --- Third-Party ---
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# --- Internal ---
+from src.api.core import logger
+
+# Upper bounds of the histogram buckets in milliseconds; a last bucket takes the rest
+BUCKET_BOUNDS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SLOW_QUERY_SQL_CHARS = 2000
+
+_START_ATTR = "_query_start_time"
+
+
+class Histogram:
+    """Counts of durations per bucket, plus their count, sum and maximum."""
+
+    def __init__(self, bounds: Sequence[float] = BUCKET_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (the maximum for the last bucket)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def stats(self) -> Dict[str, Any]:
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class QueryTimings:
+    """Thread-safe statement timings, overall and per statement kind."""
+
+    def __init__(self, slow_query_ms: float = 250.0):
+        self.slow_query_ms = slow_query_ms
+        self.slow = 0
+        self._all = Histogram()
+        self._by_kind: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        executemany: bool = False,
+    ) -> None:
+        kind = statement_kind(statement)
+        is_slow = duration_ms >= self.slow_query_ms
+        with self._lock:
+            self._all.add(duration_ms)
+            self._by_kind.setdefault(kind, Histogram()).add(duration_ms)
+            if is_slow:
+                self.slow += 1
+        if is_slow:
+            logger.warning(
+                "[DB] slow query %.1f ms: %s | params %s",
+                duration_ms,
+                " ".join(statement.split())[:SLOW_QUERY_SQL_CHARS],
+                parameter_shape(parameters, executemany),
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self.slow = 0
+            self._all = Histogram()
+            self._by_kind = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._all.stats(),
+                "slow": self.slow,
+                "slow_query_ms": self.slow_query_ms,
+                "by_kind": {kind: h.stats() for kind, h in sorted(self._by_kind.items())},
+            }
+
+
+def statement_kind(statement: str) -> str:
+    """First keyword of a statement, e.g. "SELECT" or "PRAGMA"."""
+    words = statement.split(None, 1)
+    if not words:
+        return "OTHER"
+    kind = words[0].upper()
+    return kind if kind.isalpha() else "OTHER"
+
+
+def _type_runs(values: Sequence[Any]) -> str:
+    """Value types in order with consecutive repeats collapsed, e.g. "(str, int x 3)"."""
+    runs: List[List[Any]] = []
+    for value in values:
+        name = type(value).__name__
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return "(" + ", ".join(n if c == 1 else f"{n} x {c}" for n, c in runs) + ")"
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Describe bound parameters without their values, e.g. "{id: UUID}",
+    "(str x 500)" for a large IN list, or "20 rows of {title: str, ...}".
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else "nothing"
+        return f"{len(parameters)} rows of {first}"
+    if not parameters:
+        return "none"
+    if isinstance(parameters, dict):
+        fields = ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+        return "{" + fields + "}"
+    if isinstance(parameters, (list, tuple)):
+        return _type_runs(parameters)
+    return type(parameters).__name__
+
+
+def instrument_engine(engine: Engine | AsyncEngine, timings: QueryTimings) -> QueryTimings:
+    """Record the duration of every statement `engine` executes into `timings`."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    # The start time lives on the statement's execution context, so a statement
+    # that fails (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _START_ATTR, time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, _START_ATTR, None)
+        if started is None:
+            return
+        timings.record(
+            statement, parameters, (time.perf_counter() - started) * 1000, executemany
+        )
+
+    return timings
@@ -1,23 +1,50 @@
 # --- Standard Library ---
-import asyncio
-from typing import Sequence, Union, Literal
+import base64
+import json
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union, Literal
 from uuid import UUID
 
 # --- Third-Party ---
 from pydantic import ValidationError
-from sqlalchemy import or_
+from sqlalchemy import and_, insert, inspect, or_
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import delete, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import SQLModel, delete, select
 from pathlib import Path
 
 # --- Internal ---
 from src.api.core import logger
 from src.api.database import SessionDep, generic_db as gdb
+from src.api.database import search as sdb
 from src.api.database.generic_db import filter_conditional
-from src.api.models.models import Question
+from src.api.models.models import Question, QuestionSearch
 from src.api.models.question import QuestionMeta, QuestionData
 from src.utils import convert_uuid
 
+# Relationships returned with every QuestionMeta; loaded eagerly so a page of
+# questions costs one query per relationship instead of one per question
+QUESTION_META_RELATIONSHIPS: List[str] = [
+    name
+    for name in gdb.get_all_model_relationships(Question)
+    if name in QuestionMeta.model_fields
+]
+
+
+def question_meta_options() -> list:
+    """Loader options that fetch the QuestionMeta relationships alongside the questions."""
+    return [selectinload(getattr(Question, name)) for name in QUESTION_META_RELATIONSHIPS]
+
+
+def question_columns() -> List[str]:
+    """Names of the Question column attributes."""
+    return list(inspect(Question).columns.keys())
+
+
+def to_question_meta(question: Question) -> QuestionMeta:
+    """Build a QuestionMeta from a question whose relationships are already loaded."""
+    relationship_data = {name: getattr(question, name) for name in QUESTION_META_RELATIONSHIPS}
+    return QuestionMeta(**question.model_dump(), **relationship_data)
+
 
 async def create_question(
     question: QuestionData | dict,
@@ -39,37 +66,159 @@ async def create_question(
     question_base = Question.model_validate(base_values)
     session.add(question_base)
 
-    for key, value in relation_values.items():
-        target_class = relationships[key]
-        if isinstance(value, list):
-            rel_val = [
-                gdb.create_or_resolve(target_class, v, session)[0] for v in value
-            ]
-        elif isinstance(value, str):
-            rel_val = gdb.create_or_resolve(target_class, value, session)[0]
-        else:
-            raise NotImplementedError(
-                "Have not implmeneted method to handle non list or string values "
+    # Kept pending while resolving names: setting a relationship of a flushed
+    # question would first have to load its old value
+    resolved: Dict[str, Any] = {}
+    with session.no_autoflush:
+        for key, value in relation_values.items():
+            if not isinstance(value, (list, str)):
+                raise NotImplementedError(
+                    "Have not implmeneted method to handle non list or string values "
+                )
+            rel_val = await gdb.resolve_relationship_values(
+                relationships[key], value, session
             )
-        setattr(Question, key, rel_val)
+            setattr(question_base, key, rel_val)
+            resolved[key] = rel_val if isinstance(rel_val, list) else [rel_val]
 
     try:
-        session.commit()
-        session.refresh(question_base)
+        await session.flush()  # assigns the id when the data carried id=None
+        await sdb.stage_search_text(
+            question_base.id,  # type: ignore[arg-type]
+            session,
+            title=question_base.title or "",
+            topics=sdb.topic_text([t.name for t in resolved.get("topics", [])]),
+        )
+        await session.commit()
+        # Columns only; a full refresh would expire the relationships just set,
+        # and an async session cannot lazy load them back
+        await session.refresh(question_base, attribute_names=question_columns())
         return question_base
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] could not create question {e}")
         raise ValueError(f"[DB] failed to create question an error occured {e}")
 
 
-def get_question(id: str | UUID | None, session: SessionDep) -> Question | None:
+def prepare_question(question: QuestionData | dict) -> Tuple[Question, Dict[str, Any]]:
+    """
+    Validate question data without touching the database.
+
+    Unset fields take the Question defaults (a new id, ai_generated=False, ...).
+
+    Returns:
+        The Question row and its relationship values, e.g. {"topics": ["math"]}.
+
+    Raises:
+        ValueError: If the data is not a valid question.
+    """
+    relationships = gdb.get_all_model_relationships(Question)
+    try:
+        if isinstance(question, dict):
+            question = QuestionData.model_validate(question)
+        values = question.model_dump(exclude_none=True)
+        relation_values = {k: v for k, v in values.items() if k in relationships}
+        base_values = {k: v for k, v in values.items() if k not in relationships}
+        row = Question.model_validate(base_values)
+    except ValidationError as e:
+        raise ValueError(f"Invalid question data: {e}")
+    for key, value in relation_values.items():
+        if isinstance(value, str):
+            relation_values[key] = [value]
+        elif not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"{key} must be a name or a list of names")
+    return row, relation_values
+
+
+async def bulk_create_questions(
+    questions: Sequence[Tuple[Question, Dict[str, Any]]],
+    session: SessionDep,
+    extra_rows: Sequence[SQLModel] = (),
+    search_text: Mapping[UUID, Dict[str, str]] = {},
+) -> List[Question]:
+    """
+    Insert many prepared questions and their relationship links in one transaction.
+
+    Questions and link rows are each written with a single executemany insert,
+    and relationship names are resolved once per model for the whole batch.
+
+    Args:
+        questions: (Question, relationship values) pairs from `prepare_question`.
+        session: Database session dependency.
+        extra_rows: Rows that depend on the questions (e.g. runner metadata),
+            committed in the same transaction.
+        search_text: Text of the questions' indexed files by question id, e.g.
+            {id: {"question_text": ...}}; titles and topics are indexed anyway.
+
+    Returns:
+        The inserted Question rows.
+    """
+    if not questions:
+        return []
+    mapper = inspect(Question)
+    try:
+        await session.exec(  # type: ignore[call-overload]
+            insert(Question),
+            params=[
+                row.model_dump(exclude=set(mapper.relationships.keys()))
+                for row, _ in questions
+            ],
+        )
+        for key, rel in mapper.relationships.items():
+            names = [
+                name
+                for _, relation_values in questions
+                for name in relation_values.get(key, [])
+            ]
+            if not names or rel.secondary is None:
+                continue
+            resolved = await gdb.bulk_create_or_resolve(rel.mapper.class_, names, session)
+            # Link columns, e.g. question_id <- question.id and topic_id <- topic.id
+            [(question_col, question_fk)] = rel.synchronize_pairs
+            [(target_col, target_fk)] = rel.secondary_synchronize_pairs
+            links = {
+                (getattr(row, question_col.key), getattr(resolved[name], target_col.key))
+                for row, relation_values in questions
+                for name in relation_values.get(key, [])
+            }
+            await session.exec(  # type: ignore[call-overload]
+                insert(rel.secondary),
+                params=[
+                    {question_fk.key: question_id, target_fk.key: target_id}
+                    for question_id, target_id in links
+                ],
+            )
+        await session.exec(  # type: ignore[call-overload]
+            insert(QuestionSearch),
+            params=[
+                QuestionSearch(
+                    question_id=row.id,  # type: ignore[arg-type]
+                    title=row.title or "",
+                    topics=sdb.topic_text(relation_values.get("topics", [])),
+                    **search_text.get(row.id, {}),  # type: ignore[arg-type]
+                ).model_dump(exclude={"id"})
+                for row, relation_values in questions
+            ],
+        )
+        session.add_all(extra_rows)
+        await session.commit()
+        return [row for row, _ in questions]
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to bulk create questions {e}")
+        raise ValueError(f"[DB] failed to bulk create questions {e}")
+
+
+async def get_question(
+    id: str | UUID | None, session: SessionDep, eager: bool = False
+) -> Question | None:
     """
     Fetch a single Question by its ID.
 
     Args:
         question_id: The question's identifier (UUID or string convertible to UUID).
         session: Database session dependency.
+        eager: Also load the QuestionMeta relationships.
 
     Returns:
         The matching Question instance, or None if not found.
@@ -77,26 +226,47 @@ def get_question(id: str | UUID | None, session: SessionDep) -> Question | None:
     try:
         assert id
         question_id = convert_uuid(id)
-        return session.exec(select(Question).where(Question.id == question_id)).first()
+        stmt = select(Question).where(Question.id == question_id)
+        if eager:
+            stmt = stmt.options(*question_meta_options())
+        return (await session.exec(stmt)).first()
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] could not create question {e}")
         raise ValueError(f"[DB] failed to retrieve question an error occured {e}")
 
 
-def delete_all_questions(session: SessionDep) -> bool:
+async def existing_question_ids(
+    ids: Sequence[UUID], session: SessionDep, chunk_size: int = 500
+) -> Set[UUID]:
+    """The ids among `ids` that already belong to a question, checked `chunk_size` at a time."""
+    found: Set[UUID] = set()
+    try:
+        for start in range(0, len(ids), chunk_size):
+            stmt = select(Question.id).where(
+                Question.id.in_(ids[start : start + chunk_size])  # type: ignore[union-attr]
+            )
+            found.update((await session.exec(stmt)).all())
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to look up question ids {e}")
+        raise ValueError(f"[DB] failed to look up question ids {e}")
+    return found
+
+
+async def delete_all_questions(session: SessionDep) -> bool:
     try:
         statement = delete(Question)
-        session.exec(statement)
-        session.commit()
+        await session.exec(statement)
+        await session.commit()
         return True
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] failed to delete all questions {e}")
         raise ValueError(f"[DB] failed todelete all questions an error occured {e}")
 
 
-def get_all_questions(
+async def get_all_questions(
     session: SessionDep,
     offset: int = 0,
     limit: int = 100,
@@ -113,25 +283,100 @@ def get_all_questions(
         A sequence of Question instances.
     """
     try:
-        return session.exec(select(Question).offset(offset).limit(limit)).all()
+        stmt = select(Question).order_by(Question.id).offset(offset).limit(limit)
+        return (await session.exec(stmt)).all()
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] failed to retrieve all questions {e}")
         raise ValueError(f"[DB] failed to retrieve all question {e}")
 
 
-def delete_question(id: str | UUID | None, session: SessionDep) -> bool:
+def encode_cursor(last_id: UUID) -> str:
+    """Opaque token pointing just past the question with `last_id`."""
+    payload = json.dumps({"id": str(last_id)}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> UUID:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by `encode_cursor`.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return convert_uuid(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+async def get_question_page(
+    session: SessionDep,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    eager: bool = False,
+) -> Tuple[Sequence[Question], Optional[str]]:
+    """
+    Retrieve a page of questions ordered by id, starting after `cursor`.
+
+    Unlike offset pagination the cost of a page does not depend on how deep it
+    is, and rows inserted or deleted meanwhile do not shift later pages.
+
+    Args:
+        session: Database session dependency.
+        limit: Maximum number of rows to return (default 100).
+        cursor: `next_cursor` of the previous page; None for the first page.
+        eager: Also load the QuestionMeta relationships.
+
+    Returns:
+        The questions and the cursor of the next page, or None on the last page.
+    """
+    stmt = select(Question).order_by(Question.id).limit(limit + 1)
+    if cursor is not None:
+        stmt = stmt.where(Question.id > decode_cursor(cursor))
+    if eager:
+        stmt = stmt.options(*question_meta_options())
+    try:
+        rows = (await session.exec(stmt)).all()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to retrieve question page {e}")
+        raise ValueError(f"[DB] failed to retrieve question page {e}")
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)  # type: ignore[arg-type]
+    return rows, None
+
+
+async def iter_all_questions(
+    session: SessionDep, batch_size: int = 500, eager: bool = False
+) -> AsyncIterator[Question]:
+    """
+    Walk the whole question table one keyset page at a time.
+
+    Only one page is held at a time, so memory stays constant however many
+    questions exist, and questions may be deleted while iterating.
+    """
+    cursor: Optional[str] = None
+    while True:
+        rows, cursor = await get_question_page(session, batch_size, cursor, eager)
+        for row in rows:
+            yield row
+        if cursor is None:
+            return
+
+
+async def delete_question(id: str | UUID | None, session: SessionDep) -> bool:
     try:
-        question = get_question(id, session)
+        question = await get_question(id, session)
         if not question:
             logger.warning("[DB] cannot delete question, question is not found")
             return False
-        session.delete(question)
-        session.commit()
-        session.flush()
+        await session.delete(question)
+        await session.commit()
+        await session.flush()
         return True
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] failed to delete question {e}")
         raise ValueError(f"[DB] failed to delete question {e}")
 
@@ -154,16 +399,22 @@ async def get_question_data(
     Raises:
         HTTPException(404): If the question is not found.
     """
-    question = get_question(id, session)
+    try:
+        assert id
+        stmt = (
+            select(Question)
+            .where(Question.id == convert_uuid(id))
+            .options(*question_meta_options())
+        )
+        question = (await session.exec(stmt)).first()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] could not retrieve question data {e}")
+        raise ValueError(f"[DB] failed to retrieve question data {e}")
     if not question:
         logger.info("Question is none")
         raise ValueError("Could not get question data question is None")
-    relationship_data = gdb.get_all_model_relationship_data(question, Question)
-    logger.info("Getting relationship data %s", relationship_data)
-    question_data = question.model_dump()
-    q = QuestionMeta(**question_data, **relationship_data)
-    logger.info("Getting data complete %s", q)
-    return q
+    return to_question_meta(question)
 
 
 async def get_all_question_data(
@@ -172,6 +423,9 @@ async def get_all_question_data(
     """
     Retrieve paginated Questions and return each as a dict with relationships.
 
+    Relationships are eager-loaded, so a page costs the same number of queries
+    whatever its size.
+
     Args:
         session: Database session dependency.
         offset: Number of rows to skip (default 0).
@@ -180,127 +434,166 @@ async def get_all_question_data(
     Returns:
         A list of dicts, each representing a Question with relationship values.
     """
-    results: Sequence[Question] = get_all_questions(session, offset=offset, limit=limit)
-    logger.debug("These are the questions %s", results)
-    tasks = [get_question_data(r.id, session=session) for r in results]
-    return await asyncio.gather(*tasks)
+    try:
+        stmt = (
+            select(Question)
+            .options(*question_meta_options())
+            .order_by(Question.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        results: Sequence[Question] = (await session.exec(stmt)).all()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to retrieve all question data {e}")
+        raise ValueError(f"[DB] failed to retrieve all question data {e}")
+    return [to_question_meta(r) for r in results]
 
 
 async def update_question(
     id: str | UUID, update_data: QuestionData, session: SessionDep
 ) -> QuestionMeta:
     relationships = gdb.get_all_model_relationships(Question)
-    question = get_question(id, session)
+    # Replacing a collection reads the old one, so it must already be loaded
+    question = await get_question(id, session, eager=True)
     if not question:
         raise ValueError("Question is not found")
     for key, value in update_data.model_dump(exclude_unset=True).items():
         if value is None:
             continue
         if key in relationships:
-            target_class = relationships[key]
-            if isinstance(value, list):
-                rel_val = [
-                    gdb.create_or_resolve(target_class, v, session)[0] for v in value
-                ]
-
-            elif isinstance(value, str):
-                rel_val = gdb.create_or_resolve(target_class, value, session)[0]
-
-            else:
-                raise ValueError(
-                    f"Got value of type {type(value)} not expected and not implemented yet"
-                )
-
+            rel_val = await gdb.resolve_relationship_values(
+                relationships[key], value, session
+            )
             logger.info("Updating question %s %s %s", question, key, rel_val)
             setattr(question, key, rel_val)
         else:
             setattr(question, key, value)
     try:
+        await sdb.stage_search_text(
+            question.id,  # type: ignore[arg-type]
+            session,
+            title=question.title or "",
+            topics=sdb.topic_text([t.name for t in question.topics]),
+        )
         logger.info("Adding question after update %s", question)
-        session.commit()
-        return await get_question_data(question.id, session)
+        await session.commit()
+        return to_question_meta(question)
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"[DB] failed to update question {e}")
         raise ValueError(f"[DB] failed to update question {e}")
 
 
+def relationship_condition(
+    key: str, conditions: Sequence[Any], match_all: bool = False
+):
+    """
+    Condition on Question that its `key` relationship has a row matching the
+    conditions: any of them, or with `match_all` each of them.
+
+    Written as `question.id IN (SELECT question_id FROM <link> WHERE <target>_id
+    IN (SELECT id FROM <target> WHERE ...))`, a semi-join that never duplicates
+    questions and is served by the (target_id, question_id) link index.
+    """
+    rel = inspect(Question).relationships[key]
+    [(_, question_fk)] = rel.synchronize_pairs
+    [(target_col, target_fk)] = rel.secondary_synchronize_pairs
+
+    def linked(condition):
+        targets = select(target_col).where(condition)
+        return Question.id.in_(select(question_fk).where(target_fk.in_(targets)))  # type: ignore[union-attr]
+
+    if match_all:
+        return and_(*[linked(c) for c in conditions])
+    return linked(or_(*conditions))
+
+
+# Column holding `question_path` for each storage type
+STORAGE_PATH_COLUMNS = {"cloud": "blob_path", "local": "local_path"}
+
+
 async def filter_questions(
     data: QuestionData,
     session: SessionDep,
     relationship_field: str = "name",
+    match_all: Sequence[str] = (),
+    storage_type: Optional[Literal["cloud", "local"]] = None,
 ) -> Sequence[QuestionMeta]:
+    """
+    Questions matching every given field of `data`.
+
+    Matches are case-insensitive: partial for text columns such as the title,
+    whole names for relationships; booleans and numbers are exact. A list
+    matches any of its values, or for relationships named in `match_all`
+    (e.g. ["topics"]) all of them. Unset or empty fields are ignored.
+    `question_path` matches the path of `storage_type`, or of either storage
+    type when it is not given.
+
+    Raises:
+        ValueError: If a field cannot be filtered on or on a database error.
+    """
     relationships = gdb.get_all_model_relationships(Question)
-    filters = []
-    joins = set()
-    stmt = select(Question)
+    columns = set(inspect(Question).columns.keys())
+    unknown = set(match_all) - set(relationships)
+    if unknown:
+        raise ValueError(f"match_all must name relationships, got {sorted(unknown)}")
 
+    filters = []
     for key, value in data.model_dump(exclude_none=True).items():
-        if not value:
+        if value == "" or value == []:
             continue
+        values = value if isinstance(value, list) else [value]
 
-        conds = []
-
-        # --- Handle Relationship Filters ---
         if key in relationships:
-            relationship_model = relationships[key]
-            joins.add(key)
-            logger.info("This is join %s", joins)
-            if isinstance(value, list):
-                rel_conds = [
-                    filter_conditional(
-                        relationship_model,
-                        relationship_field,
-                        v,
-                    )
-                    for v in value
-                ]
-                conds.append(or_(*rel_conds))
-            else:
-                conds.append(
-                    filter_conditional(
-                        relationship_model,
-                        relationship_field,
-                        value,
-                    )
+            # Names are tags, so match them whole, as they are resolved on create
+            conditions = [
+                filter_conditional(relationships[key], relationship_field, v, partial=False)
+                for v in values
+            ]
+            filters.append(
+                relationship_condition(key, conditions, key in match_all)
+            )
+        elif key in columns:
+            filters.append(or_(*[filter_conditional(Question, key, v) for v in values]))
+        elif key == "question_path":
+            path_columns = (
+                [STORAGE_PATH_COLUMNS[storage_type]]
+                if storage_type
+                else list(STORAGE_PATH_COLUMNS.values())
+            )
+            filters.append(
+                or_(
+                    *[
+                        filter_conditional(Question, column, v)
+                        for column in path_columns
+                        for v in values
+                    ]
                 )
-
-        # --- Handle Regular Column Filters ---
+            )
         else:
-            if isinstance(value, list):
-                conds.append(
-                    or_(*[filter_conditional(Question, key, v) for v in value])
-                )
-            else:
-
-                conds.append(filter_conditional(Question, key, value))
-
-        if conds:
-            filters.append(or_(*conds))
-
-    # --- Apply Filters ---
-    # --- Apply Relationship Joins ---
-    if filters:
-        stmt = stmt.where(*filters)
-
-    stmt = stmt.distinct()  # prevent non uniqy
-
-    # IDK how to fix
-    # for rel in joins:
-    #     logger.info("joining on rel=%s type=%s", rel, type(rel))
-    #     print("Question type:", type(Question))
-    #     stmt = stmt.join(getattr(Question, rel))
-
-    # --- Execute and Return ---
-    results = session.exec(stmt).all()
-    return await asyncio.gather(*[get_question_data(r.id, session) for r in results])
+            raise ValueError(f"Cannot filter questions on '{key}'")
+
+    stmt = (
+        select(Question)
+        .where(*filters)
+        .options(*question_meta_options())
+        .order_by(Question.id)
+    )
+    try:
+        results = (await session.exec(stmt)).all()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to filter questions {e}")
+        raise ValueError(f"[DB] failed to filter questions {e}")
+    return [to_question_meta(r) for r in results]
 
 
-def get_question_path(
+async def get_question_path(
     id: str | UUID | None, storage_type: Literal["cloud", "local"], session: SessionDep
 ) -> str | None:
     """Retrieve the storage path (cloud or local) for a question."""
-    question = get_question(id, session)
+    question = await get_question(id, session)
     if not question:
         raise ValueError("Question not found")
 
@@ -312,7 +605,7 @@ def get_question_path(
         raise ValueError(f"Invalid storage type: {storage_type}")
 
 
-def set_question_path(
+async def set_question_path(
     id: str | UUID | None,
     path: Path | str,
     storage_type: Literal["cloud", "local"],
@@ -321,7 +614,7 @@ def set_question_path(
     """
     Update the question's storage path (local or cloud) and persist the change in the database.
     """
-    question = get_question(id, session)
+    question = await get_question(id, session)
     if not question:
         raise ValueError("Question not found")
 
@@ -335,10 +628,10 @@ def set_question_path(
             raise ValueError(f"Invalid storage type: {storage_type}")
 
         session.add(question)
-        session.commit()
-        session.refresh(question)
+        await session.commit()
+        await session.refresh(question)
         return question
 
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         raise RuntimeError(f"Failed to update question path: {e}")
@@ -0,0 +1,71 @@
+# --- Standard Library ---
+from datetime import datetime, timezone
+from uuid import UUID
+
+# --- Third-Party ---
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.database import SessionDep
+from src.api.models.models import RunnerMetadata
+from src.code_runner.models import ServerAnalysis
+from src.utils import convert_uuid
+
+
+async def get_runner_metadata(
+    question_id: str | UUID, language: str, session: SessionDep
+) -> RunnerMetadata | None:
+    """
+    Fetch the recorded analysis of a question's server file.
+
+    Args:
+        question_id: The question's identifier (UUID or string convertible to UUID).
+        language: "python" or "javascript".
+        session: Database session dependency.
+
+    Returns:
+        The RunnerMetadata row, or None if the file was never analyzed.
+    """
+    try:
+        return await session.get(RunnerMetadata, (convert_uuid(question_id), language))
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to retrieve runner metadata {e}")
+        raise ValueError(f"[DB] failed to retrieve runner metadata {e}")
+
+
+def new_runner_metadata(question_id: str | UUID, analysis: ServerAnalysis) -> RunnerMetadata:
+    """An unsaved RunnerMetadata row holding `analysis` for the question."""
+    return RunnerMetadata(
+        question_id=convert_uuid(question_id),
+        analyzed_at=datetime.now(timezone.utc),
+        **analysis.model_dump(),
+    )
+
+
+async def upsert_runner_metadata(
+    question_id: str | UUID, analysis: ServerAnalysis, session: SessionDep
+) -> RunnerMetadata:
+    """Store `analysis` as the question's runner metadata for its language."""
+    try:
+        qid = convert_uuid(question_id)
+        record = await session.get(RunnerMetadata, (qid, analysis.language))
+        if record is None:
+            record = new_runner_metadata(qid, analysis)
+        else:
+            for key, value in analysis.model_dump(exclude={"language"}).items():
+                setattr(record, key, value)
+            record.analyzed_at = datetime.now(timezone.utc)
+        session.add(record)
+        await session.commit()
+        await session.refresh(record)
+        return record
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to store runner metadata {e}")
+        raise ValueError(f"[DB] failed to store runner metadata {e}")
+
+
+def to_server_analysis(record: RunnerMetadata) -> ServerAnalysis:
+    return ServerAnalysis.model_validate(record.model_dump())
@@ -0,0 +1,233 @@
+"""
+Full-text search over questions.
+
+Every question has a `question_search` row holding its title, topic names and
+the plain text of its `question.html` and `solution.html`. The row is written
+in the same transaction as the question and rewritten when one of those files
+is saved. The database keeps a full-text index over it (see
+`models.QuestionSearch`): FTS5 in SQLite, a weighted tsvector with a GIN index
+in Postgres. A search is then one indexed, ranked query, instead of the
+`LIKE '%...%'` scans used by `/questions/filter`.
+"""
+
+# --- Standard Library ---
+import re
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+# --- Third-Party ---
+from bs4 import BeautifulSoup
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.database import SessionDep
+from src.api.models.models import QuestionSearch
+from src.utils import convert_uuid
+
+# Files whose text is indexed, and the column each one fills
+SEARCH_FILES: Dict[str, str] = {
+    "question.html": "question_text",
+    "solution.html": "solution_text",
+}
+SEARCH_COLUMNS = ("title", "topics", "question_text", "solution_text")
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+
+# SQLite: bm25 weight of each column, in SEARCH_COLUMNS order
+SQLITE_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+# Postgres: text search configuration used by the generated tsvector column
+POSTGRES_CONFIG = "english"
+
+SearchHit = Tuple[UUID, str, str, float]  # (question id, title, snippet, score)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def html_to_text(content: str | bytes) -> str:
+    """The visible text of an HTML document, whitespace collapsed."""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="ignore")
+    soup = BeautifulSoup(content, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    return " ".join(soup.get_text(" ").split())
+
+
+def file_search_text(filename: str, content: object) -> Optional[Tuple[str, str]]:
+    """(column, text) for an indexed file, or None for any other file."""
+    column = SEARCH_FILES.get(filename)
+    if column is None or not isinstance(content, (str, bytes)):
+        return None
+    return column, html_to_text(content)
+
+
+async def stage_search_text(
+    question_id: str | UUID, session: SessionDep, **columns: str
+) -> QuestionSearch:
+    """
+    Set some of a question's search columns, creating its row if needed.
+
+    Nothing is committed, so the change is part of the caller's transaction.
+    """
+    unknown = set(columns) - set(SEARCH_COLUMNS)
+    if unknown:
+        raise ValueError(f"Not search columns: {sorted(unknown)}")
+    qid = convert_uuid(question_id)
+    row = (
+        await session.exec(
+            select(QuestionSearch).where(QuestionSearch.question_id == qid)
+        )
+    ).first()
+    if row is None:
+        row = QuestionSearch(question_id=qid)
+    for key, value in columns.items():
+        setattr(row, key, value or "")
+    session.add(row)
+    return row
+
+
+async def upsert_search_text(
+    question_id: str | UUID, session: SessionDep, **columns: str
+) -> QuestionSearch:
+    """Set some of a question's search columns and commit."""
+    try:
+        row = await stage_search_text(question_id, session, **columns)
+        await session.commit()
+        return row
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to store search text {e}")
+        raise ValueError(f"[DB] failed to store search text {e}")
+
+
+def topic_text(names: List[str]) -> str:
+    return " ".join(names)
+
+
+def _query_words(query: str) -> List[str]:
+    """
+    The words of a free-text query. Only word characters are kept, so operators
+    or punctuation typed by a user can never produce a query syntax error.
+    """
+    return _WORD.findall(query)
+
+
+def _sqlite_match_query(words: List[str]) -> str:
+    """FTS5 query: every word must match, the last one as a prefix so results appear while typing."""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _postgres_tsquery_text(words: List[str]) -> str:
+    """to_tsquery input with the same meaning as `_sqlite_match_query`."""
+    return " & ".join(words) + ":*"
+
+
+async def _search_sqlite(
+    words: List[str], session: SessionDep, limit: int, offset: int
+) -> List[SearchHit]:
+    weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+    stmt = text(
+        f"""
+        SELECT s.question_id,
+               highlight(question_search_fts, 0, :open, :close),
+               snippet(question_search_fts, -1, :open, :close, '…', :tokens),
+               bm25(question_search_fts, {weights}) AS rank
+        FROM question_search_fts
+        JOIN question_search AS s ON s.id = question_search_fts.rowid
+        WHERE question_search_fts MATCH :match
+        ORDER BY rank
+        LIMIT :limit OFFSET :offset
+        """
+    )
+    result = await session.exec(  # type: ignore[call-overload]
+        stmt,
+        params={
+            "open": HIGHLIGHT_OPEN,
+            "close": HIGHLIGHT_CLOSE,
+            "tokens": SNIPPET_TOKENS,
+            "match": _sqlite_match_query(words),
+            "limit": limit,
+            "offset": offset,
+        },
+    )
+    rows = result.all()
+    # bm25 is lower for better matches
+    return [(convert_uuid(qid), title, snippet, -rank) for qid, title, snippet, rank in rows]
+
+
+async def _search_postgres(
+    words: List[str], session: SessionDep, limit: int, offset: int
+) -> List[SearchHit]:
+    tsquery = func.to_tsquery(POSTGRES_CONFIG, _postgres_tsquery_text(words))
+    document = literal_column("question_search.document")
+    rank = func.ts_rank_cd(document, tsquery).label("rank")
+    # Rank on the index first; headlines are costly, so only build them for the page
+    top = (
+        select(
+            QuestionSearch.question_id,
+            QuestionSearch.title,
+            QuestionSearch.question_text,
+            QuestionSearch.solution_text,
+            rank,
+        )
+        .where(document.op("@@")(tsquery))
+        .order_by(rank.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    options = (
+        f"StartSel={HIGHLIGHT_OPEN}, StopSel={HIGHLIGHT_CLOSE}, "
+        f"MaxWords={SNIPPET_TOKENS}, MinWords={SNIPPET_TOKENS // 2}"
+    )
+    stmt = select(
+        top.c.question_id,
+        func.ts_headline(POSTGRES_CONFIG, top.c.title, tsquery, "HighlightAll=true, " + options),
+        func.ts_headline(
+            POSTGRES_CONFIG,
+            func.concat_ws(" ", top.c.question_text, top.c.solution_text),
+            tsquery,
+            options,
+        ),
+        top.c.rank,
+    ).order_by(top.c.rank.desc())
+    return [tuple(row) for row in (await session.exec(stmt)).all()]  # type: ignore[misc]
+
+
+async def search_questions(
+    query: str, session: SessionDep, limit: int = 20, offset: int = 0
+) -> List[SearchHit]:
+    """
+    Rank questions against a free-text query.
+
+    Every word of the query must match, the last one also as a prefix. Titles
+    weigh most, then topics, then the question text, then the solution.
+
+    Returns:
+        (question id, highlighted title, highlighted snippet, score) per match,
+        best first; a higher score is a better match.
+
+    Raises:
+        ValueError: On a database error or a database without full-text search.
+    """
+    words = _query_words(query)
+    if not words:
+        return []
+    dialect = session.get_bind().dialect.name
+    try:
+        if dialect == "sqlite":
+            return await _search_sqlite(words, session, limit, offset)
+        if dialect == "postgresql":
+            return await _search_postgres(words, session, limit, offset)
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"[DB] failed to search questions {e}")
+        raise ValueError(f"[DB] failed to search questions {e}")
+    raise ValueError(f"Full-text search is not supported on {dialect}")
@@ -13,9 +13,14 @@ from pathlib import Path
 from src.api.core import logger
 
 # Local application imports
-from src.api.database.database import create_db_and_tables
+from src.api.database.database import create_db_and_tables, engine
 from src.api.web import routes
 from src.api.core.config import get_settings
+from src.code_runner.async_runner import shutdown_runner_executor
+from src.code_runner.worker_pool import shutdown_worker_pools
+from src.code_runner.run_py import get_py_worker_pool
+from src.code_runner.forkserver import prestart_forkserver
+from src.code_runner.variant_pool import VARIANT_POOL_REFILLER
 
 settings = get_settings()
 
@@ -23,8 +28,17 @@ settings = get_settings()
 ## Intializes the database
 @asynccontextmanager
 async def on_startup(app: FastAPI):
-    create_db_and_tables()
+    await create_db_and_tables()
+    if settings.PY_EXECUTION_BACKEND == "pool":
+        get_py_worker_pool().prestart()
+    elif settings.PY_EXECUTION_BACKEND == "forkserver":
+        prestart_forkserver()
     yield
+    await VARIANT_POOL_REFILLER.stop()
+    shutdown_worker_pools()
+    shutdown_runner_executor()
+    # Closes the pooled connections (and aiosqlite's connection threads)
+    await engine.dispose()
 
 
 def add_routes(app: FastAPI, routes: list[APIRouter] = routes):
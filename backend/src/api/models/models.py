@@ -1,13 +1,20 @@
 # Standard library
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID, uuid4
 from enum import Enum
 
 # Third-party libraries
+from sqlalchemy import DDL, JSON, Column, Index, event
 from sqlmodel import Field, Relationship, SQLModel
 
 
 class QuestionTopicLink(SQLModel, table=True):
+    # The primary key serves lookups by question; this covers lookups by topic
+    __table_args__ = (
+        Index("ix_questiontopiclink_topic_id_question_id", "topic_id", "question_id"),
+    )
+
     question_id: UUID | None = Field(
         default=None, foreign_key="question.id", primary_key=True
     )
@@ -17,6 +24,11 @@ class QuestionTopicLink(SQLModel, table=True):
 
 
 class QuestionLanguageLink(SQLModel, table=True):
+    # The primary key serves lookups by question; this covers lookups by language
+    __table_args__ = (
+        Index("ix_questionlanguagelink_language_id_question_id", "language_id", "question_id"),
+    )
+
     question_id: UUID | None = Field(
         default=None, foreign_key="question.id", primary_key=True
     )
@@ -26,6 +38,11 @@ class QuestionLanguageLink(SQLModel, table=True):
 
 
 class QuestionQTypeLink(SQLModel, table=True):
+    # The primary key serves lookups by question; this covers lookups by qtype
+    __table_args__ = (
+        Index("ix_questionqtypelink_qtype_id_question_id", "qtype_id", "question_id"),
+    )
+
     question_id: UUID | None = Field(
         default=None, foreign_key="question.id", primary_key=True
     )
@@ -105,3 +122,131 @@ class Topic(SQLModel, table=True):
         back_populates="topics",
         link_model=QuestionTopicLink,
     )
+
+
+class RunnerMetadata(SQLModel, table=True):
+    """Static analysis of one of a question's server files, recorded when it is written."""
+
+    __tablename__ = "runner_metadata"  # type: ignore
+
+    question_id: UUID = Field(
+        foreign_key="question.id", primary_key=True, ondelete="CASCADE"
+    )
+    language: str = Field(primary_key=True)  # "python" | "javascript"
+    code_hash: str  # SHA-256 of the analyzed contents
+    valid: bool = False
+    error: Optional[str] = None
+    has_generate: bool = False
+    arity: Optional[int] = None
+    required_args: Optional[int] = None
+    imports: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    analyzed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# SQLite does not enforce foreign keys here, so a trigger stands in for the
+# ON DELETE CASCADE when a question is deleted.
+event.listen(
+    RunnerMetadata.__table__,
+    "after_create",
+    DDL(
+        """
+    CREATE TRIGGER runner_metadata_question_ad AFTER DELETE ON question BEGIN
+        DELETE FROM runner_metadata WHERE question_id = old.id;
+    END
+    """
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    RunnerMetadata.__table__,
+    "before_drop",
+    DDL("DROP TRIGGER IF EXISTS runner_metadata_question_ad").execute_if(
+        dialect="sqlite"
+    ),
+)
+
+
+class QuestionSearch(SQLModel, table=True):
+    """Searchable text of a question: its title, topic names and the text of its HTML files."""
+
+    __tablename__ = "question_search"  # type: ignore
+
+    # Integer key so the SQLite full-text index can use it as its rowid
+    id: Optional[int] = Field(default=None, primary_key=True)
+    question_id: UUID = Field(
+        foreign_key="question.id", unique=True, index=True, ondelete="CASCADE"
+    )
+    title: str = ""
+    topics: str = ""
+    question_text: str = ""
+    solution_text: str = ""
+
+
+# The full-text indexes are not SQLModel tables; they are created with
+# question_search. SQLite gets an FTS5 index over the table kept current by
+# triggers (question rows are not deleted through the ORM, so a trigger drops
+# their search text as well); Postgres gets a weighted tsvector column with a
+# GIN index.
+_SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE question_search_fts USING fts5(
+        title, topics, question_text, solution_text,
+        content='question_search', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER question_search_ai AFTER INSERT ON question_search BEGIN
+        INSERT INTO question_search_fts(rowid, title, topics, question_text, solution_text)
+        VALUES (new.id, new.title, new.topics, new.question_text, new.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER question_search_ad AFTER DELETE ON question_search BEGIN
+        INSERT INTO question_search_fts(question_search_fts, rowid, title, topics, question_text, solution_text)
+        VALUES ('delete', old.id, old.title, old.topics, old.question_text, old.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER question_search_au AFTER UPDATE ON question_search BEGIN
+        INSERT INTO question_search_fts(question_search_fts, rowid, title, topics, question_text, solution_text)
+        VALUES ('delete', old.id, old.title, old.topics, old.question_text, old.solution_text);
+        INSERT INTO question_search_fts(rowid, title, topics, question_text, solution_text)
+        VALUES (new.id, new.title, new.topics, new.question_text, new.solution_text);
+    END
+    """,
+    """
+    CREATE TRIGGER question_search_question_ad AFTER DELETE ON question BEGIN
+        DELETE FROM question_search WHERE question_id = old.id;
+    END
+    """,
+]
+
+_POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE question_search ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(topics, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(question_text, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(solution_text, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX ix_question_search_document ON question_search USING GIN (document)",
+]
+
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(
+        QuestionSearch.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+for _statement in _POSTGRES_SEARCH_DDL:
+    event.listen(
+        QuestionSearch.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    QuestionSearch.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS question_search_fts").execute_if(dialect="sqlite"),
+)
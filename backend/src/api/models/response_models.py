@@ -1,13 +1,14 @@
 # --- Standard Library ---
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import Any, List, Literal, Optional, Union
 from uuid import UUID
 
 # --- Third-Party ---
 from pydantic import BaseModel, Field
 
 # --- Internal ---
-from src.api.models.question import QuestionMeta
+from src.api.models.models import Question
+from src.api.models.question import QuestionData, QuestionMeta
 
 
 class FileData(BaseModel):
@@ -20,6 +21,26 @@ class FilesData(BaseModel):
     files: List[FileData]
 
 
+class QuestionImport(QuestionData):
+    """A question to create in bulk, with the files to store alongside it."""
+
+    files: List[FileData] = Field(default_factory=list)
+
+
+class BulkQuestionResult(BaseModel):
+    index: int  # position in the request
+    status: Literal["created", "invalid", "failed"]
+    id: Optional[UUID] = None
+    question_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkQuestionResponse(BaseModel):
+    created: int
+    failed: int  # invalid or failed
+    results: List[BulkQuestionResult]
+
+
 class SuccessfulResponse(BaseModel):
     """Base success response shared by all API responses."""
 
@@ -58,3 +79,26 @@ class UpdateFile(BaseModel):
     question_id: str | UUID
     filename: str
     new_content: str | dict
+
+
+class QuestionPage(BaseModel):
+    items: List[Question]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class QuestionMetaPage(BaseModel):
+    items: List[QuestionMeta]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class QuestionSearchHit(BaseModel):
+    id: UUID
+    title: str  # matched words wrapped in <mark> tags
+    snippet: str  # best matching passage, same highlighting
+    score: float  # higher is a better match
+
+
+class QuestionSearchResponse(BaseModel):
+    query: str
+    items: List[QuestionSearchHit]
+    took_ms: float
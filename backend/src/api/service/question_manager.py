@@ -1,19 +1,28 @@
 # --- Standard Library ---
+import asyncio
+import time
 from pathlib import Path
-from typing import Literal, Sequence, Annotated
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Set, Tuple, Annotated
 from uuid import UUID
 
 # --- Third-Party ---
 from fastapi import HTTPException, Depends
+from sqlmodel import SQLModel
 from starlette import status
 
 # --- Internal ---
 from src.api.core import logger
 from src.api.database import SessionDep
 from src.api.database import question as qdb
-from src.api.models.models import Question
+from src.api.database import runner_metadata as rmdb
+from src.api.database import search as sdb
+from src.api.models.models import Question, RunnerMetadata
 from src.api.models.question import QuestionData, QuestionMeta
+from src.api.models.response_models import QuestionSearchHit, QuestionSearchResponse
 from src.api.core.config import get_settings
+from src.code_runner.models import ServerAnalysis
+from src.code_runner.static_analysis import SERVER_LANGUAGES, analyze_server_source
+from src.code_runner.utils import hash_source
 
 settings = get_settings()
 
@@ -47,12 +56,39 @@ class QuestionManager:
                 detail=f"Error Processing Question Content {e}",
             )
 
-    def get_question(
+    async def bulk_create_questions(
+        self,
+        questions: Sequence[Tuple[Question, Dict[str, Any]]],
+        extra_rows: Sequence[SQLModel] = (),
+        search_text: Optional[Dict[UUID, Dict[str, str]]] = None,
+    ) -> List[Question]:
+        """Insert prepared questions (see `qdb.prepare_question`) in one transaction."""
+        try:
+            return await qdb.bulk_create_questions(
+                questions, self.session, extra_rows, search_text or {}
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Could not create questions {e}",
+            )
+
+    async def existing_question_ids(self, ids: Sequence[UUID]) -> Set[UUID]:
+        """The ids among `ids` that already belong to a question."""
+        try:
+            return await qdb.existing_question_ids(ids, self.session)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Could not look up questions {e}",
+            )
+
+    async def get_question(
         self,
         question_id: str | UUID,
     ) -> Question:
         try:
-            question = qdb.get_question(question_id, self.session)
+            question = await qdb.get_question(question_id, self.session)
             if not question:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -64,29 +100,57 @@ class QuestionManager:
                 status_code=status.HTTP_400_BAD_REQUEST, detail=f"Bad Request {str(e)}"
             )
 
-    def get_all_questions(
+    async def get_all_questions(
         self, offset: int = 0, limit: int = 100
     ) -> Sequence[Question]:
         try:
-            return qdb.get_all_questions(self.session, offset, limit)
+            return await qdb.get_all_questions(self.session, offset, limit)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Could not get questions {e}",
             )
 
-    def delete_all_questions(self) -> bool:
+    async def get_question_page(
+        self, limit: int = 100, cursor: Optional[str] = None, eager: bool = False
+    ) -> Tuple[Sequence[Question], Optional[str]]:
+        if cursor is not None:
+            try:
+                qdb.decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                )
+        try:
+            return await qdb.get_question_page(self.session, limit, cursor, eager)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Could not get questions {e}",
+            )
+
+    async def get_question_data_page(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[QuestionMeta], Optional[str]]:
+        rows, next_cursor = await self.get_question_page(limit, cursor, eager=True)
+        return [qdb.to_question_meta(q) for q in rows], next_cursor
+
+    def iter_all_questions(self, batch_size: int = 500) -> AsyncIterator[Question]:
+        """Every question, fetched one keyset page at a time (constant memory)."""
+        return qdb.iter_all_questions(self.session, batch_size)
+
+    async def delete_all_questions(self) -> bool:
         try:
-            return qdb.delete_all_questions(self.session)
+            return await qdb.delete_all_questions(self.session)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Could not delete all the question {e}",
             )
 
-    def delete_question(self, question_id: str | UUID | None):
+    async def delete_question(self, question_id: str | UUID | None):
         try:
-            return qdb.delete_question(question_id, self.session)
+            return await qdb.delete_question(question_id, self.session)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -134,20 +198,32 @@ class QuestionManager:
     async def filter_questions(
         self,
         filter_data: QuestionData,
+        match_all: Sequence[str] = (),
+        storage_type: Optional[Literal["cloud", "local"]] = None,
     ):
         try:
-            return await qdb.filter_questions(filter_data, self.session)
+            return await qdb.filter_questions(
+                filter_data,
+                self.session,
+                match_all=match_all,
+                storage_type=storage_type,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not filter questions {e}",
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Could not filter question {e}",
+                detail=f"Could not filter questions {e}",
             )
 
-    def get_question_path(
+    async def get_question_path(
         self, question_id: str | UUID | None, storage_type: Literal["cloud", "local"]
     ) -> str:
         try:
-            question_path = qdb.get_question_path(
+            question_path = await qdb.get_question_path(
                 question_id, storage_type, self.session
             )
             if not question_path:
@@ -162,20 +238,117 @@ class QuestionManager:
                 detail="Could not retreive question {e}",
             )
 
-    def set_question_path(
+    async def set_question_path(
         self,
         question_id: str | UUID | None,
         path: str | Path,
         storage_type: Literal["cloud", "local"],
     ) -> Question:
         try:
-            return qdb.set_question_path(question_id, path, storage_type, self.session)
+            return await qdb.set_question_path(question_id, path, storage_type, self.session)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Could not set path question {e}",
             )
 
+    async def record_server_analysis(
+        self, question_id: str | UUID | None, filename: str, content: str | bytes
+    ) -> Optional[RunnerMetadata]:
+        """
+        Analyze a server file that was just written and store the result as the
+        question's runner metadata. Other files are ignored.
+
+        A failure to store is logged rather than raised: the run path analyzes
+        the file again when it finds no current record.
+        """
+        if question_id is None or not isinstance(content, (str, bytes)):
+            return None
+        # The JavaScript syntax check blocks on the Node.js worker pool
+        analysis = await asyncio.to_thread(analyze_server_source, filename, content)
+        if analysis is None:
+            return None
+        try:
+            return await rmdb.upsert_runner_metadata(question_id, analysis, self.session)
+        except Exception as e:
+            logger.warning(
+                "Could not record runner metadata for %s of question %s: %s",
+                filename,
+                question_id,
+                e,
+            )
+            return None
+
+    async def record_search_text(
+        self, question_id: str | UUID | None, filename: str, content: str | bytes
+    ) -> None:
+        """
+        Re-index the text of a question file that was just written, if it is one
+        of the searched files (question.html, solution.html). Other files are ignored.
+
+        A failure to store is logged rather than raised; reindexing repairs it.
+        """
+        if question_id is None:
+            return
+        indexed = sdb.file_search_text(filename, content)
+        if indexed is None:
+            return
+        column, text = indexed
+        try:
+            await sdb.upsert_search_text(question_id, self.session, **{column: text})
+        except Exception as e:
+            logger.warning(
+                "Could not index %s of question %s for search: %s",
+                filename,
+                question_id,
+                e,
+            )
+
+    async def search_questions(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> QuestionSearchResponse:
+        start = time.perf_counter()
+        try:
+            hits = await sdb.search_questions(query, self.session, limit, offset)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Could not search questions {e}",
+            )
+        return QuestionSearchResponse(
+            query=query,
+            items=[
+                QuestionSearchHit(id=qid, title=title, snippet=snippet, score=score)
+                for qid, title, snippet, score in hits
+            ],
+            took_ms=round((time.perf_counter() - start) * 1000, 3),
+        )
+
+    async def get_server_analysis(
+        self, question_id: str | UUID | None, filename: str, content: bytes
+    ) -> Optional[ServerAnalysis]:
+        """
+        The analysis of a server file's current `content`.
+
+        Served from the runner metadata when it was recorded for these exact
+        contents; otherwise (files written before analysis existed, or changed
+        outside the API) the file is analyzed now and the record refreshed.
+        """
+        language = SERVER_LANGUAGES.get(filename)
+        if language is None or question_id is None:
+            return None
+        try:
+            record = await rmdb.get_runner_metadata(question_id, language, self.session)
+        except ValueError as e:
+            logger.warning("Could not read runner metadata: %s", e)
+            record = None
+        if record is not None and record.code_hash == hash_source(content):
+            return rmdb.to_server_analysis(record)
+        record = await self.record_server_analysis(question_id, filename, content)
+        if record is not None:
+            return rmdb.to_server_analysis(record)
+        return await asyncio.to_thread(analyze_server_source, filename, content)
+
 
 def get_question_manager(session: SessionDep) -> QuestionManager:
     return QuestionManager(session)
@@ -1,11 +1,24 @@
-from typing import List, Optional, Annotated
-from fastapi import Depends
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Annotated, Set, Tuple
+from uuid import UUID
+from fastapi import Depends, HTTPException
 from src.api.core import logger
+from src.api.database import question as qdb
+from src.api.database import search as sdb
+from src.api.database.runner_metadata import new_runner_metadata
 from src.api.dependencies import StorageType, StorageTypeDep
-from src.api.models import FileData, QuestionData
-from src.api.models.models import Question
+from src.api.models import (
+    BulkQuestionResponse,
+    BulkQuestionResult,
+    FileData,
+    QuestionData,
+    QuestionImport,
+)
+from src.api.models.models import Question, RunnerMetadata
 from src.api.service.question_manager import QuestionManager, QuestionManagerDependency
 from src.api.service.storage_manager import StorageService, StorageDependency
+from src.code_runner.static_analysis import analyze_server_source
 from src.utils import safe_dir_name
 from functools import lru_cache
 
@@ -45,8 +58,8 @@ class QuestionResourceService:
         logger.debug(f"[QuestionResourceService] Storage paths ready: {abs_path}")
 
         # Step 3: Update DB with storage reference
-        self.qm.set_question_path(qcreated.id, relative_path, self.storage_type)  # type: ignore
-        self.qm.session.commit()
+        await self.qm.set_question_path(qcreated.id, relative_path, self.storage_type)  # type: ignore
+        await self.qm.session.commit()
         logger.info(
             f"[QuestionResourceService] Question path updated and committed (ID={qcreated.id})"
         )
@@ -56,6 +69,8 @@ class QuestionResourceService:
             self.storage_manager.save_file(
                 abs_path, filename=f.filename, content=f.content
             )
+            await self.qm.record_server_analysis(qcreated.id, f.filename, f.content)
+            await self.qm.record_search_text(qcreated.id, f.filename, f.content)
             logger.debug(f"[QuestionResourceService] Saved file '{f.filename}'")
 
         logger.info(
@@ -63,6 +78,182 @@ class QuestionResourceService:
         )
         return qcreated
 
+    def _store_question_files(
+        self, question: Question, files: List[FileData]
+    ) -> str:
+        """Create a new question's storage directory and save its files into it."""
+        path_name = safe_dir_name(f"{question.title}_{str(question.id)[:8]}")
+        path = self.storage_manager.create_storage_path(path_name)
+        abs_path = self.storage_manager.get_storage_path(path, relative=False)
+        for f in files:
+            self.storage_manager.save_file(
+                abs_path, filename=f.filename, content=f.content
+            )
+        return self.storage_manager.get_storage_path(path, relative=True)
+
+    @staticmethod
+    def _analyze_server_files(
+        question: Question, files: List[FileData]
+    ) -> List[RunnerMetadata]:
+        """Runner metadata for the server files among a new question's files."""
+        metadata = []
+        for f in files:
+            if isinstance(f.content, (str, bytes)):
+                analysis = analyze_server_source(f.filename, f.content)
+                if analysis is not None:
+                    metadata.append(new_runner_metadata(question.id, analysis))  # type: ignore[arg-type]
+        return metadata
+
+    async def _discard_question_files(self, paths: List[Optional[str]]) -> None:
+        """Delete the storage directories of questions whose insert was rolled back."""
+
+        async def discard(path: str) -> None:
+            try:
+                await asyncio.to_thread(self.storage_manager.delete_storage, path)
+            except Exception as e:
+                logger.warning(
+                    f"[QuestionResourceService] Could not remove orphaned storage {path}: {e}"
+                )
+
+        await asyncio.gather(*(discard(p) for p in paths if p))
+
+    async def create_questions(
+        self, items: List[QuestionImport]
+    ) -> BulkQuestionResponse:
+        """
+        Create many questions at once, e.g. when importing a catalog.
+
+        Every item is validated before anything is written; invalid items,
+        including ones whose id repeats within the request or already exists,
+        are reported and skipped. Storage directories and files of the valid items
+        are written and their server files analyzed in parallel, then all question
+        rows, relationship links and runner metadata are inserted in a single
+        transaction; if that fails the stored files are removed again.
+        """
+        results = [
+            BulkQuestionResult(index=i, status="invalid") for i in range(len(items))
+        ]
+
+        # Step 1: Validate everything up front
+        prepared: Dict[int, Tuple[Question, Dict[str, Any]]] = {}
+        seen: Set[UUID] = set()
+        for i, item in enumerate(items):
+            try:
+                for f in item.files:
+                    if not f.filename or Path(f.filename).name != f.filename:
+                        raise ValueError(f"Invalid filename '{f.filename}'")
+                row, relation_values = qdb.prepare_question(
+                    QuestionData.model_validate(item.model_dump(exclude={"files"}))
+                )
+                safe_dir_name(f"{row.title}_{str(row.id)[:8]}")
+                results[i].id = row.id
+                if row.id in seen:
+                    raise ValueError(f"Duplicate id {row.id} in this request")
+                seen.add(row.id)  # type: ignore[arg-type]
+                prepared[i] = (row, relation_values)
+            except ValueError as e:
+                results[i].error = str(e)
+        # An existing id would make the whole insert fail
+        existing = await self.qm.existing_question_ids(
+            [row.id for row, _ in prepared.values()]  # type: ignore[misc]
+        )
+        for i in [i for i, (row, _) in prepared.items() if row.id in existing]:
+            results[i].error = f"Question {prepared.pop(i)[0].id} already exists"
+
+        # Step 2: Storage directories and files, and server file analysis, in parallel
+        metadata: List[RunnerMetadata] = []
+
+        async def store(i: int) -> None:
+            row = prepared[i][0]
+            try:
+                path = await asyncio.to_thread(
+                    self._store_question_files, row, items[i].files
+                )
+            except Exception as e:
+                logger.error(f"[QuestionResourceService] Storage failed for item {i}: {e}")
+                results[i].status, results[i].error = "failed", f"Storage failed: {e}"
+                del prepared[i]
+                return
+            if self.storage_type == "cloud":
+                row.blob_path = path
+            else:
+                row.local_path = path
+            results[i].question_path = path
+            # The JavaScript syntax check blocks on the Node.js worker pool
+            metadata.extend(
+                await asyncio.to_thread(self._analyze_server_files, row, items[i].files)
+            )
+
+        await asyncio.gather(*(store(i) for i in list(prepared)))
+
+        # Step 3: One transaction for questions, links, runner metadata and search text
+        search_text: Dict[UUID, Dict[str, str]] = {}
+        for i, (row, _) in prepared.items():
+            for f in items[i].files:
+                indexed = sdb.file_search_text(f.filename, f.content)
+                if indexed is not None:
+                    search_text.setdefault(row.id, {})[indexed[0]] = indexed[1]  # type: ignore[index]
+        try:
+            await self.qm.bulk_create_questions(
+                list(prepared.values()), metadata, search_text
+            )
+            for i in prepared:
+                results[i].status = "created"
+        except HTTPException as e:
+            for i in prepared:
+                results[i].status, results[i].error = "failed", str(e.detail)
+            await self._discard_question_files(
+                [results[i].question_path for i in prepared]
+            )
+            for i in prepared:
+                results[i].question_path = None
+
+        created = sum(r.status == "created" for r in results)
+        logger.info(
+            f"[QuestionResourceService] Bulk import created {created}/{len(items)} questions"
+        )
+        return BulkQuestionResponse(
+            created=created, failed=len(items) - created, results=results
+        )
+
+    async def reindex_search(self, batch_size: int = 500) -> int:
+        """
+        Rebuild every question's search text from its title, topics and stored
+        HTML files, e.g. for questions created before search existed or files
+        changed outside the API. Commits once per batch.
+
+        Returns:
+            The number of questions indexed.
+        """
+        session = self.qm.session
+        count = 0
+        async for question in qdb.iter_all_questions(session, batch_size, eager=True):
+            columns = {
+                "title": question.title or "",
+                "topics": sdb.topic_text([t.name for t in question.topics]),
+            }
+            path = question.blob_path if self.storage_type == "cloud" else question.local_path
+            for filename in sdb.SEARCH_FILES if path else ():
+                try:
+                    content = await asyncio.to_thread(
+                        self.storage_manager.read_file, path, filename
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"[QuestionResourceService] Could not read {filename} of {question.id}: {e}"
+                    )
+                    continue
+                indexed = sdb.file_search_text(filename, content)
+                if indexed is not None:
+                    columns[indexed[0]] = indexed[1]
+            await sdb.stage_search_text(question.id, session, **columns)  # type: ignore[arg-type]
+            count += 1
+            if count % batch_size == 0:
+                await session.commit()
+        await session.commit()
+        logger.info(f"[QuestionResourceService] Reindexed {count} questions for search")
+        return count
+
 
 @lru_cache
 def get_question_resource(
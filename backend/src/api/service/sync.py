@@ -98,7 +98,7 @@ async def check_question_sync_status(
 
     # --- Step 3: Confirm question exists in DB ---
     try:
-        qdb = qm.get_question(question_id)
+        qdb = await qm.get_question(question_id)
     except Exception:
         logger.info("Question is not in database")
         detail = (
@@ -190,7 +190,7 @@ async def sync_question(
         db_path = storage.get_storage_path(new_path, relative=True)
         logger.info("This is the db_path %s ", db_path)
 
-        qm.set_question_path(qcreated.id, db_path, storage_type="local")
+        await qm.set_question_path(qcreated.id, db_path, storage_type="local")
 
         # Write the question data to the folder
         question_data = await qm.get_question_data(qcreated.id)
@@ -242,7 +242,7 @@ async def prune_question(
     q: Question, qm: QuestionManagerDependency, storage: StorageDependency
 ) -> Literal["ok", "deleted", "bug"]:
     if not q.local_path:
-        qm.delete_question(q.id)
+        await qm.delete_question(q.id)
         return "deleted"
     question_path = Path(storage.get_storage_path(q.local_path, relative=False))
     if question_path.exists():
@@ -250,7 +250,7 @@ async def prune_question(
         return "ok"
     else:
         try:
-            qm.delete_question(q.id)
+            await qm.delete_question(q.id)
             return "deleted"
         except Exception as e:
             logger.exception(f"⚠️ Failed to delete '{q.title}' from DB: {e}")
@@ -260,11 +260,15 @@ async def prune_question(
 async def prune_questions(
     qm: QuestionManagerDependency, storage: StorageDependency
 ) -> FolderCheckMetrics:
-    all_questions = qm.get_all_questions(
-        0,
-        1000,
-    )
-    if not all_questions:
+    # Walk the table in keyset pages; pruning deletes rows as it goes, which
+    # does not disturb the pages still to come
+    categorized = defaultdict(list)
+    async for question in qm.iter_all_questions():
+        status = await prune_question(question, qm, storage)
+        categorized[status].append(question.title)
+
+    total_checked = sum(len(titles) for titles in categorized.values())
+    if not total_checked:
         logger.info("📂 No questions found in the database.")
         return FolderCheckMetrics(
             total_checked=0,
@@ -272,16 +276,7 @@ async def prune_questions(
             still_valid=0,
         )
 
-    total_checked = len(all_questions)
-    prune_status = await asyncio.gather(
-        *[prune_question(q, qm, storage) for q in all_questions]
-    )
-
-    categorized = defaultdict(list)
-    for question, status in zip(all_questions, prune_status):
-        categorized[status].append(question.title)
-
-    deleted_count = len(categorized.get("delete", []))
+    deleted_count = len(categorized.get("deleted", []))
     still_valid = len(categorized.get("ok", []))
     bug = len(categorized.get("bug", []))
 
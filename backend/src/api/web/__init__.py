@@ -2,12 +2,14 @@ from .questions.init import routes as questions_routes
 from .ai_generation.code_generator import router as code_generation_router
 from .startup import router as general_router
 from .run_question_server import router as question_runner
+from .grading import router as grading_router
 from .generic import routes as generic_routes
 
 routes = [
     code_generation_router,
     general_router,
     question_runner,
+    grading_router,
 ]
 
 routes.extend(questions_routes)
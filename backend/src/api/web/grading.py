@@ -0,0 +1,34 @@
+# Third-party libraries
+from fastapi import APIRouter, HTTPException
+from starlette import status
+
+# Local application imports
+from src.api.core.config import get_settings
+from src.code_runner.grading import grade_batch
+from src.code_runner.models import GradeBatchRequest, GradeBatchResult
+
+router = APIRouter(prefix="/grade", tags=["grading"])
+
+
+@router.post("/batch", response_model=GradeBatchResult)
+def grade_submissions(request: GradeBatchRequest) -> GradeBatchResult:
+    """
+    Grade many submissions at once, e.g. for an end-of-term regrade or an LMS sync.
+
+    Each variant is sent once in `variants` and submissions reference it by index.
+    Numeric answers are accepted within the variant's `nDigits`/`sigfigs`
+    precision. The result is columnar: `score[i]` and `correct[key][i]` belong to
+    submission i, and `correct[key][i]` is null if that variant has no `key`.
+    """
+    limit = get_settings().GRADE_BATCH_MAX_SUBMISSIONS
+    if len(request.submissions) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {limit} submissions can be graded per request",
+        )
+    try:
+        return grade_batch(request.variants, request.submissions)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
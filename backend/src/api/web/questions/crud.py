@@ -1,10 +1,15 @@
+# --- Standard Library ---
+from typing import List, Literal
+
 # --- Third-Party ---
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from starlette import status
 
 # --- Internal ---
 from src.api.core import logger
+from src.api.core.config import get_settings
 from src.api.service.question_manager import QuestionManagerDependency
+from src.api.service.question_resource import QuestionResourceService
 from src.api.service.storage_manager import StorageDependency
 from src.api.models.models import Question
 from src.api.models import *
@@ -54,15 +59,53 @@ async def create_question(
         path = storage.create_storage_path(path_name)
         # Storing the relative path in db
         relative_path = storage.get_storage_path(path, relative=True)
-        qm.set_question_path(qcreated.id, relative_path, storage_type)
+        await qm.set_question_path(qcreated.id, relative_path, storage_type)
         # Commit the changes
-        qm.session.commit()
+        await qm.session.commit()
 
         return qcreated
     except Exception:
         raise
 
 
+@router.post("/bulk")
+async def create_questions_bulk(
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    questions: List[QuestionImport],
+    storage_type: StorageTypeDep,
+) -> BulkQuestionResponse:
+    """
+    Create many questions in one request, e.g. when importing a catalog from CSV.
+
+    Each item is a `QuestionData` with an optional list of files to store in the
+    question's directory. Every item is validated first and invalid ones are
+    reported without stopping the others. Storage directories are created in
+    parallel, and all valid questions, their topic/language/qtype links and the
+    runner metadata of their server files are written in a single transaction.
+
+    Args:
+        qm (QuestionManagerDependency): Database access for the questions.
+        storage (StorageDependency): Storage where question directories and files are created.
+        questions (List[QuestionImport]): The questions to create, with optional files.
+
+    Returns:
+        BulkQuestionResponse: Counts plus one result per item, in request order,
+            with its status, new ID and storage path or error.
+
+    Raises:
+        HTTPException: 413 if more than QUESTION_BULK_MAX_ITEMS questions are sent.
+    """
+    limit = get_settings().QUESTION_BULK_MAX_ITEMS
+    if len(questions) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {limit} questions can be created per request",
+        )
+    service = QuestionResourceService(qm, storage, storage_type)
+    return await service.create_questions(questions)
+
+
 @router.delete("/")
 async def delete_all(
     qm: QuestionManagerDependency,
@@ -90,7 +133,7 @@ async def delete_all(
         Exception: Propagates any database or file system errors encountered during deletion.
     """
     try:
-        qm.delete_all_questions()
+        await qm.delete_all_questions()
         if delete_storage:
             logger.info("Deleting storage")
             storage.hard_delete()
@@ -99,6 +142,97 @@ async def delete_all(
         raise
 
 
+@router.get("/page")
+async def get_question_page(
+    qm: QuestionManagerDependency,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+) -> QuestionPage:
+    """
+    Retrieve a page of questions using cursor (keyset) pagination.
+
+    Questions are ordered by ID. Pass the returned `next_cursor` to get the next
+    page; it is None on the last page. Unlike `/{offset}/{limit}`, every page
+    costs the same however deep it is, and questions added or removed meanwhile
+    do not shift the pages that follow.
+
+    Args:
+        qm (QuestionManagerDependency): Dependency responsible for database queries related to questions.
+        limit (int, optional): The maximum number of questions per page. Defaults to 100.
+        cursor (str, optional): Opaque token from the previous page; omit for the first page.
+
+    Returns:
+        QuestionPage: The questions and the cursor of the next page.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+    """
+    items, next_cursor = await qm.get_question_page(limit, cursor)
+    return QuestionPage(items=list(items), next_cursor=next_cursor)
+
+
+@router.get("/page/all_data")
+async def get_question_data_page(
+    qm: QuestionManagerDependency,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+) -> QuestionMetaPage:
+    """
+    Cursor-paginated counterpart of `/{offset}/{limit}/all_data`.
+
+    Returns each question with its topics, languages and qtypes, plus the
+    `next_cursor` to pass for the following page (None on the last page).
+    """
+    items, next_cursor = await qm.get_question_data_page(limit, cursor)
+    return QuestionMetaPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/search")
+async def search_questions(
+    qm: QuestionManagerDependency,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> QuestionSearchResponse:
+    """
+    Full-text search over question titles, topics and question/solution text.
+
+    Results are ranked (title matches weigh most, then topics, then the question
+    text, then the solution) and served from a full-text index, so the cost does
+    not grow with the size of the catalog the way `/filter` does. Every word must
+    match; the last one also matches as a prefix.
+
+    Args:
+        qm (QuestionManagerDependency): Dependency responsible for database queries related to questions.
+        q (str): The search text.
+        limit (int, optional): The maximum number of results. Defaults to 20.
+        offset (int, optional): Number of results to skip. Defaults to 0.
+
+    Returns:
+        QuestionSearchResponse: The matches, best first, with the title and a
+            snippet of the matching text highlighted with `<mark>` tags.
+    """
+    return await qm.search_questions(q, limit, offset)
+
+
+@router.post("/search/reindex")
+async def reindex_question_search(
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+) -> dict:
+    """
+    Rebuild the search index of every question from its metadata and stored
+    `question.html`/`solution.html`.
+
+    Only needed for questions created before search existed or files changed
+    outside the API; writes through the API keep the index current.
+    """
+    service = QuestionResourceService(qm, storage, storage_type)
+    count = await service.reindex_search()
+    return {"status": "ok", "detail": f"Reindexed {count} questions"}
+
+
 @router.get("/{offset:int}/{limit:int}")
 async def get_all_questions(
     qm: QuestionManagerDependency, offset: int = 0, limit: int = 100
@@ -122,7 +256,7 @@ async def get_all_questions(
         Exception: Propagates any unexpected database or query-related errors during retrieval.
     """
     try:
-        return qm.get_all_questions(offset, limit)
+        return await qm.get_all_questions(offset, limit)
     except Exception:
         raise
 
@@ -147,7 +281,7 @@ async def get_question(id: str | UUID, qm: QuestionManagerDependency) -> Questio
         Exception: Propagates any unexpected database or retrieval errors.
     """
     try:
-        question = qm.get_question(id)
+        question = await qm.get_question(id)
         if not question:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -180,7 +314,7 @@ async def get_question_all_data(
     """
     try:
         question_data = await qm.get_question_data(id)
-        question_data.question_path = qm.get_question_path(id, storage_type)
+        question_data.question_path = await qm.get_question_path(id, storage_type)
         return question_data
     except Exception:
         raise
@@ -233,12 +367,12 @@ async def delete_question(
             raise HTTPException(
                 status_code=404, detail="Question not found nothing to delete"
             )
-        question_path = qm.get_question_path(
+        question_path = await qm.get_question_path(
             question.id,
             storage_type,
         )
 
-        assert qm.delete_question(id)
+        assert await qm.delete_question(id)
         if not question_path:
             logger.warning(
                 "Question of ID: {question.id} Title: {question.title} does not have a storage path will still delete from database but may cause issues"
@@ -284,7 +418,7 @@ async def update_question(
         Exception: For any other unexpected errors during the update or rename process.
     """
     try:
-        existing_question = qm.get_question(id)
+        existing_question = await qm.get_question(id)
         if not existing_question:
             logger.warning(f"Question with ID {id} not found — cannot update.")
             raise HTTPException(
@@ -298,7 +432,7 @@ async def update_question(
                 f"Updating storage directory for question '{existing_question.title}' → '{update.title}'"
             )
 
-            old_storage_path = qm.get_question_path(id, storage_type)
+            old_storage_path = await qm.get_question_path(id, storage_type)
             if not old_storage_path:
                 logger.error(f"No valid storage path found for question ID {id}")
                 raise HTTPException(
@@ -316,10 +450,10 @@ async def update_question(
             updated_relative_path = storage.get_storage_path(
                 new_storage_path, relative=True
             )
-            qm.set_question_path(
+            await qm.set_question_path(
                 existing_question.id, updated_relative_path, storage_type
             )
-            qm.session.commit()
+            await qm.session.commit()
 
             logger.info(
                 f"Renamed storage path for question {id}: {old_storage_path} → {new_storage_path}"
@@ -340,11 +474,37 @@ async def update_question(
 
 @router.post("/filter")
 async def filter_questions(
-    filter_data: QuestionData, qm: QuestionManagerDependency
+    filter_data: QuestionData,
+    qm: QuestionManagerDependency,
+    storage_type: StorageTypeDep,
+    match_all: List[Literal["topics", "languages", "qtypes"]] = Query([]),
 ) -> Sequence[QuestionMeta]:
+    """
+    Retrieve the questions matching every field set in `filter_data`.
+
+    Text fields match case-insensitively and partially (e.g. a title containing
+    the text); topics, languages and qtypes match whole names, case-insensitively;
+    booleans match exactly. `question_path` matches the storage path of the
+    configured storage type. A list of values matches any of them; for the
+    relationships named in `match_all` a question must match all of them, e.g.
+    `?match_all=topics` with `topics: ["math", "physics"]` only returns questions
+    tagged with both.
+
+    Args:
+        filter_data (QuestionData): The fields to match; unset or empty fields are ignored.
+        qm (QuestionManagerDependency): Dependency responsible for database queries related to questions.
+        storage_type (StorageTypeDep): The storage type whose path `question_path` matches.
+        match_all (List[str], optional): Relationships whose values must all match.
+
+    Returns:
+        Sequence[QuestionMeta]: The matching questions with their relationships, ordered by ID.
+
+    Raises:
+        HTTPException: 400 if a field cannot be filtered on.
+    """
     try:
         logger.info("Retrieved filter %s", filter_data)
-        return await qm.filter_questions(filter_data)
+        return await qm.filter_questions(filter_data, match_all, storage_type)
     except HTTPException:
         raise
     except Exception as e:
@@ -15,6 +15,8 @@ from fastapi import UploadFile
 from src.api.service.file_service import FileServiceDep
 from src.api.models.response_models import FileData
 from src.api.dependencies import StorageTypeDep
+from src.api.database.search import SEARCH_FILES
+from src.code_runner.module_cache import SERVER_FILENAMES, invalidate_server_file
 from fastapi.responses import Response
 
 router = APIRouter(
@@ -31,6 +33,34 @@ client_file_extensions = {
 }
 
 
+def invalidate_cached_server_file(storage, target, filename: str) -> None:
+    """Drop the compiled copy of a server file from the runner caches before it is replaced."""
+    if filename not in SERVER_FILENAMES:
+        return
+    try:
+        invalidate_server_file(filename, storage.read_file(target, filename))
+    except Exception as e:
+        # Stale entries are never hit (the cache is keyed by content), they only use memory
+        logger.warning("Could not invalidate cached %s in %s: %s", filename, target, e)
+
+
+async def record_uploaded_server_files(
+    qm, question_id: UUID | None, files: List[UploadFile]
+) -> None:
+    """
+    Analyze uploaded server files once, so runs can use the recorded runner
+    metadata, and re-index uploaded question/solution HTML for search.
+    """
+    for uploaded_file in files:
+        filename = uploaded_file.filename
+        if filename not in SERVER_FILENAMES and filename not in SEARCH_FILES:
+            continue
+        await uploaded_file.seek(0)
+        content = await uploaded_file.read()
+        await qm.record_server_analysis(question_id, filename, content)
+        await qm.record_search_text(question_id, filename, content)
+
+
 @router.get("/files/{qid}")
 async def get_question_files(
     qid: str | UUID,
@@ -58,8 +88,8 @@ async def get_question_files(
         HTTPException(500): If the filenames cannot be retrieved due to a server error.
     """
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         assert question_path
         files = storage.list_files(question_path)
         return SuccessFileResponse(
@@ -84,8 +114,8 @@ async def delete_file(
     fm: FileServiceDep,
 ):
     try:
-        question = qm.get_question(qid)
-        question_path = Path(qm.get_question_path(question.id, storage_type))
+        question = await qm.get_question(qid)
+        question_path = Path(await qm.get_question_path(question.id, storage_type))
         logger.debug(f"The question path is {question_path}")
         if await fm.is_image(filename):
             filepath = question_path / CLIENT_FILE_DIR / filename
@@ -128,8 +158,8 @@ async def read_question_file(
         HTTPException(500): If the file cannot be read or decoded due to a server error.
     """
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         data = storage.read_file(question_path, filename)
         if data:
             data = data.decode("utf-8")
@@ -179,10 +209,13 @@ async def update_file(
     try:
         if isinstance(new_content, dict):
             new_content = json.dumps(new_content)
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         assert question_path
+        invalidate_cached_server_file(storage, question_path, filename)
         path = storage.save_file(question_path, filename, new_content, overwrite=True)
+        await qm.record_server_analysis(question.id, filename, new_content)
+        await qm.record_search_text(question.id, filename, new_content)
         return SuccessDataResponse(
             status=200, detail=f"Wrote file successfully to {path}", data=new_content
         )
@@ -203,8 +236,8 @@ async def get_filedata(
     storage_type: StorageTypeDep,
 ) -> List[FileData]:
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         file_paths = storage.list_filepaths(question_path, recursive=True)
         logger.info("These are the file paths", file_paths)
         file_data = []
@@ -253,8 +286,8 @@ async def download_question_file(
     storage_type: StorageTypeDep,
 ):
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         filepath = storage.get_file(question_path, filename)
         folder_name = f"{question.title}_download"
 
@@ -284,8 +317,8 @@ async def download_question(
     storage_type: StorageTypeDep,
 ):
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
         files = storage.list_filepaths(question_path)
         folder_name = f"{question.title}_download"
 
@@ -339,14 +372,14 @@ async def upload_files_to_question(
     """
     try:
         # Retrieve the question record
-        question = qm.get_question(id)
+        question = await qm.get_question(id)
         if not question:
             logger.warning("Question with ID %s not found", id)
             raise HTTPException(status_code=404, detail=f"Question {id} not found")
 
         # Get the question’s main storage directory
         question_storage_path = storage.get_storage_path(
-            str(qm.get_question_path(question.id, storage_type)), relative=False
+            str(await qm.get_question_path(question.id, storage_type)), relative=False
         )
         logger.info("Resolved question storage path: %s", question_storage_path)
 
@@ -369,6 +402,11 @@ async def upload_files_to_question(
         # Define destination paths
         client_files_dir = Path(question_storage_path) / CLIENT_FILE_DIR
 
+        for uploaded_file in other_files:
+            invalidate_cached_server_file(
+                storage, question_storage_path, str(uploaded_file.filename)
+            )
+
         # Upload files based on handling strategy
         if auto_handle_images:
             uploaded_client_files = await fm.save_files(
@@ -377,6 +415,7 @@ async def upload_files_to_question(
             uploaded_other_files = await fm.save_files(
                 other_files, question_storage_path
             )
+            await record_uploaded_server_files(qm, question.id, other_files)
             return {
                 "status": "ok",
                 "detail": f"Uploaded {len(files)} files",
@@ -386,6 +425,7 @@ async def upload_files_to_question(
 
         # If not handling separately, upload everything to root
         uploaded_files = await fm.save_files(files, question_storage_path)
+        await record_uploaded_server_files(qm, question.id, other_files)
 
         return {
             "status": "ok",
@@ -1,19 +1,40 @@
 # Standard library
+import asyncio
+import secrets
+import time
 import tempfile
 from pathlib import Path
-from typing import Literal
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from uuid import UUID
 
 # Third-party libraries
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from starlette import status
+from starlette.concurrency import iterate_in_threadpool
 
 # Local application imports
 from src.api.core import logger
+from src.api.core.config import get_settings
 from src.api.database import SessionDep
+from src.api.models.models import Question
 from src.api.service.question_manager import QuestionManagerDependency
-from src.code_runner.models import CodeRunException, CodeRunResponse, QuizData
-from src.code_runner.runtime_switcher import run_generate
+from src.code_runner.models import (
+    CatalogTestTarget,
+    CodeRunException,
+    CodeRunResponse,
+    ParityReport,
+    QuizData,
+    QuizDataBatch,
+    ServerSource,
+    VariantSpaceReport,
+)
+from src.code_runner.async_runner import run_generate_async, run_generate_batch_async
+from src.code_runner.catalog_tests import iter_catalog_report
+from src.code_runner.module_cache import runner_cache_stats
+from src.code_runner.parity import build_parity_report
+from src.code_runner.variant_pool import VARIANT_POOL_REFILLER
+from src.code_runner.variant_space import analyze_variant_space
 from src.api.service.storage_manager import StorageDependency
 from src.api.dependencies import StorageTypeDep
 
@@ -21,16 +42,30 @@ router = APIRouter(prefix="/run_server", tags=["code_running", "questions"])
 
 MAPPING_DB = {"python": "server.py", "javascript": "server.js"}
 MAPPPING_FILENAME = {"python": "server.py", "javascript": "server.js"}
+MAX_BATCH_VARIANTS = 500
+CATALOG_PAGE_SIZE = 100
+CATALOG_READ_CONCURRENCY = 16
+VARIANT_SEED_HEADER = "X-Variant-Seed"
 
 
-@router.post("/{qid}/{server_language}", response_model=QuizData)
-async def run_server(
+async def resolve_server_source(
     qid: str | UUID,
-    server_language: Literal["python", "javascript"],
+    server_language: str,
     qm: QuestionManagerDependency,
     storage: StorageDependency,
     storage_type: StorageTypeDep,
-) -> QuizData:
+    reject_invalid: bool = True,
+) -> Tuple[Question, ServerSource]:
+    """
+    Read a question's server file straight from storage, raising 4xx/5xx if unavailable.
+    The question row is returned with it, so callers need not load it again.
+
+    The contents are handed to the runners in memory, so nothing is copied to a
+    temporary directory or read back from disk, whichever storage backend is used.
+    They carry the file's runner metadata, recorded when it was uploaded, so the
+    runners skip re-validation and a file that failed analysis is rejected with 422
+    (or, with `reject_invalid=False`, by the runner).
+    """
     if server_language not in MAPPPING_FILENAME:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,39 +75,248 @@ async def run_server(
     server_file = MAPPPING_FILENAME[server_language]
 
     try:
-        question = qm.get_question(qid)
-        question_path = qm.get_question_path(question.id, storage_type)
-        resolved_path = storage.get_storage_path(str(question_path), relative=False)
-        files = storage.list_files(resolved_path)
+        question = await qm.get_question(qid)
+        question_path = await qm.get_question_path(question.id, storage_type)
+        data = storage.read_file(str(question_path), server_file)
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception("Error resolving question storage path")
+        logger.exception("Error reading question server file")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error accessing question storage path",
         ) from e
 
-    if server_file not in files:
+    if data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Question does not contain file {server_file}",
         )
 
-    server_path = Path(resolved_path) / server_file
+    # Checked once at upload; a broken file is rejected before any runner is involved
+    analysis = await qm.get_server_analysis(question.id, server_file, data)
+    if reject_invalid and analysis is not None and not analysis.valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=analysis.error,
+        )
 
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir) / server_file
-            data = server_path.read_bytes()
-            if data is None:
-                raise FileNotFoundError(f"File data is None {server_path}")
-            tmp_path.write_bytes(data)
-            run_response: CodeRunResponse = run_generate(
-                tmp_path, server_language, isTesting=False
+    return question, ServerSource(filename=server_file, content=data, analysis=analysis)
+
+
+def to_http_exception(e: CodeRunException) -> HTTPException:
+    """Surface a failed run with its own status code instead of a generic 500."""
+    code = e.response.http_status_code or status.HTTP_500_INTERNAL_SERVER_ERROR
+    headers = {"Retry-After": "1"} if code == status.HTTP_429_TOO_MANY_REQUESTS else None
+    return HTTPException(status_code=code, detail=e.response.error, headers=headers)
+
+
+@router.get("/cache_stats")
+async def get_runner_cache_stats() -> List[Dict[str, Any]]:
+    """Report hit/miss counters and sizes of the runner caches and variant pools."""
+    return runner_cache_stats()
+
+
+def copy_server_file(
+    storage: StorageDependency, question_path: str, server_file: str, target: Path
+) -> bool:
+    """Copy one stored server file to `target`; False if the question has none."""
+    data = storage.read_file(question_path, server_file)
+    if data is None:
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    return True
+
+
+async def collect_catalog_targets(
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    workdir: Path,
+    languages: List[Literal["python", "javascript"]],
+) -> List[CatalogTestTarget]:
+    """
+    Copy every question's server files into `workdir` and return them as test targets.
+
+    Files are downloaded off the event loop, at most `CATALOG_READ_CONCURRENCY`
+    at a time. Questions without a storage path or without server files are skipped.
+    """
+    candidates: List[CatalogTestTarget] = []
+    paths: List[str] = []
+    async for question in qm.iter_all_questions(CATALOG_PAGE_SIZE):
+        question_path = (
+            question.blob_path if storage_type == "cloud" else question.local_path
+        )
+        if not question_path:
+            continue
+        for language in languages:
+            server_file = MAPPPING_FILENAME[language]
+            candidates.append(
+                CatalogTestTarget(
+                    question_id=str(question.id),
+                    language=language,
+                    path=str(workdir / str(question.id) / server_file),
+                )
             )
-    except CodeRunException:
+            paths.append(question_path)
+
+    reads = asyncio.Semaphore(CATALOG_READ_CONCURRENCY)
+
+    async def fetch(target: CatalogTestTarget, question_path: str) -> bool:
+        server_file = MAPPPING_FILENAME[target.language]
+        async with reads:
+            try:
+                return await asyncio.to_thread(
+                    copy_server_file,
+                    storage,
+                    question_path,
+                    server_file,
+                    Path(target.path),
+                )
+            except Exception:
+                logger.warning(
+                    "Could not read %s for question %s", server_file, target.question_id
+                )
+                return False
+
+    copied = await asyncio.gather(*(fetch(t, p) for t, p in zip(candidates, paths)))
+    return [target for target, ok in zip(candidates, copied) if ok]
+
+
+@router.post("/test_all")
+async def run_catalog_tests(
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    language: Optional[Literal["python", "javascript"]] = Query(None),
+    parallelism: Optional[int] = Query(None, ge=1),
+) -> StreamingResponse:
+    """
+    Self-test every question's server file and stream a JSONL report.
+
+    Each line holds one question's pass/fail/error status and timing, in the order
+    the tests finish, and the last line holds a `summary` of the whole run.
+    """
+    languages = [language] if language else list(MAPPPING_FILENAME)
+    workdir = tempfile.TemporaryDirectory(prefix="catalog_tests_")
+    try:
+        targets = await collect_catalog_targets(
+            qm, storage, storage_type, Path(workdir.name), languages
+        )
+    except BaseException:
+        workdir.cleanup()
         raise
+
+    async def report():
+        try:
+            async for line in iterate_in_threadpool(
+                iter_catalog_report(targets, parallelism)
+            ):
+                yield line
+        finally:
+            workdir.cleanup()
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@router.post("/{qid}/parity", response_model=ParityReport)
+async def run_server_parity(
+    request: Request,
+    qid: str | UUID,
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    seed: Optional[int] = Query(None, ge=0),
+) -> ParityReport:
+    """
+    Run a question's server.py and server.js concurrently and compare their output.
+
+    Without a `seed` both run in test mode (`generate(2)`). `params` and
+    `correct_answers` are compared numerically at the question's
+    `nDigits`/`sigfigs` precision and every divergence is reported. A runtime
+    that fails is reported in the body rather than as an HTTP error.
+    """
+    sources: Dict[str, ServerSource] = {}
+    for language in MAPPPING_FILENAME:
+        _, sources[language] = await resolve_server_source(
+            qid, language, qm, storage, storage_type, reject_invalid=False
+        )
+    isTesting = seed is None
+
+    async def run_or_error(language: str) -> CodeRunResponse:
+        try:
+            return await run_generate_async(
+                sources[language],
+                language,  # type: ignore[arg-type]
+                isTesting=isTesting,
+                seed=seed,
+                is_disconnected=request.is_disconnected,
+            )
+        except CodeRunException as e:
+            # Overload and disconnects concern the request, not the question
+            if e.response.http_status_code in (status.HTTP_429_TOO_MANY_REQUESTS, 499):
+                raise to_http_exception(e) from e
+            return e.response
+
+    start = time.perf_counter()
+    py, js = await asyncio.gather(run_or_error("python"), run_or_error("javascript"))
+    report = build_parity_report(
+        py, js, seed, isTesting, (time.perf_counter() - start) * 1000
+    )
+    report.question_id = str(qid)
+    return report
+
+
+@router.post("/{qid}/{server_language}", response_model=QuizData)
+async def run_server(
+    request: Request,
+    response: Response,
+    qid: str | UUID,
+    server_language: Literal["python", "javascript"],
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    seed: Optional[int] = Query(None, ge=0),
+    mode: Literal["run", "pool"] = Query("run"),
+) -> QuizData:
+    """
+    Run a question's server file and return one variant.
+
+    With a `seed` the variant is reproducible and memoized, so rendering the same
+    student's variant again is served from the variant cache.
+
+    In `pool` mode an adaptive question is served a pre-generated variant, and a
+    background task generates a replacement. The variant's seed is returned in
+    the `X-Variant-Seed` header so it can be rendered again with `?seed=`. When
+    the pool is empty (the first request for a question) the variant is generated
+    on the spot with a fresh seed.
+    """
+    question, server_source = await resolve_server_source(
+        qid, server_language, qm, storage, storage_type
+    )
+    server_file = server_source.filename
+
+    if mode == "pool" and seed is None and question.isAdaptive:
+        pooled = await VARIANT_POOL_REFILLER.take(server_source, server_language)
+        if pooled is not None:
+            pooled_seed, quiz_data = pooled
+            response.headers[VARIANT_SEED_HEADER] = str(pooled_seed)
+            return quiz_data
+        seed = secrets.randbits(31)
+        response.headers[VARIANT_SEED_HEADER] = str(seed)
+
+    try:
+        # Run off the event loop so slow question code does not stall other requests
+        run_response: CodeRunResponse = await run_generate_async(
+            server_source,
+            server_language,
+            isTesting=False,
+            seed=seed,
+            is_disconnected=request.is_disconnected,
+        )
+    except CodeRunException as e:
+        raise to_http_exception(e) from e
     except Exception as e:
         logger.exception("Error running server file")
         raise HTTPException(
@@ -87,3 +331,79 @@ async def run_server(
         )
 
     return run_response.quiz_response
+
+
+@router.post("/{qid}/{server_language}/batch", response_model=QuizDataBatch)
+async def run_server_batch(
+    request: Request,
+    qid: str | UUID,
+    server_language: Literal["python", "javascript"],
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    n: int = Query(10, ge=1, le=MAX_BATCH_VARIANTS),
+    seed: Optional[int] = Query(None, ge=0),
+) -> QuizDataBatch:
+    """
+    Generate `n` variants of a question in a single call.
+
+    The server file is loaded once and `generate` runs once per variant, with
+    variant `i` seeded with `seed + i`. Passing the returned `seed` back reproduces
+    the same variants; when omitted a random seed is chosen.
+    """
+    _, server_source = await resolve_server_source(
+        qid, server_language, qm, storage, storage_type
+    )
+    base_seed = seed if seed is not None else secrets.randbits(31)
+    seeds = [base_seed + i for i in range(n)]
+
+    try:
+        responses = await run_generate_batch_async(
+            server_source,
+            server_language,
+            seeds,
+            is_disconnected=request.is_disconnected,
+        )
+    except CodeRunException as e:
+        raise to_http_exception(e) from e
+
+    variants: List[QuizData] = []
+    for variant_seed, response in zip(seeds, responses):
+        if not response.success or not response.quiz_response:
+            code = response.http_status_code or status.HTTP_500_INTERNAL_SERVER_ERROR
+            raise HTTPException(
+                status_code=(
+                    code if code >= 400 else status.HTTP_500_INTERNAL_SERVER_ERROR
+                ),
+                detail=f"Variant with seed {variant_seed} failed: {response.error}",
+            )
+        variants.append(response.quiz_response)
+
+    return QuizDataBatch(seed=base_seed, variants=variants)
+
+
+@router.post("/{qid}/{server_language}/variant_space", response_model=VariantSpaceReport)
+async def run_server_variant_space(
+    qid: str | UUID,
+    server_language: Literal["python", "javascript"],
+    qm: QuestionManagerDependency,
+    storage: StorageDependency,
+    storage_type: StorageTypeDep,
+    n: int = Query(1000, ge=1, le=get_settings().VARIANT_SPACE_MAX_SAMPLES),
+    seed: int = Query(0, ge=0),
+) -> VariantSpaceReport:
+    """
+    Sample a question's generator `n` times and report what it produces.
+
+    Every `params`/`correct_answers` value gets its range, distribution and
+    counts of non-finite, zero and negative values; failed seeds and duplicate
+    variants are counted. Samples use seeds `seed .. seed + n - 1`, so a report is
+    reproducible and is cached until the server file changes.
+    """
+    _, server_source = await resolve_server_source(
+        qid, server_language, qm, storage, storage_type
+    )
+    try:
+        return await analyze_variant_space(server_source, server_language, n, seed)
+    except CodeRunException as e:
+        raise to_http_exception(e) from e
@@ -3,6 +3,7 @@ from starlette import status
 
 from src.api.models import *
 from src.api.core.config import get_settings
+from src.api.database.database import database_stats
 
 router = APIRouter()
 settings = get_settings()
@@ -17,3 +18,9 @@ def startup_connection():
 async def get_current_settings():
     """Return the current storage settings (cloud or local)."""
     return {"storage_service": settings.STORAGE_SERVICE}
+
+
+@router.get("/db_stats")
+async def get_database_stats():
+    """Report statement timings (histogram, slow query count) and connection pool status."""
+    return database_stats()
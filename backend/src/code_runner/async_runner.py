@@ -0,0 +1,251 @@
+# --- Standard Library ---
+import asyncio
+import contextvars
+import functools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, TypeVar
+
+# --- Third-Party ---
+from starlette import status
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.core.config import get_settings
+from src.code_runner.models import CodeRunException, CodeRunResponse
+from src.code_runner.runtime_switcher import run_generate, run_generate_batch
+from src.code_runner.utils import ServerFile
+from src.code_runner.worker_pool import CANCEL_EVENT
+
+T = TypeVar("T")
+
+# Status reported when the client went away before the run finished (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+# How often a waiting request checks whether its client disconnected
+DISCONNECT_POLL_INTERVAL = 0.25
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AdmissionGate:
+    """
+    Global admission control for question code runs.
+
+    At most `max_concurrency` runs execute at once and at most `max_queue` requests
+    wait for a slot; anything beyond that is rejected with 429 instead of piling up.
+    A slot is held until the underlying run has actually finished, so abandoned
+    runs still count against the limit until their runtime has been stopped. Runs
+    on the `inprocess` and `subinterpreter` backends cannot be stopped at all: they
+    keep their slot until the question code returns by itself.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.rejected = 0
+        self._running = 0
+        self._waiters: "deque[asyncio.Future[None]]" = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self._running < self.max_concurrency and not self._waiters:
+                self._running += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise CodeRunException(
+                    error=(
+                        f"Too many question runs in progress ({self._running} running, "
+                        f"{len(self._waiters)} queued), try again shortly."
+                    ),
+                    http_status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                )
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over as we were cancelled, pass it on
+            self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the next waiter; `_running` is unchanged
+                waiter = self._waiters.popleft()
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                return
+            self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": len(self._waiters),
+                "rejected": self.rejected,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+            }
+
+
+_gate: Optional[AdmissionGate] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
+
+
+def get_admission_gate() -> AdmissionGate:
+    global _gate
+    with _init_lock:
+        if _gate is None:
+            settings = get_settings()
+            _gate = AdmissionGate(
+                settings.RUNNER_MAX_CONCURRENCY, settings.RUNNER_MAX_QUEUE
+            )
+        return _gate
+
+
+def get_runner_executor() -> ThreadPoolExecutor:
+    """Threads that block on runtimes; sized so admitted runs never queue behind each other."""
+    global _executor
+    with _init_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_settings().RUNNER_MAX_CONCURRENCY,
+                thread_name_prefix="code-runner",
+            )
+        return _executor
+
+
+def shutdown_runner_executor() -> None:
+    global _executor
+    with _init_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_with_admission(
+    func: Callable[..., T],
+    *args: Any,
+    timeout: Optional[float] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Run a blocking runner call off the event loop under admission control.
+
+    Args:
+        func (Callable): Blocking function that executes question code.
+        timeout (Optional[float]): Hard wall-clock limit; defaults to RUNNER_HARD_TIMEOUT.
+        is_disconnected (Optional[Callable]): Polled while waiting; typically
+            `request.is_disconnected`.
+
+    Returns:
+        T: Whatever `func` returns.
+
+    Raises:
+        CodeRunException: 429 if the wait queue is full, 504 on the hard timeout,
+            499 if the client disconnected, or whatever `func` raised.
+
+    On a timeout or disconnect, pooled and forked runtimes are killed through
+    `CANCEL_EVENT`. Code running on a thread of this process (the `inprocess` and
+    `subinterpreter` backends) cannot be interrupted: the caller gets its 504 or
+    499 right away, but the admission slot stays taken until the code returns.
+    """
+    gate = get_admission_gate()
+    timeout = timeout or get_settings().RUNNER_HARD_TIMEOUT
+    await gate.acquire()
+
+    # Worker pools watch this event and kill the runtime executing our code once set
+    cancel = threading.Event()
+    context = contextvars.copy_context()
+    context.run(CANCEL_EVENT.set, cancel)
+
+    loop = asyncio.get_running_loop()
+    try:
+        future = loop.run_in_executor(
+            get_runner_executor(), functools.partial(context.run, func, *args, **kwargs)
+        )
+    except BaseException:
+        gate.release()
+        raise
+    future.add_done_callback(lambda _: gate.release())
+
+    try:
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning("[AsyncRunner] Run exceeded %ss, cancelling it", timeout)
+                raise CodeRunException(
+                    error=f"Question code did not finish within {timeout} seconds.",
+                    http_status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                )
+            if is_disconnected is not None:
+                remaining = min(remaining, DISCONNECT_POLL_INTERVAL)
+            done, _ = await asyncio.wait({future}, timeout=remaining)
+            if done:
+                return future.result()
+            if is_disconnected is not None and await is_disconnected():
+                logger.info("[AsyncRunner] Client disconnected, cancelling run")
+                raise CodeRunException(
+                    error="Client disconnected before the run finished.",
+                    http_status_code=CLIENT_CLOSED_REQUEST,
+                )
+    finally:
+        if not future.done():
+            cancel.set()
+
+
+async def run_generate_async(
+    path: ServerFile,
+    language: Literal["python", "javascript"],
+    isTesting: bool = False,
+    seed: Optional[int] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> CodeRunResponse:
+    """Async counterpart of `run_generate` that never blocks the event loop."""
+    return await run_with_admission(
+        run_generate,
+        path,
+        language,
+        isTesting=isTesting,
+        seed=seed,
+        is_disconnected=is_disconnected,
+    )
+
+
+async def run_generate_batch_async(
+    path: ServerFile,
+    language: Literal["python", "javascript"],
+    seeds: List[int],
+    isTesting: bool = False,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    cache: bool = True,
+) -> List[CodeRunResponse]:
+    """
+    Async counterpart of `run_generate_batch`. The hard timeout applies to the whole
+    batch; single variants are limited by their backend.
+    """
+    return await run_with_admission(
+        run_generate_batch,
+        path,
+        language,
+        seeds,
+        isTesting=isTesting,
+        cache=cache,
+        is_disconnected=is_disconnected,
+    )
@@ -0,0 +1,210 @@
+"""
+Self-test every question server file in a catalog.
+
+Each `server.py` / `server.js` is run with `isTesting=True` (which calls
+`generate(2)` and expects `test_results.pass`) across a process pool, and one
+JSON line is reported per question as soon as its test finishes, followed by a
+summary line. Used by `POST /run_server/test_all` and from the command line:
+
+    python -m src.code_runner.catalog_tests questions/ --parallelism 8 -o report.jsonl
+"""
+
+# --- Standard Library ---
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal, Optional, Sequence
+
+# --- Third-Party ---
+from starlette import status
+
+# --- Internal ---
+from src.api.core.config import get_settings
+from src.code_runner.models import (
+    CatalogTestResult,
+    CatalogTestTarget,
+    CodeRunException,
+    CodeRunResponse,
+)
+from src.code_runner.runtime_switcher import run_generate
+
+SERVER_FILES = {"python": "server.py", "javascript": "server.js"}
+
+
+def find_server_files(
+    root: str | Path,
+    languages: Sequence[Literal["python", "javascript"]] = ("python", "javascript"),
+) -> Iterator[CatalogTestTarget]:
+    """Yield a target for every server file below `root`, named by its question directory."""
+    root = Path(root)
+    for language in languages:
+        for path in sorted(root.rglob(SERVER_FILES[language])):
+            question_id = path.parent.relative_to(root).as_posix()
+            yield CatalogTestTarget(
+                question_id=question_id, language=language, path=str(path)
+            )
+
+
+def _init_test_process() -> None:
+    # The process pool is the unit of parallelism, so each process keeps only a
+    # single runtime worker instead of a full pool per process
+    settings = get_settings()
+    settings.PY_WORKER_POOL_SIZE = 1
+    settings.PY_SUBINTERPRETER_POOL_SIZE = 1
+    settings.JS_WORKER_POOL_SIZE = 1
+
+
+def classify_response(response: CodeRunResponse) -> Literal["pass", "fail", "error"]:
+    """A test fails when it ran but reported `test_results.pass` false; anything else is an error."""
+    if response.success and response.quiz_response is not None:
+        test_results = response.quiz_response.test_results or {}
+        return "pass" if test_results.get("pass") else "fail"
+    if response.http_status_code == status.HTTP_200_OK:
+        return "fail"
+    return "error"
+
+
+def run_catalog_test(target: CatalogTestTarget) -> CatalogTestResult:
+    """Run one server file in test mode and time it."""
+    start = time.perf_counter()
+    try:
+        response = run_generate(target.path, target.language, isTesting=True)
+    except CodeRunException as e:
+        response = e.response
+    except Exception as e:
+        response = CodeRunResponse(
+            success=False,
+            error=f"Unexpected error running test: {e}",
+            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    outcome = classify_response(response)
+    error = response.error
+    if outcome == "fail" and error is None:
+        error = (response.quiz_response.test_results or {}).get(
+            "message", "Test failed."
+        )
+    return CatalogTestResult(
+        question_id=target.question_id,
+        language=target.language,
+        status=outcome,
+        error=error,
+        http_status_code=response.http_status_code,
+        duration_ms=round(duration_ms, 3),
+        metrics=response.metrics,
+    )
+
+
+def iter_catalog_results(
+    targets: Iterable[CatalogTestTarget], parallelism: Optional[int] = None
+) -> Iterator[CatalogTestResult]:
+    """
+    Test every target across a process pool, yielding results in completion order.
+
+    Args:
+        targets (Iterable[CatalogTestTarget]): Server files to test.
+        parallelism (Optional[int]): Number of processes; defaults to
+            CATALOG_TEST_PARALLELISM, then to the CPU count.
+
+    Closing the iterator early cancels the tests that have not started yet.
+    """
+    targets = list(targets)
+    if not targets:
+        return
+    parallelism = (
+        parallelism or get_settings().CATALOG_TEST_PARALLELISM or os.cpu_count() or 1
+    )
+    executor = ProcessPoolExecutor(
+        max_workers=min(parallelism, len(targets)),
+        # Forking a threaded API process is unsafe; spawned processes import cleanly
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_test_process,
+    )
+    try:
+        futures = {executor.submit(run_catalog_test, t): t for t in targets}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                target = futures[future]
+                yield CatalogTestResult(
+                    question_id=target.question_id,
+                    language=target.language,
+                    status="error",
+                    error=f"Test process failed: {e}",
+                    http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    duration_ms=0.0,
+                )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_catalog_report(
+    targets: Iterable[CatalogTestTarget], parallelism: Optional[int] = None
+) -> Iterator[str]:
+    """Yield the JSONL report: one line per question, then a `summary` line."""
+    start = time.perf_counter()
+    counts = {"pass": 0, "fail": 0, "error": 0}
+    for result in iter_catalog_results(targets, parallelism):
+        counts[result.status] += 1
+        yield result.model_dump_json() + "\n"
+    summary = {
+        "total": sum(counts.values()),
+        "passed": counts["pass"],
+        "failed": counts["fail"],
+        "errors": counts["error"],
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+    yield json.dumps({"summary": summary}) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the self-test of every question server file under a directory."
+    )
+    parser.add_argument("root", help="Directory containing the question folders")
+    parser.add_argument(
+        "-p", "--parallelism", type=int, default=None, help="Number of test processes"
+    )
+    parser.add_argument(
+        "-l",
+        "--language",
+        choices=list(SERVER_FILES),
+        default=None,
+        help="Only test server files for this language",
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write the JSONL report here (default stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    languages = [args.language] if args.language else list(SERVER_FILES)
+    targets = find_server_files(args.root, languages)
+    out = open(args.output, "w") if args.output else sys.stdout
+    summary = {}
+    try:
+        for line in iter_catalog_report(targets, args.parallelism):
+            out.write(line)
+            out.flush()
+            summary = json.loads(line).get("summary", summary)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(
+        f"{summary.get('passed', 0)}/{summary.get('total', 0)} passed, "
+        f"{summary.get('failed', 0)} failed, {summary.get('errors', 0)} errors "
+        f"in {summary.get('duration_ms', 0) / 1000:.1f}s",
+        file=sys.stderr,
+    )
+    return 0 if summary.get("passed", 0) == summary.get("total", 0) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Fork-server execution backend for Python question code.
+
+A multiprocessing fork server is started once with the scientific modules most
+question files import (`PY_FORKSERVER_PRELOAD`) already loaded. Each run forks a
+copy-on-write child from it, executes the module in that child and sends the
+`CodeRunResponse` back over a pipe, so a run pays the fork cost instead of the
+interpreter start-up and import cost, and still never shares state with other runs.
+"""
+
+# --- Standard Library ---
+import marshal
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Connection
+from types import CodeType
+from typing import Any, List, Optional, Sequence
+
+# --- Third-Party ---
+from starlette import status
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.core.config import get_settings
+from src.code_runner.limits import batch_timeout, enter_sandbox, run_time_budget
+from src.code_runner.models import CodeRunException, CodeRunResponse
+from src.code_runner.run_py import load_python_code, run_generate_code
+from src.code_runner.static_analysis import known_generate_args
+from src.code_runner.utils import ServerFile
+from src.code_runner.worker_pool import CANCEL_EVENT, CANCEL_POLL_INTERVAL
+
+# Imported by the fork server itself so every child starts with the runner loaded
+RUNNER_MODULES = ["src.code_runner.forkserver"]
+
+_context: Optional[Any] = None
+_context_lock = threading.Lock()
+
+
+def forkserver_available() -> bool:
+    return "forkserver" in multiprocessing.get_all_start_methods()
+
+
+def get_forkserver_context():
+    """Return the forkserver multiprocessing context, configuring its preload list once."""
+    global _context
+    with _context_lock:
+        if _context is None:
+            if not forkserver_available():
+                raise CodeRunException(
+                    error="The forkserver backend is not supported on this platform.",
+                    http_status_code=status.HTTP_424_FAILED_DEPENDENCY,
+                )
+            _context = multiprocessing.get_context("forkserver")
+            # Modules that fail to import are skipped by the fork server
+            _context.set_forkserver_preload(
+                RUNNER_MODULES + list(get_settings().PY_FORKSERVER_PRELOAD)
+            )
+        return _context
+
+
+def prestart_forkserver() -> None:
+    """Start the fork server (and run its preloads) ahead of the first request."""
+    get_forkserver_context()
+    from multiprocessing import forkserver
+
+    forkserver.ensure_running()
+
+
+def _run_in_child(
+    conn: Connection,
+    code_bytes: bytes,
+    isTesting: bool,
+    seeds: List[Optional[int]],
+    call_args: Optional[Sequence[Any]] = None,
+) -> None:
+    try:
+        settings = get_settings()
+        enter_sandbox(
+            cpu_seconds=settings.RUNNER_MAX_CPU_SECONDS,
+            memory_bytes=settings.RUNNER_MAX_MEMORY_MB * 1024**2,
+            wall_seconds=run_time_budget(settings.PY_WORKER_TIMEOUT),
+        )
+        code = marshal.loads(code_bytes)
+        conn.send(
+            [
+                run_generate_code(code, isTesting, seed, call_args).model_dump()
+                for seed in seeds
+            ]
+        )
+    except Exception as e:
+        conn.send(
+            [
+                CodeRunResponse(
+                    success=False,
+                    error=f"Error executing module in forked child: {e}",
+                    quiz_response=None,
+                    http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                ).model_dump()
+            ]
+        )
+    finally:
+        conn.close()
+
+
+def run_code_forked(
+    code: CodeType,
+    seeds: List[Optional[int]],
+    isTesting: bool = False,
+    call_args: Optional[Sequence[Any]] = None,
+) -> List[CodeRunResponse]:
+    """
+    Execute compiled question code once per seed in a single forked child.
+
+    Raises:
+        CodeRunException: If the run times out, is cancelled, or the child dies.
+    """
+    ctx = get_forkserver_context()
+    settings = get_settings()
+    timeout = batch_timeout(
+        settings.PY_WORKER_TIMEOUT, len(seeds), settings.RUNNER_HARD_TIMEOUT
+    )
+    cancel = CANCEL_EVENT.get()
+
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_run_in_child,
+        args=(sender, marshal.dumps(code), isTesting, seeds, call_args),
+        daemon=True,
+    )
+    try:
+        process.start()
+    finally:
+        sender.close()
+    try:
+        deadline = time.monotonic() + timeout
+        while not receiver.poll(min(CANCEL_POLL_INTERVAL, timeout)):
+            if cancel is not None and cancel.is_set():
+                raise CodeRunException(
+                    error="Python execution was cancelled.", http_status_code=499
+                )
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "[Forkserver] Child pid=%s exceeded %ss, killing it",
+                    process.pid,
+                    timeout,
+                )
+                raise CodeRunException(
+                    error=f"Python execution timed out after {timeout} seconds.",
+                    http_status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                )
+        try:
+            data = receiver.recv()
+        except EOFError:
+            process.join(1)
+            raise CodeRunException(
+                error=f"Python child process exited with code {process.exitcode} before responding.",
+                http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return [CodeRunResponse.model_validate(item) for item in data]
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join(5)
+        receiver.close()
+
+
+def run_generate_py_forked(
+    path: ServerFile, isTesting: bool = False, seed: Optional[int] = None
+) -> CodeRunResponse:
+    """
+    Run a Python question file in a child forked from the preloaded fork server.
+
+    The file is compiled in the API process (reusing the compiled-module cache) and
+    only the marshalled code object is sent to the child.
+    """
+    code = load_python_code(path)
+    if isinstance(code, CodeRunResponse):
+        return code
+    return run_code_forked(
+        code, [seed], isTesting, known_generate_args(path, isTesting)
+    )[0]
+
+
+def run_generate_py_forked_batch(
+    path: ServerFile, seeds: List[int], isTesting: bool = False
+) -> List[CodeRunResponse]:
+    """Run `generate` once per seed inside one forked child."""
+    code = load_python_code(path)
+    if isinstance(code, CodeRunResponse):
+        return [code]
+    return run_code_forked(
+        code, list(seeds), isTesting, known_generate_args(path, isTesting)
+    )
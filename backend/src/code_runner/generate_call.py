@@ -0,0 +1,102 @@
+"""
+Calling convention for a question's `generate()` function.
+
+Standard library only: besides the API process and the worker processes, this
+module is executed inside isolated subinterpreters, which cannot import most
+third-party extension modules.
+"""
+
+# --- Standard Library ---
+import inspect
+import io
+from contextlib import redirect_stdout
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+class BoundedLogCapture(io.StringIO):
+    """stdout replacement that keeps at most `max_bytes` of output (UTF-8)."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+
+    def write(self, text: str) -> int:
+        if self.max_bytes is None:
+            return super().write(text)
+        if self.truncated:
+            return len(text)
+        data = text.encode("utf-8")
+        room = self.max_bytes - self.size
+        if len(data) > room:
+            self.truncated = True
+            data = data[: max(room, 0)]
+        self.size += len(data)
+        super().write(data.decode("utf-8", errors="ignore"))
+        return len(text)
+
+    def lines(self) -> List[str]:
+        lines = self.getvalue().splitlines()
+        if self.truncated:
+            lines.append(f"[output truncated after {self.max_bytes} bytes]")
+        return lines
+
+
+def generate_args(generate: Callable[..., Any], isTesting: bool) -> Tuple[Any, ...]:
+    """
+    Match JS behavior: when testing, pass 2; otherwise no arguments if possible.
+    If the signature requires an arg, pass 0 in non-testing mode.
+    """
+    try:
+        sig = inspect.signature(generate)
+        if isTesting:
+            return (2,) if len(sig.parameters) >= 1 else ()
+        # Prefer zero args; if at least one required positional param exists, pass 0
+        requires_positional = any(
+            p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+            and p.default is p.empty
+            for p in sig.parameters.values()
+        )
+        return (0,) if requires_positional else ()
+    except Exception:
+        # If introspection fails, fall back to JS-like behavior
+        return (2,) if isTesting else ()
+
+
+def static_generate_args(
+    arity: int, required_args: int, isTesting: bool
+) -> Tuple[Any, ...]:
+    """`generate_args` for a signature already known from static analysis."""
+    if isTesting:
+        return (2,) if arity >= 1 else ()
+    return (0,) if required_args >= 1 else ()
+
+
+def call_generate(
+    generate: Callable[..., Any],
+    isTesting: bool,
+    max_log_bytes: Optional[int] = None,
+    args: Optional[Sequence[Any]] = None,
+) -> Tuple[Any, List[str]]:
+    """
+    Call `generate` while capturing its printed output.
+
+    Args:
+        max_log_bytes (Optional[int]): Output beyond this many bytes is dropped and
+            a truncation notice is appended to the captured lines.
+        args (Optional[Sequence[Any]]): Arguments worked out ahead of time; when
+            omitted they are derived from the signature of `generate`.
+
+    Returns:
+        Tuple[Any, List[str]]: The return value and the captured print lines.
+
+    Raises:
+        Exception: Whatever `generate` raised.
+    """
+    if args is None:
+        args = generate_args(generate, isTesting)
+    f = BoundedLogCapture(max_log_bytes)
+    with redirect_stdout(f):
+        result = generate(*args)
+    return result, f.lines()
@@ -0,0 +1,195 @@
+"""
+Batch grading of submissions against generated variants.
+
+A submitted answer is correct when it matches the variant's `correct_answers`
+entry to the precision the question displays: numbers agree to `nDigits`
+decimals or to `sigfigs` significant figures of the correct answer, whichever
+is looser; anything else, including integers too large for a float64, must be
+equal. Lists and dicts are compared element
+by element and are correct only if every element is.
+
+Numeric answers are first flattened into (cell, correct, submitted) rows, so the
+tolerance check for a whole batch is a single NumPy pass however many
+submissions it holds.
+"""
+
+# --- Standard Library ---
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Third-Party ---
+import numpy as np
+
+# --- Internal ---
+from src.code_runner.models import (
+    GradeBatchResult,
+    GradeSubmission,
+    QuizData,
+)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """
+    Submitted answers may be numbers or numeric strings typed by a student.
+    Returns None for anything that is not a float64, including integers too
+    large for one.
+    """
+    try:
+        if _is_number(value):
+            return float(value)
+        if isinstance(value, str):
+            return float(value.strip())
+    except (OverflowError, ValueError):
+        return None
+    return None
+
+
+def numbers_within_tolerance(
+    correct: np.ndarray,
+    submitted: np.ndarray,
+    nDigits: np.ndarray,
+    sigfigs: np.ndarray,
+) -> np.ndarray:
+    """Element-wise precision check of submitted numbers against correct ones."""
+    with np.errstate(invalid="ignore", over="ignore"):
+        absolute = 0.5 * 10.0 ** (-nDigits)
+        relative = 0.5 * 10.0 ** (1 - sigfigs) * np.abs(correct)
+        close = np.abs(correct - submitted) <= np.maximum(absolute, relative)
+    # Infinities only match themselves and NaN only matches NaN
+    return close | (correct == submitted) | (np.isnan(correct) & np.isnan(submitted))
+
+
+_PLAIN_NUMBERS = (int, float)
+
+
+class _Leaves:
+    """Numeric leaves gathered for the vectorized check, plus cells already known wrong."""
+
+    def __init__(self) -> None:
+        self.numbers: List[Tuple[int, float, float]] = []  # (cell, correct, submitted)
+        self.failed: List[int] = []
+
+    def add(self, cell: int, correct: Any, submitted: Any) -> None:
+        if type(correct) in _PLAIN_NUMBERS and type(submitted) in _PLAIN_NUMBERS:
+            # Fast path for the common case of a number answered with a number
+            try:
+                self.numbers.append((cell, float(correct), float(submitted)))
+            except OverflowError:
+                self.add_exact(cell, correct, submitted)
+        elif _is_number(correct):
+            expected, number = _as_number(correct), _as_number(submitted)
+            if expected is None:
+                self.add_exact(cell, correct, submitted)
+            elif number is None:
+                self.failed.append(cell)
+            else:
+                self.numbers.append((cell, expected, number))
+        elif isinstance(correct, dict):
+            if not isinstance(submitted, dict) or set(submitted) != set(correct):
+                self.failed.append(cell)
+                return
+            for key, value in correct.items():
+                self.add(cell, value, submitted[key])
+        elif isinstance(correct, list):
+            if not isinstance(submitted, list) or len(submitted) != len(correct):
+                self.failed.append(cell)
+                return
+            for a, b in zip(correct, submitted):
+                self.add(cell, a, b)
+        elif isinstance(correct, str) and isinstance(submitted, str):
+            if correct.strip() != submitted.strip():
+                self.failed.append(cell)
+        elif correct != submitted or type(correct) is not type(submitted):
+            self.failed.append(cell)
+
+    def add_exact(self, cell: int, correct: Any, submitted: Any) -> None:
+        """Integers beyond float64 have no tolerance and must match exactly."""
+        if not _is_number(submitted) or correct != submitted:
+            self.failed.append(cell)
+
+    def cells_correct(self, precision: np.ndarray) -> np.ndarray:
+        """`precision` holds the (nDigits, sigfigs) of every cell's variant."""
+        ok = np.ones(len(precision), dtype=bool)
+        if self.numbers:
+            leaves = np.array(self.numbers, dtype=np.float64)
+            cells = leaves[:, 0].astype(np.intp)
+            matched = numbers_within_tolerance(
+                leaves[:, 1],
+                leaves[:, 2],
+                precision[cells, 0],
+                precision[cells, 1],
+            )
+            ok[cells[~matched]] = False
+        if self.failed:
+            ok[np.asarray(self.failed, dtype=np.intp)] = False
+        return ok
+
+
+def grade_batch(
+    variants: List[QuizData], submissions: List[GradeSubmission]
+) -> GradeBatchResult:
+    """
+    Grade every submission against the variant it references.
+
+    Raises:
+        ValueError: If a submission references a variant that was not sent.
+    """
+    start = time.perf_counter()
+    leaves = _Leaves()
+    cell_submission: List[int] = []
+    cell_variant: List[int] = []
+    cell_key: List[str] = []
+
+    for i, submission in enumerate(submissions):
+        v = submission.variant
+        if not 0 <= v < len(variants):
+            raise ValueError(
+                f"Submission {i} references variant {v}, "
+                f"but only {len(variants)} variants were sent"
+            )
+        answers = submission.answers
+        for key, correct in variants[v].correct_answers.items():
+            cell = len(cell_key)
+            cell_submission.append(i)
+            cell_variant.append(v)
+            cell_key.append(key)
+            if key in answers:
+                leaves.add(cell, correct, answers[key])
+            else:
+                leaves.failed.append(cell)
+
+    variant_precision = np.array(
+        [
+            (
+                q.nDigits if q.nDigits is not None else 3,
+                q.sigfigs if q.sigfigs is not None else 3,
+            )
+            for q in variants
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    ok = leaves.cells_correct(variant_precision[np.asarray(cell_variant, dtype=np.intp)])
+
+    count = len(submissions)
+    owners = np.asarray(cell_submission, dtype=np.intp)
+    answered = np.bincount(owners, minlength=count)
+    right = np.bincount(owners, weights=ok, minlength=count)
+    score = np.divide(right, answered, out=np.zeros(count), where=answered > 0)
+
+    correct: Dict[str, List[Optional[bool]]] = {}
+    for i, key, value in zip(cell_submission, cell_key, ok.tolist()):
+        column = correct.get(key)
+        if column is None:
+            column = correct[key] = [None] * count
+        column[i] = value
+
+    return GradeBatchResult(
+        count=count,
+        score=[round(s, 6) for s in score.tolist()],
+        correct=correct,
+        wall_time_ms=round((time.perf_counter() - start) * 1000, 3),
+    )
@@ -0,0 +1,278 @@
+// Long-lived Node.js worker for the question code runner.
+//
+// Protocol: one JSON request per line on stdin, one JSON response per line on stdout.
+//   request:  { id, op: "run" | "batch" | "analyze", hash, source?, evict?: [hash],
+//               args: { arg, seed? | seeds } }
+//   response: { id, ok: true, data: { result, logs, metrics } | [variant] | {} }
+//          |  { id, ok: false, kind, error }
+//   variant:  { result, logs, metrics } | { ok: false, kind, error }
+//
+// In a batch, a variant that fails (a limit, or its module body throwing) is
+// reported in its own slot, so one bad seed does not fail the others.
+//
+// "analyze" only compiles the module (a syntax check that runs no user code) and
+// keeps it resident for the runs that follow.
+//
+// Compiled server.js modules stay resident keyed by the content hash sent by the
+// pool, so a question is only parsed once per worker. Each run still gets a fresh
+// context so globals and logs never leak between students.
+"use strict";
+
+const path = require("path");
+const readline = require("readline");
+const vm = require("vm");
+const { createRequire } = require("module");
+
+const MAX_MODULES = parseInt(process.env.JS_WORKER_MAX_MODULES || "64", 10);
+const MAX_MODULE_BYTES = parseInt(
+  process.env.JS_WORKER_MAX_MODULE_BYTES || String(32 * 1024 * 1024),
+  10
+);
+// Per-run limits: synchronous execution time (module body and generate together)
+// and captured console output.
+const RUN_TIMEOUT_MS = parseInt(process.env.JS_WORKER_RUN_TIMEOUT_MS || "10000", 10);
+const MAX_LOG_BYTES = parseInt(process.env.JS_WORKER_MAX_LOG_BYTES || String(64 * 1024), 10);
+
+// Resolve `require` calls from the API's working directory, like execjs did.
+const userRequire = createRequire(path.join(process.cwd(), "server.js"));
+
+// stdout is reserved for the protocol; anything else that logs goes to stderr.
+const writeProtocol = process.stdout.write.bind(process.stdout);
+console.log = console.info = console.debug = (...args) => console.error(...args);
+
+// hash -> { script, size }, Map insertion order doubles as LRU order
+const scripts = new Map();
+let scriptBytes = 0;
+
+function send(message) {
+  writeProtocol(JSON.stringify(message) + "\n");
+}
+
+function formatLog(arg) {
+  if (typeof arg === "object") {
+    try {
+      return JSON.stringify(arg);
+    } catch (e) {
+      return "[Unserializable Object]";
+    }
+  }
+  return String(arg);
+}
+
+// Small seedable PRNG (mulberry32) that stands in for Math.random in seeded runs.
+function seededRandom(seed) {
+  let state = seed >>> 0;
+  return function random() {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// Thrown when a run exceeds a limit; reported as kind "limit" instead of a log line.
+class LimitExceeded extends Error {}
+
+function evictScript(hash) {
+  const entry = scripts.get(hash);
+  if (entry) {
+    scripts.delete(hash);
+    scriptBytes -= entry.size;
+  }
+}
+
+function loadScript(hash, source) {
+  if (scripts.has(hash)) {
+    const entry = scripts.get(hash);
+    scripts.delete(hash);
+    scripts.set(hash, entry);
+    return entry.script;
+  }
+  if (typeof source !== "string") {
+    return null;
+  }
+  // Expose `generate` whether it was declared with function, const or let.
+  const script = new vm.Script(
+    source +
+      "\n;globalThis.__generate = (typeof generate === 'function') ? generate : undefined;",
+    { filename: "server.js" }
+  );
+  const size = Buffer.byteLength(source);
+  scripts.set(hash, { script, size });
+  scriptBytes += size;
+  while (scripts.size > 1 && (scripts.size > MAX_MODULES || scriptBytes > MAX_MODULE_BYTES)) {
+    evictScript(scripts.keys().next().value);
+  }
+  return script;
+}
+
+function runGenerate(script, arg, seed) {
+  const logs = [];
+  let logBytes = 0;
+  let truncated = false;
+  const capture = (...args) => {
+    if (truncated) {
+      return;
+    }
+    const line = args.map(formatLog).join(" ");
+    logBytes += Buffer.byteLength(line);
+    if (logBytes > MAX_LOG_BYTES) {
+      truncated = true;
+      logs.push(`[output truncated after ${MAX_LOG_BYTES} bytes]`);
+      return;
+    }
+    logs.push(line);
+  };
+  const started = process.hrtime.bigint();
+  const cpuStarted = process.cpuUsage();
+  const sandbox = {
+    require: userRequire,
+    module: { exports: {} },
+    console: { log: capture, info: capture, warn: capture, error: capture, debug: capture },
+    setTimeout,
+    clearTimeout,
+  };
+  sandbox.exports = sandbox.module.exports;
+  const context = vm.createContext(sandbox);
+  if (seed !== undefined && seed !== null) {
+    vm.runInContext("Math", context).random = seededRandom(seed);
+  }
+  const deadline = Date.now() + RUN_TIMEOUT_MS;
+  runLimited(() => script.runInContext(context, { timeout: RUN_TIMEOUT_MS }));
+
+  if (typeof context.__generate !== "function") {
+    return { missing: true };
+  }
+
+  let result = null;
+  try {
+    // Same contract as the execjs wrapper: generate always receives an object.
+    context.__arg = arg && typeof arg === "object" ? arg : {};
+    // Called through the vm so the timeout also interrupts generate itself, with
+    // whatever the module body left of the run's budget.
+    const out = runLimited(() =>
+      vm.runInContext("__generate(__arg)", context, { timeout: remainingMs(deadline) })
+    );
+    if (!(out && typeof out === "object")) {
+      logs.push("generate returned non-object output");
+    }
+    result = out;
+  } catch (e) {
+    if (e instanceof LimitExceeded) {
+      throw e;
+    }
+    const msg = e && e.message ? e.message : String(e);
+    logs.push(`Error in generate: ${msg}`);
+    if (e && e.stack) {
+      logs.push(`Stack: ${e.stack}`);
+    }
+  }
+  const cpu = process.cpuUsage(cpuStarted);
+  const metrics = {
+    wall_time_ms: Math.round(Number(process.hrtime.bigint() - started) / 1e3) / 1e3,
+    cpu_time_ms: (cpu.user + cpu.system) / 1000,
+    // Resident size once the run is done; V8 gives no per-run peak.
+    peak_memory_bytes: process.memoryUsage().rss,
+  };
+  return { result: result === undefined ? null : result, logs, metrics };
+}
+
+function runVariant(script, arg, seed) {
+  try {
+    return runGenerate(script, arg, seed);
+  } catch (e) {
+    if (e instanceof LimitExceeded) {
+      return { ok: false, kind: "limit", error: e.message };
+    }
+    return { ok: false, kind: "runtime", error: String(e && e.stack ? e.stack : e) };
+  }
+}
+
+function limitExceeded() {
+  return new LimitExceeded(`Question code exceeded its time limit of ${RUN_TIMEOUT_MS} ms`);
+}
+
+function remainingMs(deadline) {
+  const remaining = deadline - Date.now();
+  if (remaining <= 0) {
+    throw limitExceeded();
+  }
+  return remaining;
+}
+
+function runLimited(fn) {
+  try {
+    return fn();
+  } catch (e) {
+    if (e && e.code === "ERR_SCRIPT_EXECUTION_TIMEOUT") {
+      throw limitExceeded();
+    }
+    throw e;
+  }
+}
+
+function handle(request) {
+  const { id, op, hash, source, args, evict } = request;
+  // The pool piggybacks invalidated hashes on the next request it sends us.
+  for (const stale of evict || []) {
+    evictScript(stale);
+  }
+  if (op !== "run" && op !== "batch" && op !== "analyze") {
+    return { id, ok: false, kind: "protocol", error: `Unknown op '${op}'` };
+  }
+
+  let script;
+  try {
+    script = loadScript(hash, source);
+  } catch (e) {
+    return { id, ok: false, kind: "compile", error: String(e && e.message ? e.message : e) };
+  }
+  if (script === null) {
+    return { id, ok: false, kind: "missing_source", error: `Module ${hash} is not loaded` };
+  }
+
+  if (op === "analyze") {
+    return { id, ok: true, data: {} };
+  }
+
+  const { arg, seed, seeds } = args || {};
+  try {
+    const runs =
+      op === "batch"
+        ? (seeds || []).map((s) => runVariant(script, arg, s))
+        : [runGenerate(script, arg, seed)];
+    if (runs.some((data) => data.missing)) {
+      return {
+        id,
+        ok: false,
+        kind: "missing_generate",
+        error: "The JavaScript file does not define a function named `generate`.",
+      };
+    }
+    // Round-trip through JSON so values from the sandbox realm serialize cleanly.
+    const data = op === "batch" ? runs : runs[0];
+    return { id, ok: true, data: JSON.parse(JSON.stringify(data)) };
+  } catch (e) {
+    if (e instanceof LimitExceeded) {
+      return { id, ok: false, kind: "limit", error: e.message };
+    }
+    return { id, ok: false, kind: "runtime", error: String(e && e.stack ? e.stack : e) };
+  }
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on("line", (line) => {
+  if (!line.trim()) {
+    return;
+  }
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (e) {
+    send({ id: null, ok: false, kind: "protocol", error: `Invalid JSON request: ${e}` });
+    return;
+  }
+  send(handle(request));
+});
+rl.on("close", () => process.exit(0));
@@ -0,0 +1,187 @@
+"""
+Per-run resource limits and accounting for question code.
+
+Hard limits can only be enforced where a run owns its process: the pooled Python
+workers and forked children call `enter_sandbox` once, after which every
+`metered_run` arms a CPU-seconds limit (SIGXCPU is turned into `CPULimitExceeded`)
+and a wall-clock limit (SIGALRM is turned into `TimeLimitExceeded`) on top of a
+process-wide address-space limit. Runs that share the API process (in-process and
+subinterpreter backends) are still metered, but only wall and CPU time of the
+calling thread can be attributed to them, and nothing can stop them early.
+"""
+
+# --- Standard Library ---
+import math
+import signal
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+# Share of a backend's call timeout that a single run may use, so the run's own
+# limit ends it (422) before the backend gives up on the whole call (504)
+RUN_BUDGET_SHARE = 0.8
+
+
+class RunLimitExceeded(BaseException):
+    """
+    Raised inside a run that used up one of its limits.
+
+    A BaseException so `except Exception` blocks in question code cannot swallow it.
+    """
+
+
+class CPULimitExceeded(RunLimitExceeded):
+    """Raised inside a run that used up its CPU seconds."""
+
+
+class TimeLimitExceeded(RunLimitExceeded):
+    """Raised inside a run that used up its wall-clock seconds."""
+
+
+_sandbox: Dict[str, Any] = {"active": False, "cpu_seconds": None, "wall_seconds": None}
+
+
+def run_time_budget(call_timeout: float, cpu_seconds: Optional[float] = None) -> float:
+    """Seconds one run may take on a backend whose calls time out after `call_timeout`."""
+    budget = call_timeout * RUN_BUDGET_SHARE
+    return min(budget, cpu_seconds) if cpu_seconds else budget
+
+
+def batch_timeout(call_timeout: float, runs: int, ceiling: float) -> float:
+    """
+    Timeout of one call that produces `runs` variants: `call_timeout` per variant,
+    but never more than `ceiling` in total, since every variant is limited by itself.
+    """
+    return max(call_timeout, min(call_timeout * max(runs, 1), ceiling))
+
+
+def _raise_cpu_limit(signum, frame) -> None:
+    raise CPULimitExceeded(
+        f"Question code exceeded its CPU limit of {_sandbox['cpu_seconds']} seconds"
+    )
+
+
+def _raise_time_limit(signum, frame) -> None:
+    raise TimeLimitExceeded(
+        f"Question code exceeded its time limit of {_sandbox['wall_seconds']:g} seconds"
+    )
+
+
+def enter_sandbox(
+    cpu_seconds: Optional[float] = None,
+    memory_bytes: Optional[int] = None,
+    wall_seconds: Optional[float] = None,
+) -> None:
+    """
+    Enforce limits for every later run in this process. Call once, from the main
+    thread of a process that only runs question code.
+    """
+    _sandbox.update(active=True, cpu_seconds=cpu_seconds, wall_seconds=wall_seconds)
+    if wall_seconds and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _raise_time_limit)
+    if resource is None:
+        return
+    if memory_bytes:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_bytes = min(memory_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+    if cpu_seconds:
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+
+
+def in_sandbox() -> bool:
+    """Whether this process only runs question code, i.e. `enter_sandbox` was called."""
+    return _sandbox["active"]
+
+
+def _arm_cpu_limit() -> Optional[int]:
+    """Set the soft CPU limit to the time used so far plus the per-run budget."""
+    seconds = _sandbox["cpu_seconds"]
+    if not (_sandbox["active"] and seconds and resource is not None):
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    used = time.process_time()
+    limit = math.ceil(used + seconds)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    return soft
+
+
+def _disarm_cpu_limit(previous: Optional[int]) -> None:
+    if previous is None or resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (previous, hard))
+
+
+def _arm_time_limit() -> bool:
+    seconds = _sandbox["wall_seconds"]
+    if not (_sandbox["active"] and seconds and hasattr(signal, "setitimer")):
+        return False
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    return True
+
+
+def _disarm_time_limit(armed: bool) -> None:
+    if armed:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def reset_peak_rss() -> None:
+    """Restart the kernel's peak-RSS counter for this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size since the last `reset_peak_rss`, or since start."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def metered_run() -> Iterator[Dict[str, Any]]:
+    """
+    Apply the per-run limits and collect the run's metrics into the yielded dict.
+
+    In a sandboxed process the CPU time and peak memory are the whole process's;
+    otherwise CPU time is the calling thread's and peak memory is not reported.
+    """
+    metrics: Dict[str, Any] = {}
+    dedicated = _sandbox["active"]
+    if dedicated:
+        reset_peak_rss()
+    cpu_clock = time.process_time if dedicated else time.thread_time
+    previous = _arm_cpu_limit()
+    wall_start, cpu_start = time.perf_counter(), cpu_clock()
+    timed = _arm_time_limit()
+    try:
+        yield metrics
+    finally:
+        _disarm_time_limit(timed)
+        metrics["wall_time_ms"] = round((time.perf_counter() - wall_start) * 1000, 3)
+        metrics["cpu_time_ms"] = round((cpu_clock() - cpu_start) * 1000, 3)
+        metrics["peak_memory_bytes"] = peak_rss_bytes() if dedicated else None
+        _disarm_cpu_limit(previous)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal, Optional, Union, Any, Dict, List
+from typing import Literal, Optional, Union, Any, Dict, List, Tuple
 
 
 class QuizData(BaseModel):
@@ -12,11 +12,45 @@ class QuizData(BaseModel):
     sigfigs: Optional[int] = 3
 
 
+class QuizDataBatch(BaseModel):
+    seed: int  # variant i was generated with seed + i
+    variants: List[QuizData]
+
+
+class ServerAnalysis(BaseModel):
+    """What static analysis learned about a server file without running it."""
+
+    language: Literal["python", "javascript"]
+    code_hash: str
+    valid: bool
+    error: Optional[str] = None
+    has_generate: bool = False
+    arity: Optional[int] = None  # parameters of `generate`; None if not statically known
+    required_args: Optional[int] = None  # required positional parameters
+    imports: List[str] = []
+
+
+class ServerSource(BaseModel):
+    """A server file's contents handed to the runners in memory instead of as a path."""
+
+    filename: str  # e.g. "server.py"; used for the extension check and tracebacks
+    content: bytes
+    # Set when the contents were analyzed at upload; runners then skip re-validation
+    analysis: Optional[ServerAnalysis] = None
+
+
+class RunMetrics(BaseModel):
+    wall_time_ms: float
+    cpu_time_ms: float
+    peak_memory_bytes: Optional[int] = None  # only when the run had its own process
+
+
 class CodeRunResponse(BaseModel):
     success: bool
     error: Optional[str] = None
     quiz_response: Optional[QuizData] = None
     http_status_code: Optional[int] = None
+    metrics: Optional[RunMetrics] = None
 
 
 
@@ -28,4 +62,96 @@ class CodeRunException(Exception):
             http_status_code=http_status_code,
             quiz_response=quiz_response,
         )
-        super().__init__(error)
\ No newline at end of file
+        super().__init__(error)
+
+
+class CatalogTestTarget(BaseModel):
+    question_id: str
+    language: Literal["python", "javascript"]
+    path: str
+
+
+class CatalogTestResult(BaseModel):
+    question_id: str
+    language: Literal["python", "javascript"]
+    status: Literal["pass", "fail", "error"]
+    error: Optional[str] = None
+    http_status_code: Optional[int] = None
+    duration_ms: float
+    metrics: Optional[RunMetrics] = None
+
+
+class ParityDivergence(BaseModel):
+    path: str  # e.g. "correct_answers.x" or "params.values[2]"
+    python: Any = None
+    javascript: Any = None
+    reason: str
+
+
+class ParityReport(BaseModel):
+    question_id: Optional[str] = None
+    seed: Optional[int] = None
+    isTesting: bool
+    match: bool
+    divergences: List[ParityDivergence] = []
+    python_error: Optional[str] = None
+    javascript_error: Optional[str] = None
+    python_metrics: Optional[RunMetrics] = None
+    javascript_metrics: Optional[RunMetrics] = None
+    wall_time_ms: float
+
+
+class GradeSubmission(BaseModel):
+    variant: int  # index into GradeBatchRequest.variants
+    answers: Dict[str, Any]
+
+
+class GradeBatchRequest(BaseModel):
+    # Each variant is sent once however many submissions are graded against it
+    variants: List[QuizData]
+    submissions: List[GradeSubmission]
+
+
+class GradeBatchResult(BaseModel):
+    """Columnar grades: entry i of every list belongs to submission i."""
+
+    count: int
+    score: List[float]  # fraction of the variant's answers that are correct
+    # Per answer key; None where the submission's variant has no such answer
+    correct: Dict[str, List[Optional[bool]]]
+    wall_time_ms: float
+
+
+class ColumnStats(BaseModel):
+    """Distribution of one `params`/`correct_answers` value across sampled variants."""
+
+    path: str  # e.g. "params.a" or "correct_answers.roots[1]"
+    kind: Literal["number", "other"]
+    count: int  # variants that produced this value
+    missing: int  # variants that did not
+    distinct: int
+    # Numbers only; min/max/mean/std/quantiles cover the finite values
+    non_finite: int = 0
+    zeros: int = 0
+    negatives: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    quantiles: Optional[Dict[str, float]] = None  # p5, p50, p95
+    histogram: Optional[Dict[str, List[float]]] = None  # edges, counts
+    # Other values only: the most frequent ones with their counts
+    top: Optional[List[Tuple[Any, int]]] = None
+
+
+class VariantSpaceReport(BaseModel):
+    language: Literal["python", "javascript"]
+    code_hash: str
+    seed: int  # sample i was generated with seed + i
+    samples: int
+    failures: int
+    errors: List[str] = []  # distinct errors, first few only
+    duplicates: int  # variants identical to an earlier sample
+    columns: Dict[str, ColumnStats]
+    wall_time_ms: float
+    cached: bool = False
@@ -0,0 +1,158 @@
+# --- Standard Library ---
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, List, Optional, Protocol, TypeVar
+
+# --- Internal ---
+from src.api.core import logger
+from src.code_runner.utils import hash_source
+
+T = TypeVar("T")
+
+# Files whose compiled form is kept by the runner caches
+SERVER_FILENAMES = {"server.py", "server.js"}
+
+
+class Evictable(Protocol):
+    def evict(self, code_hash: str) -> bool: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class ModuleCache(Generic[T]):
+    """
+    Thread-safe LRU cache of compiled question code keyed by the SHA-256 of its source.
+
+    Entries are evicted least-recently-used first once either `max_entries` or
+    `max_bytes` is exceeded. The byte size of an entry is approximated as the
+    size of its source plus the shallow size of the cached object.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, max_bytes: int = 64 * 1024**2):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[T, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, source: str | bytes, loader: Callable[[str | bytes], T]) -> T:
+        """
+        Return the cached object for `source`, building it with `loader` on a miss.
+
+        Args:
+            source (str | bytes): Source code of the server file.
+            loader (Callable): Builds the cached object (e.g. compiles the code) from the source.
+
+        Returns:
+            T: The cached or newly built object.
+        """
+        code_hash = hash_source(source)
+        value = self.lookup(code_hash)
+        if value is None:
+            # Build outside the lock so a slow compile does not block other questions
+            value = loader(source)
+            self.store(code_hash, source, value)
+        return value
+
+    def lookup(self, code_hash: str) -> Optional[T]:
+        """Return the entry for `code_hash` if present, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(code_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(code_hash)
+            self.hits += 1
+            return entry[0]
+
+    def store(self, code_hash: str, source: str | bytes, value: T) -> None:
+        size = len(source) + sys.getsizeof(value)
+        with self._lock:
+            if code_hash in self._entries:
+                return
+            self._entries[code_hash] = (value, size)
+            self._bytes += size
+            self._shrink()
+
+    def _shrink(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def evict(self, code_hash: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(code_hash, None)
+            if entry is None:
+                return False
+            self._bytes -= entry[1]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_CACHES: List[Evictable] = []
+
+
+def register_cache(cache: Evictable) -> Evictable:
+    """Track a cache (or worker pool) so server file writes can invalidate it."""
+    _CACHES.append(cache)
+    return cache
+
+
+def unregister_cache(cache: Evictable) -> None:
+    if cache in _CACHES:
+        _CACHES.remove(cache)
+
+
+def invalidate_server_file(filename: str, old_content: Optional[str | bytes]) -> bool:
+    """
+    Drop the compiled form of a server file that is about to be replaced.
+
+    Entries are keyed by content hash, so new content never hits a stale entry;
+    this only frees the memory held by the outdated version.
+
+    Args:
+        filename (str): Name of the file being written.
+        old_content (Optional[str | bytes]): Content currently stored for the file, if any.
+
+    Returns:
+        bool: True if any cache held the old version.
+    """
+    if filename not in SERVER_FILENAMES or not old_content:
+        return False
+    code_hash = hash_source(old_content)
+    evicted = False
+    for cache in list(_CACHES):
+        evicted = cache.evict(code_hash) or evicted
+    logger.debug(
+        "[ModuleCache] Invalidated %s (%s) evicted=%s", filename, code_hash[:12], evicted
+    )
+    return evicted
+
+
+def runner_cache_stats() -> List[Dict[str, Any]]:
+    return [cache.stats() for cache in _CACHES]
@@ -0,0 +1,200 @@
+"""
+Parity check between a question's `server.py` and `server.js`.
+
+Both runtimes run at the same time with the same inputs, and `params` and
+`correct_answers` are compared value by value. Numbers match when they agree
+to the precision the question displays (`nDigits` decimals or `sigfigs`
+significant figures, whichever is looser).
+
+Python's `random` and the JavaScript worker's seeded PRNG are different
+generators, so seeded runs only agree for generators that do not draw random
+numbers; test mode (`generate(2)`) is the default for that reason.
+
+Over a whole catalog:
+
+    python -m src.code_runner.parity questions/ --parallelism 8 -o parity.jsonl
+"""
+
+# --- Standard Library ---
+import argparse
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+# --- Internal ---
+from src.code_runner.models import (
+    CodeRunException,
+    CodeRunResponse,
+    ParityDivergence,
+    ParityReport,
+    QuizData,
+)
+from src.code_runner.runtime_switcher import run_generate
+from src.code_runner.utils import ServerFile
+
+COMPARED_FIELDS = ("params", "correct_answers")
+
+
+def numbers_match(a: float, b: float, nDigits: int, sigfigs: int) -> bool:
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    if math.isinf(a) or math.isinf(b):
+        return a == b
+    absolute = 0.5 * 10 ** (-nDigits)
+    relative = 0.5 * 10 ** (1 - sigfigs) * max(abs(a), abs(b))
+    return abs(a - b) <= max(absolute, relative)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def diff_values(
+    path: str, py: Any, js: Any, nDigits: int, sigfigs: int
+) -> Iterator[ParityDivergence]:
+    """Yield every divergence between two JSON-like values, walking dicts and lists."""
+    if isinstance(py, dict) and isinstance(js, dict):
+        for key in sorted(set(py) | set(js), key=str):
+            child = f"{path}.{key}"
+            if key not in js:
+                yield ParityDivergence(path=child, python=py[key], reason="missing in javascript")
+            elif key not in py:
+                yield ParityDivergence(path=child, javascript=js[key], reason="missing in python")
+            else:
+                yield from diff_values(child, py[key], js[key], nDigits, sigfigs)
+    elif isinstance(py, list) and isinstance(js, list):
+        if len(py) != len(js):
+            yield ParityDivergence(
+                path=path,
+                python=py,
+                javascript=js,
+                reason=f"length {len(py)} != {len(js)}",
+            )
+            return
+        for i, (a, b) in enumerate(zip(py, js)):
+            yield from diff_values(f"{path}[{i}]", a, b, nDigits, sigfigs)
+    elif _is_number(py) and _is_number(js):
+        if not numbers_match(float(py), float(js), nDigits, sigfigs):
+            yield ParityDivergence(path=path, python=py, javascript=js, reason="value")
+    elif py != js:
+        # Mixed types (e.g. "2" vs 2, or true vs 1) never match
+        yield ParityDivergence(
+            path=path,
+            python=py,
+            javascript=js,
+            reason="value" if type(py) is type(js) else "type",
+        )
+
+
+def compare_quiz_data(py: QuizData, js: QuizData) -> List[ParityDivergence]:
+    """Compare `params` and `correct_answers` at the looser precision of the two runs."""
+    nDigits = min(py.nDigits or 3, js.nDigits or 3)
+    sigfigs = min(py.sigfigs or 3, js.sigfigs or 3)
+    divergences: List[ParityDivergence] = []
+    for field in COMPARED_FIELDS:
+        divergences.extend(
+            diff_values(field, getattr(py, field), getattr(js, field), nDigits, sigfigs)
+        )
+    return divergences
+
+
+def build_parity_report(
+    py: CodeRunResponse,
+    js: CodeRunResponse,
+    seed: Optional[int],
+    isTesting: bool,
+    wall_time_ms: float,
+) -> ParityReport:
+    """Turn the two runs into a report; a failed run is reported instead of diffed."""
+    divergences: List[ParityDivergence] = []
+    if py.quiz_response is not None and js.quiz_response is not None:
+        divergences = compare_quiz_data(py.quiz_response, js.quiz_response)
+    python_error = None if py.quiz_response is not None else py.error or "No quiz data"
+    javascript_error = None if js.quiz_response is not None else js.error or "No quiz data"
+    return ParityReport(
+        seed=seed,
+        isTesting=isTesting,
+        match=not divergences and python_error is None and javascript_error is None,
+        divergences=divergences,
+        python_error=python_error,
+        javascript_error=javascript_error,
+        python_metrics=py.metrics,
+        javascript_metrics=js.metrics,
+        wall_time_ms=round(wall_time_ms, 3),
+    )
+
+
+def _run_or_error(
+    path: ServerFile, language: str, isTesting: bool, seed: Optional[int]
+) -> CodeRunResponse:
+    try:
+        return run_generate(path, language, isTesting=isTesting, seed=seed)  # type: ignore[arg-type]
+    except CodeRunException as e:
+        return e.response
+
+
+def check_parity(
+    py_file: ServerFile,
+    js_file: ServerFile,
+    seed: Optional[int] = None,
+    isTesting: bool = True,
+) -> ParityReport:
+    """Run both server files concurrently and compare their output."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="parity") as executor:
+        py_future = executor.submit(_run_or_error, py_file, "python", isTesting, seed)
+        js_future = executor.submit(_run_or_error, js_file, "javascript", isTesting, seed)
+        py, js = py_future.result(), js_future.result()
+    return build_parity_report(
+        py, js, seed, isTesting, (time.perf_counter() - start) * 1000
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare server.py and server.js output for every question under a directory."
+    )
+    parser.add_argument("root", help="Directory containing the question folders")
+    parser.add_argument("-p", "--parallelism", type=int, default=4)
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Compare seeded runs instead of test runs"
+    )
+    parser.add_argument("-o", "--output", default=None, help="JSONL report (default stdout)")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    question_dirs = sorted(
+        p.parent
+        for p in root.rglob("server.py")
+        if (p.parent / "server.js").exists()
+    )
+    isTesting = args.seed is None
+
+    def check(question_dir: Path) -> ParityReport:
+        report = check_parity(
+            question_dir / "server.py", question_dir / "server.js", args.seed, isTesting
+        )
+        report.question_id = question_dir.relative_to(root).as_posix()
+        return report
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    matched = 0
+    try:
+        with ThreadPoolExecutor(max_workers=args.parallelism) as executor:
+            for report in executor.map(check, question_dirs):
+                matched += report.match
+                out.write(report.model_dump_json() + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{matched}/{len(question_dirs)} questions match", file=sys.stderr)
+    return 0 if matched == len(question_dirs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Long-lived Python worker for the question code runner.
+
+Started by the Python `WorkerPool` as `python -m src.code_runner.py_worker` and
+speaks the same newline-delimited JSON protocol as `js_worker.js`:
+
+    request:  {"id", "op": "run" | "batch", "hash", "source"?, "evict"?: [hash],
+               "args": {"isTesting", "seed"? | "seeds", "call_args"?}}
+    response: {"id", "ok": true, "data": <CodeRunResponse> | [<CodeRunResponse>]}
+            | {"id", "ok": false, "kind", "error"}
+
+Compiled code objects stay resident keyed by content hash; every run executes the
+module body in a fresh module that is never registered in `sys.modules`.
+"""
+
+# --- Standard Library ---
+import json
+import os
+import sys
+from typing import Any, Dict, TextIO
+
+MAX_MODULES = int(os.getenv("PY_WORKER_MAX_MODULES", "64"))
+MAX_MODULE_BYTES = int(os.getenv("PY_WORKER_MAX_MODULE_BYTES", str(32 * 1024**2)))
+
+
+def to_jsonable(value: Any) -> Any:
+    """Fallback for values `json` cannot encode, e.g. numpy scalars and arrays."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class PythonWorker:
+    def __init__(self, protocol: TextIO):
+        # Imported here so anything printed at import time goes to stderr
+        from src.code_runner import run_py
+        from src.code_runner.limits import RunLimitExceeded
+        from src.code_runner.module_cache import ModuleCache
+
+        self.run_py = run_py
+        # Limits that hit outside a metered run, e.g. while compiling a module
+        self.limit_errors = (RunLimitExceeded, MemoryError)
+        self.protocol = protocol
+        self.code_objects = ModuleCache(
+            "Python worker", max_entries=MAX_MODULES, max_bytes=MAX_MODULE_BYTES
+        )
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.protocol.write(json.dumps(message, default=to_jsonable) + "\n")
+        self.protocol.flush()
+
+    def load(self, code_hash: str, source: str | None):
+        code = self.code_objects.lookup(code_hash)
+        if code is not None or source is None:
+            return code
+        code = self.run_py.compile_module_source(source)
+        self.code_objects.store(code_hash, source, code)
+        return code
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = request.get("id")
+        # The pool piggybacks invalidated hashes on the next request it sends us
+        for stale in request.get("evict") or []:
+            self.code_objects.evict(stale)
+        op = request.get("op")
+        if op not in ("run", "batch"):
+            return {
+                "id": request_id,
+                "ok": False,
+                "kind": "protocol",
+                "error": f"Unknown op '{request.get('op')}'",
+            }
+
+        code_hash = request.get("hash", "")
+        try:
+            code = self.load(code_hash, request.get("source"))
+        except ImportError as e:
+            return {"id": request_id, "ok": False, "kind": "compile", "error": str(e)}
+        if code is None:
+            return {
+                "id": request_id,
+                "ok": False,
+                "kind": "missing_source",
+                "error": f"Module {code_hash} is not loaded",
+            }
+
+        args = request.get("args") or {}
+        isTesting = bool(args.get("isTesting"))
+        call_args = args.get("call_args")
+        if op == "batch":
+            data: Any = [
+                self.run_py.run_generate_code(
+                    code, isTesting, seed, call_args
+                ).model_dump()
+                for seed in args.get("seeds") or []
+            ]
+        else:
+            data = self.run_py.run_generate_code(
+                code, isTesting, args.get("seed"), call_args
+            ).model_dump()
+        return {"id": request_id, "ok": True, "data": data}
+
+    def serve(self, stdin: TextIO) -> None:
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                self.send(
+                    {"id": None, "ok": False, "kind": "protocol", "error": str(e)}
+                )
+                continue
+            try:
+                self.send(self.handle(request))
+            except self.limit_errors as e:
+                self.send(
+                    {
+                        "id": request.get("id"),
+                        "ok": False,
+                        "kind": "limit",
+                        "error": str(e) or "Question code exceeded its memory limit.",
+                    }
+                )
+            except Exception as e:
+                self.send(
+                    {
+                        "id": request.get("id"),
+                        "ok": False,
+                        "kind": "runtime",
+                        "error": str(e),
+                    }
+                )
+
+
+def main() -> None:
+    # Keep the real stdout for the protocol and send every other write to stderr,
+    # so stray prints (including C-level ones) cannot corrupt a response line.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    worker = PythonWorker(protocol)
+    # Limits apply to user code only, so they are set after the runner is imported
+    from src.api.core.config import get_settings
+    from src.code_runner.limits import enter_sandbox, run_time_budget
+
+    settings = get_settings()
+    enter_sandbox(
+        cpu_seconds=settings.RUNNER_MAX_CPU_SECONDS,
+        memory_bytes=settings.RUNNER_MAX_MEMORY_MB * 1024**2,
+        # Per variant, so a batch call is bounded by its variants rather than its size
+        wall_seconds=run_time_budget(settings.PY_WORKER_TIMEOUT),
+    )
+    worker.serve(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
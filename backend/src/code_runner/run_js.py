@@ -1,6 +1,7 @@
 # --- Standard Library ---
+import threading
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Union
 
 # --- Third-Party ---
 from pydantic import ValidationError
@@ -8,19 +9,100 @@ from starlette import status
 
 # --- Internal ---
 from src.api.core import logger
-from src.code_runner.models import CodeRunResponse, QuizData, CodeRunException
+from src.code_runner.models import (
+    CodeRunResponse,
+    QuizData,
+    CodeRunException,
+    RunMetrics,
+    ServerSource,
+)
+from src.code_runner.limits import batch_timeout, run_time_budget
 from src.code_runner.utils import *
+from src.code_runner.module_cache import ModuleCache, register_cache
+from src.code_runner.worker_pool import WorkerPool, register_pool
+from src.api.core.config import get_settings
 from .utils import *
 
+JS_WORKER_SCRIPT = Path(__file__).with_name("js_worker.js")
+
+# Compiled execjs contexts keyed by the hash of the user's server.js
+JS_CONTEXT_CACHE: ModuleCache[Any] = register_cache(
+    ModuleCache(
+        "JavaScript execjs",
+        max_entries=get_settings().RUNNER_CACHE_MAX_ENTRIES,
+        max_bytes=get_settings().RUNNER_CACHE_MAX_BYTES,
+    )
+)  # type: ignore[assignment]
+
+
+def build_javascript_response(raw: Dict[str, Any], isTesting: bool) -> CodeRunResponse:
+    """
+    Validate the `{ result, logs, metrics? }` object returned by a JavaScript run.
+
+    Args:
+        raw (Dict[str, Any]): Raw object returned from the JavaScript runtime.
+        isTesting (bool): Whether the execution is in test mode.
+
+    Returns:
+        CodeRunResponse: Success response containing validated QuizData.
+
+    Raises:
+        CodeRunException: If the result is missing, malformed, or a test failed.
+    """
+    js_result: Any = raw.get("result")
+    logs: list[str] = raw.get("logs", [])
+
+    # Ensure result exists
+    if js_result is None:
+        raise CodeRunException(
+            error=(
+                "Missing `result` in JavaScript return object. "
+                "Nothing was returned from the JavaScript code."
+            ),
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    logger.debug("Raw JavaScript Results: %s", js_result)
+    logger.debug("Captured logs: %s", logs)
+
+    # Ensure result type
+    if not isinstance(js_result, dict):
+        raise CodeRunException(
+            error=(
+                f"Expected JavaScript result to be of type dict, "
+                f"but received {type(js_result).__name__}"
+            ),
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    # Construct payload
+    payload: Dict[str, Any] = {**js_result, "logs": logs}
+
+    # Validate test metadata if in test mode
+    if isTesting:
+        test_meta: Dict[str, Any] = js_result.get("test_results", {})
+        validate_test_result_structure(test_meta)
+
+    # Validate against QuizData schema
+    quiz_data = QuizData(**payload)
+
+    return CodeRunResponse(
+        success=True,
+        error=None,
+        quiz_response=quiz_data,
+        http_status_code=status.HTTP_200_OK,
+        metrics=RunMetrics(**raw["metrics"]) if raw.get("metrics") else None,
+    )
+
 
 def execute_javascript(
-    path: Union[str, Path], isTesting: bool = False
+    path: ServerFile, isTesting: bool = False
 ) -> CodeRunResponse:
     """
     Execute a JavaScript file, validate its structure, and return a CodeRunResponse.
 
     Args:
-        path (Union[str, Path]): Path to the JavaScript file (.js or .mjs).
+        path (ServerFile): Path to the JavaScript file (.js or .mjs), or its contents.
         isTesting (bool): Whether the execution is in test mode.
 
     Returns:
@@ -30,66 +112,216 @@ def execute_javascript(
         CodeRunException: For validation, runtime, or schema errors.
     """
     try:
-        # Validate input file path
-        file_path = validate_filepath(path, extensions=[".mjs", ".js"])
-
-        # Read and wrap JS with logging + shim
-        js_code = append_javascript_logs(file_path)
-
-        # Compile JS
-        ctx = compile_js_code(js_code)
+        # Wrap JS with logging + shim and compile it, reusing the context for known source
+        source = read_server_source(path, extensions=[".mjs", ".js"])
+        ctx = JS_CONTEXT_CACHE.get_or_load(
+            source, lambda s: compile_js_code(wrap_javascript_logs(s))
+        )
 
-        # Ensure `generate` function exists
-        validate_generate_function_js(ctx)
+        # Ensure `generate` function exists, unless upload-time analysis already did
+        analysis = path.analysis if isinstance(path, ServerSource) else None
+        if analysis is None or not analysis.valid:
+            validate_generate_function_js(ctx)
 
         # Run JS and extract results
         raw = run_javascript(ctx, isTesting)
         logger.info("Ran JavaScript successfully")
 
-        js_result: Any = raw.get("result")
-        logs: list[str] = raw.get("logs", [])
-
-        # Ensure result exists
-        if js_result is None:
-            raise CodeRunException(
-                error=(
-                    "Missing `result` in JavaScript return object. "
-                    "Nothing was returned from the JavaScript code."
-                ),
-                http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            )
+        return build_javascript_response(raw, isTesting)
+
+    except CodeRunException:
+        raise
+
+    except ValidationError as e:
+        raise CodeRunException(
+            error=f"Result did not match QuizData schema: {e}",
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
 
-        logger.debug("Raw JavaScript Results: %s", js_result)
-        logger.debug("Captured logs: %s", logs)
-
-        # Ensure result type
-        if not isinstance(js_result, dict):
-            raise CodeRunException(
-                error=(
-                    f"Expected JavaScript result to be of type dict, "
-                    f"but received {type(js_result).__name__}"
-                ),
-                http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    except Exception as e:
+        raise CodeRunException(
+            error=f"Unexpected error during JavaScript execution: {e}",
+            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+_js_pool: Optional[WorkerPool] = None
+_js_pool_lock = threading.Lock()
+
+
+def get_js_worker_pool() -> WorkerPool:
+    """Return the process-wide Node.js worker pool, creating it on first use."""
+    global _js_pool
+    with _js_pool_lock:
+        if _js_pool is None or _js_pool.closed:
+            settings = get_settings()
+            _js_pool = register_pool(
+                WorkerPool(
+                    name="JavaScript",
+                    command=[
+                        "node",
+                        f"--max-old-space-size={settings.RUNNER_MAX_MEMORY_MB}",
+                        str(JS_WORKER_SCRIPT),
+                    ],
+                    size=settings.JS_WORKER_POOL_SIZE,
+                    timeout=settings.JS_WORKER_TIMEOUT,
+                    max_runs=settings.JS_WORKER_MAX_RUNS,
+                    max_queue=settings.JS_WORKER_MAX_QUEUE,
+                    env={
+                        "JS_WORKER_MAX_MODULES": str(settings.RUNNER_CACHE_MAX_ENTRIES),
+                        "JS_WORKER_MAX_MODULE_BYTES": str(settings.RUNNER_CACHE_MAX_BYTES),
+                        # Node cannot cap CPU per run; the vm timeout stops runaway
+                        # loops, well before the pool gives up on the worker
+                        "JS_WORKER_RUN_TIMEOUT_MS": str(
+                            int(
+                                run_time_budget(
+                                    settings.JS_WORKER_TIMEOUT,
+                                    settings.RUNNER_MAX_CPU_SECONDS,
+                                )
+                                * 1000
+                            )
+                        ),
+                        "JS_WORKER_MAX_LOG_BYTES": str(settings.RUNNER_MAX_LOG_BYTES),
+                    },
+                )
             )
+        return _js_pool
+
 
-        # Construct payload
-        payload: Dict[str, Any] = {**js_result, "logs": logs}
+# Worker error kinds -> (message prefix, status code)
+JS_WORKER_ERRORS = {
+    "compile": ("JavaScript compile error", status.HTTP_422_UNPROCESSABLE_ENTITY),
+    "missing_generate": (None, status.HTTP_422_UNPROCESSABLE_ENTITY),
+    "runtime": ("JavaScript runtime error", status.HTTP_500_INTERNAL_SERVER_ERROR),
+    "limit": (None, status.HTTP_422_UNPROCESSABLE_ENTITY),
+}
 
-        # Validate test metadata if in test mode
-        if isTesting:
-            test_meta: Dict[str, Any] = js_result.get("test_results", {})
-            validate_test_result_structure(test_meta)
 
-        # Validate against QuizData schema
-        quiz_data = QuizData(**payload)
+def raise_for_worker_error(response: Dict[str, Any]) -> None:
+    """Translate a failed Node.js worker response into a CodeRunException."""
+    if response.get("ok"):
+        return
+    prefix, status_code = JS_WORKER_ERRORS.get(
+        response.get("kind", ""),
+        ("Unexpected error during JS execution", 500),
+    )
+    error = response.get("error", "Unknown worker error")
+    raise CodeRunException(
+        error=f"{prefix}: {error}" if prefix else error,
+        http_status_code=status_code,
+    )
 
+
+def build_variant_response(raw: Dict[str, Any], isTesting: bool) -> CodeRunResponse:
+    """
+    The response for one variant of a batch. Like the Python batch runners, a
+    variant that failed gets a failed response in its slot instead of failing
+    the whole batch.
+    """
+    try:
+        if raw.get("ok") is False:
+            raise_for_worker_error(raw)
+        return build_javascript_response(raw, isTesting)
+    except CodeRunException as e:
+        return e.response
+    except ValidationError as e:
         return CodeRunResponse(
-            success=True,
-            error=None,
-            quiz_response=quiz_data,
-            http_status_code=status.HTTP_200_OK,
+            success=False,
+            error=f"Result did not match QuizData schema: {e}",
+            quiz_response=None,
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
+
+def execute_javascript_pooled(
+    path: ServerFile, isTesting: bool = False, seed: Optional[int] = None
+) -> CodeRunResponse:
+    """
+    Execute a JavaScript file on the persistent Node.js worker pool.
+
+    Behaves like `execute_javascript`, but the code runs on a long-lived Node
+    process that keeps the compiled module resident between calls instead of
+    spawning a new runtime per request.
+
+    Args:
+        path (ServerFile): Path to the JavaScript file (.js or .mjs), or its contents.
+        isTesting (bool): Whether the execution is in test mode.
+        seed (Optional[int]): Seed for `Math.random`; unseeded when omitted.
+
+    Returns:
+        CodeRunResponse: Success response containing validated QuizData.
+
+    Raises:
+        CodeRunException: For validation, runtime, timeout, or schema errors.
+    """
+    try:
+        source = read_server_source(path, extensions=[".mjs", ".js"])
+
+        response = get_js_worker_pool().run(
+            source, args={"arg": 2 if isTesting else None, "seed": seed}
+        )
+        raise_for_worker_error(response)
+        logger.info("Ran JavaScript successfully on worker pool")
+
+        return build_javascript_response(response.get("data") or {}, isTesting)
+
+    except CodeRunException:
+        raise
+
+    except ValidationError as e:
+        raise CodeRunException(
+            error=f"Result did not match QuizData schema: {e}",
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    except Exception as e:
+        raise CodeRunException(
+            error=f"Unexpected error during JavaScript execution: {e}",
+            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def execute_javascript_pooled_batch(
+    path: ServerFile, seeds: List[int], isTesting: bool = False
+) -> List[CodeRunResponse]:
+    """
+    Execute a JavaScript file once per seed in a single worker call.
+
+    Each variant runs in a fresh context whose `Math.random` is replaced by a
+    PRNG seeded with that variant's seed, so a seed always yields the same variant.
+
+    Args:
+        path (ServerFile): Path to the JavaScript file (.js or .mjs), or its contents.
+        seeds (List[int]): One seed per variant to generate.
+        isTesting (bool): Whether the execution is in test mode.
+
+    Returns:
+        List[CodeRunResponse]: One response per seed, in order; a variant that
+            failed validation or its limits has a failed response.
+
+    Raises:
+        CodeRunException: If the file cannot be run at all, or on a timeout.
+    """
+    try:
+        source = read_server_source(path, extensions=[".mjs", ".js"])
+
+        pool = get_js_worker_pool()
+        response = pool.run(
+            source,
+            args={"arg": 2 if isTesting else None, "seeds": list(seeds)},
+            timeout=batch_timeout(
+                pool.timeout, len(seeds), get_settings().RUNNER_HARD_TIMEOUT
+            ),
+            op="batch",
+        )
+        raise_for_worker_error(response)
+        logger.info("Ran %s JavaScript variants on worker pool", len(seeds))
+
+        return [
+            build_variant_response(raw or {}, isTesting)
+            for raw in response.get("data") or []
+        ]
+
     except CodeRunException:
         raise
 
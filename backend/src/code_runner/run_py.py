@@ -1,18 +1,45 @@
 # Stdlib
+import builtins
 import importlib.util
-import inspect
-import io
+import os
+import random
+import sys
+import threading
 import types
-from contextlib import redirect_stdout
-from typing import Any
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
 
 # Third-party
 from pydantic import ValidationError
 from starlette import status
 
 # Internal
-from src.code_runner.models import CodeRunResponse, QuizData
-from .utils import normalize_path
+from src.api.core.config import get_settings
+from src.code_runner.generate_call import call_generate
+from src.code_runner.limits import (
+    RunLimitExceeded,
+    batch_timeout,
+    in_sandbox,
+    metered_run,
+)
+from src.code_runner.models import CodeRunResponse, QuizData, RunMetrics, ServerSource
+from src.code_runner.module_cache import ModuleCache, register_cache
+from src.code_runner.static_analysis import known_generate_args
+from src.code_runner.worker_pool import WorkerPool, register_pool
+from .utils import ServerFile, normalize_path, server_filename
+
+# Workers run `python -m src.code_runner.py_worker` from the backend directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Compiled code objects for the in-process runner. Modules are still executed fresh
+# on every run, so module-level state never carries over between variants.
+PY_CODE_CACHE: ModuleCache[types.CodeType] = register_cache(
+    ModuleCache(
+        "Python in-process",
+        max_entries=get_settings().RUNNER_CACHE_MAX_ENTRIES,
+        max_bytes=get_settings().RUNNER_CACHE_MAX_BYTES,
+    )
+)  # type: ignore[assignment]
 
 
 def import_module_from_path(path: str, module_name: str = "generate") -> Any:
@@ -40,13 +67,52 @@ def import_module_from_path(path: str, module_name: str = "generate") -> Any:
     return module
 
 
-def run_generate_py(path: str, isTesting: bool = False) -> "CodeRunResponse":
+def compile_module_source(source: str, filename: str = "server.py") -> types.CodeType:
     """
-    Import a Python module from the given file path and run its `generate` function.
-    When isTesting=True, call `generate(2)` and expect `result['test_results']['pass']`.
-    Validate the final payload against QuizData.
+    Compile Python source into a code object without executing it.
+
+    Raises:
+        ImportError: If the source has a syntax error.
+    """
+    try:
+        return compile(source, filename, "exec")
+    except SyntaxError as e:
+        raise ImportError(f"Syntax error in '{filename}': {e}")
+
+
+def exec_module_code(
+    code: types.CodeType,
+    module_name: str = "generate",
+    imports: Optional[Dict[str, types.ModuleType]] = None,
+) -> Any:
+    """
+    Execute a compiled code object in a fresh module that is not added to `sys.modules`.
+    `imports` replaces the modules the code gets for those (absolute) import names.
+
+    Raises:
+        ImportError: If executing the module body fails.
+    """
+    module = types.ModuleType(module_name)
+    module.__file__ = code.co_filename
+    if imports:
+        module.__dict__["__builtins__"] = {
+            **builtins.__dict__,
+            "__import__": overriding_import(imports),
+        }
+    try:
+        exec(code, module.__dict__)
+    except Exception as e:
+        raise ImportError(f"Error executing module '{code.co_filename}': {e}")
+    return module
+
+
+def check_python_path(path: str | Path) -> "Path | CodeRunResponse":
+    """
+    Validate that `path` points to an existing `.py` file.
+
+    Returns:
+        Path | CodeRunResponse: The normalized path, or a failed response describing the problem.
     """
-    # ---- Path validation ----
     try:
         p = normalize_path(path)
     except ValueError as e:
@@ -77,25 +143,221 @@ def run_generate_py(path: str, isTesting: bool = False) -> "CodeRunResponse":
             quiz_response=None,
             http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
         )
+    return p
+
 
-    # ---- Import module ----
+def read_python_source(path: ServerFile) -> "str | CodeRunResponse":
+    """
+    Validate `path` and read the Python source it points to. In-memory sources are
+    only checked for their extension and decoded.
+
+    Returns:
+        str | CodeRunResponse: The source, or a failed response describing the problem.
+    """
+    if isinstance(path, ServerSource):
+        suffix = Path(path.filename).suffix
+        if suffix.lower() != ".py":
+            return CodeRunResponse(
+                success=False,
+                error=f"Unsupported file extension '{suffix}'. Expected .py.",
+                quiz_response=None,
+                http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+    else:
+        p = check_python_path(path)
+        if isinstance(p, CodeRunResponse):
+            return p
     try:
-        module = import_module_from_path(str(p))
-    except ImportError as e:
+        if isinstance(path, ServerSource):
+            return path.content.decode("utf-8")
+        return p.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
         return CodeRunResponse(
             success=False,
-            error=f"Import error: {e}",
+            error=f"Could not read Python file: {e}",
             quiz_response=None,
-            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            http_status_code=status.HTTP_400_BAD_REQUEST,
         )
-    except Exception as e:
+
+
+def load_python_code(path: ServerFile) -> "types.CodeType | CodeRunResponse":
+    """
+    Read and compile a Python question file, reusing the cached code object if the
+    same source was compiled before.
+
+    Returns:
+        types.CodeType | CodeRunResponse: The code object, or a failed response.
+    """
+    source = read_python_source(path)
+    if isinstance(source, CodeRunResponse):
+        return source
+    try:
+        return PY_CODE_CACHE.get_or_load(
+            source, lambda s: compile_module_source(s, server_filename(path))
+        )
+    except ImportError as e:
         return CodeRunResponse(
             success=False,
-            error=f"Unexpected error importing module: {e}",
+            error=f"Import error: {e}",
             quiz_response=None,
             http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
+
+def overriding_import(imports: Dict[str, types.ModuleType]):
+    """An `__import__` that returns the modules in `imports` instead of the real ones."""
+
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in imports:
+            # `import a.b` binds the top-level package, `from a.b import c` the submodule
+            if fromlist or "." not in name:
+                return imports[name]
+            return imports.get(name.partition(".")[0]) or builtins.__import__(name)
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    return _import
+
+
+def _with_generator(
+    name: str, module: types.ModuleType, shared: Any, generator: Any
+) -> types.ModuleType:
+    """Copy of `module` whose functions bound to `shared` are bound to `generator` instead."""
+    copy = types.ModuleType(name)
+    copy.__dict__.update(module.__dict__)
+    for attr, value in module.__dict__.items():
+        if getattr(value, "__self__", None) is shared:
+            copy.__dict__[attr] = getattr(generator, attr)
+    return copy
+
+
+def seeded_modules(seed: int) -> Dict[str, types.ModuleType]:
+    """
+    `random` and `numpy` for one run in a shared process, backed by generators of
+    their own seeded with `seed`. Concurrent in-process runs then never reseed or
+    draw from each other's generators. Modules the question imports in turn still
+    use the global generators, so only their own draws are reproducible.
+    """
+    imports = {
+        "random": _with_generator(
+            "random", random, random._inst, random.Random(seed)  # type: ignore[attr-defined]
+        )
+    }
+    try:
+        import numpy as np
+    except ImportError:
+        return imports
+    np_random = _with_generator(
+        "numpy.random",
+        np.random,
+        np.random.mtrand._rand,
+        np.random.RandomState(seed % 2**32),
+    )
+    numpy = types.ModuleType("numpy")
+    numpy.__dict__.update(np.__dict__)
+    numpy.random = np_random  # type: ignore[attr-defined]
+    imports.update({"numpy": numpy, "numpy.random": np_random})
+    return imports
+
+
+def seed_random(seed: int) -> None:
+    """
+    Seed `random` and numpy's global generator so a variant can be reproduced.
+    Only for processes that run one question at a time (see `in_sandbox`).
+    """
+    random.seed(seed)
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    np.random.seed(seed % 2**32)
+
+
+def run_generate_code(
+    code: types.CodeType,
+    isTesting: bool = False,
+    seed: Optional[int] = None,
+    call_args: Optional[Sequence[Any]] = None,
+) -> "CodeRunResponse":
+    """
+    Execute compiled question code in a fresh module and run its `generate` function.
+    When `seed` is given, the random generators are seeded before the module body runs:
+    the global ones in a sandboxed process, and private ones (`seeded_modules`) in a
+    process shared by concurrent runs. `call_args` are the arguments for `generate`
+    when they are already known from static analysis. The response carries the run's
+    metrics; in sandboxed processes CPU-time, wall-time and memory limits end the run
+    with a 422.
+    """
+    imports = None
+    if seed is not None:
+        if in_sandbox():
+            seed_random(seed)
+        else:
+            imports = seeded_modules(seed)
+    with metered_run() as metrics:
+        try:
+            module = exec_module_code(code, imports=imports)
+            response = run_generate_module(module, isTesting, call_args)
+        except ImportError as e:
+            response = CodeRunResponse(
+                success=False,
+                error=f"Import error: {e}",
+                quiz_response=None,
+                http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        except (RunLimitExceeded, MemoryError) as e:
+            response = CodeRunResponse(
+                success=False,
+                error=(
+                    str(e)
+                    if isinstance(e, RunLimitExceeded)
+                    else "Question code exceeded its memory limit."
+                ),
+                quiz_response=None,
+                http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+    response.metrics = RunMetrics(**metrics)
+    return response
+
+
+def run_generate_py(
+    path: ServerFile, isTesting: bool = False, seed: Optional[int] = None
+) -> "CodeRunResponse":
+    """
+    Import a Python module from the given file path and run its `generate` function.
+    When isTesting=True, call `generate(2)` and expect `result['test_results']['pass']`.
+    When `seed` is given, `random` and numpy are seeded so the variant is reproducible.
+    Validate the final payload against QuizData.
+    """
+    code = load_python_code(path)
+    if isinstance(code, CodeRunResponse):
+        return code
+    return run_generate_code(code, isTesting, seed, known_generate_args(path, isTesting))
+
+
+def run_generate_py_batch(
+    path: ServerFile, seeds: List[int], isTesting: bool = False
+) -> List["CodeRunResponse"]:
+    """
+    Compile a Python question file once and run `generate` once per seed.
+
+    Every variant executes the module body in a fresh module, so variants only
+    differ by their seed. If the file cannot be loaded, a single failed response
+    is returned.
+    """
+    code = load_python_code(path)
+    if isinstance(code, CodeRunResponse):
+        return [code]
+    call_args = known_generate_args(path, isTesting)
+    return [run_generate_code(code, isTesting, seed, call_args) for seed in seeds]
+
+
+def run_generate_module(
+    module: Any, isTesting: bool = False, call_args: Optional[Sequence[Any]] = None
+) -> "CodeRunResponse":
+    """
+    Run the `generate` function of an already imported module and validate the result.
+    When isTesting=True, call `generate(2)` and expect `result['test_results']['pass']`.
+    """
     # ---- Locate generate() ----
     generate = getattr(module, "generate", None)
     if not callable(generate):
@@ -107,29 +369,13 @@ def run_generate_py(path: str, isTesting: bool = False) -> "CodeRunResponse":
         )
 
     # ---- Call generate() ----
-    # Match JS behavior: when testing, pass 2; otherwise no arguments if possible.
-    # If the signature requires an arg, pass 0 in non-testing mode.
-    try:
-        sig = inspect.signature(generate)
-        if isTesting:
-            args: tuple[Any, ...] = (2,) if len(sig.parameters) >= 1 else ()
-        else:
-            # Prefer zero args; if at least one required positional param exists, pass 0
-            requires_positional = any(
-                p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
-                and p.default is p.empty
-                for p in sig.parameters.values()
-            )
-            args = (0,) if requires_positional else ()
-    except Exception:
-        # If introspection fails, fall back to JS-like behavior
-        args = (2,) if isTesting else ()
-
     try:
-        f = io.StringIO()
-        with redirect_stdout(f):
-            result = generate(*args)
-        captured = f.getvalue().splitlines()  # This is the print statements
+        result, captured = call_generate(
+            generate, isTesting, get_settings().RUNNER_MAX_LOG_BYTES, call_args
+        )
+    except MemoryError:
+        # Reported by `run_generate_code` as a memory-limit failure
+        raise
     except Exception as e:
         return CodeRunResponse(
             success=False,
@@ -138,6 +384,13 @@ def run_generate_py(path: str, isTesting: bool = False) -> "CodeRunResponse":
             http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
+    return validate_generate_result(result, captured, isTesting)
+
+
+def validate_generate_result(
+    result: Any, captured: List[str], isTesting: bool = False
+) -> "CodeRunResponse":
+    """Check the value returned by `generate` (and test results) against QuizData."""
     # ---- Test-mode semantics
     if isTesting:
         # Expect dict-like result with test_results.pass
@@ -212,6 +465,127 @@ def run_generate_py(path: str, isTesting: bool = False) -> "CodeRunResponse":
     )
 
 
+_py_pool: Optional[WorkerPool] = None
+_py_pool_lock = threading.Lock()
+
+
+def get_py_worker_pool() -> WorkerPool:
+    """Return the process-wide Python worker pool, creating it on first use."""
+    global _py_pool
+    with _py_pool_lock:
+        if _py_pool is None or _py_pool.closed:
+            settings = get_settings()
+            _py_pool = register_pool(
+                WorkerPool(
+                    name="Python",
+                    command=[sys.executable, "-m", "src.code_runner.py_worker"],
+                    size=settings.PY_WORKER_POOL_SIZE or os.cpu_count() or 1,
+                    timeout=settings.PY_WORKER_TIMEOUT,
+                    max_runs=settings.PY_WORKER_MAX_RUNS,
+                    max_queue=settings.PY_WORKER_MAX_QUEUE,
+                    cwd=PROJECT_ROOT,
+                    env={
+                        "PY_WORKER_MAX_MODULES": str(settings.RUNNER_CACHE_MAX_ENTRIES),
+                        "PY_WORKER_MAX_MODULE_BYTES": str(settings.RUNNER_CACHE_MAX_BYTES),
+                        # One BLAS thread per worker keeps the address-space limit meaningful
+                        "OPENBLAS_NUM_THREADS": "1",
+                        "OMP_NUM_THREADS": "1",
+                    },
+                )
+            )
+        return _py_pool
+
+
+def run_generate_py_pooled(
+    path: ServerFile, isTesting: bool = False, seed: Optional[int] = None
+) -> "CodeRunResponse":
+    """
+    Run a Python question file on the out-of-process worker pool.
+
+    The source is sent to a pre-forked worker that compiles it, calls `generate`
+    with its own stdout capture and returns the serialized `CodeRunResponse`, so
+    user code never runs inside the API process.
+
+    Raises:
+        CodeRunException: If the pool is saturated, the run times out, or a worker crashes.
+    """
+    source = read_python_source(path)
+    if isinstance(source, CodeRunResponse):
+        return source
+
+    response = get_py_worker_pool().run(
+        source,
+        args={
+            "isTesting": isTesting,
+            "seed": seed,
+            "call_args": known_generate_args(path, isTesting),
+        },
+    )
+    if not response.get("ok"):
+        return worker_error_response(response)
+    return CodeRunResponse.model_validate(response["data"])
+
+
+def run_generate_py_pooled_batch(
+    path: ServerFile, seeds: List[int], isTesting: bool = False
+) -> List["CodeRunResponse"]:
+    """
+    Run `generate` once per seed on a single pooled worker.
+
+    The source is sent (at most) once and every variant is produced inside the
+    same worker call. Every variant is limited by itself inside the worker, and
+    the call as a whole by the pool timeout per variant up to RUNNER_HARD_TIMEOUT.
+
+    Raises:
+        CodeRunException: If the pool is saturated, the run times out, or a worker crashes.
+    """
+    source = read_python_source(path)
+    if isinstance(source, CodeRunResponse):
+        return [source]
+
+    pool = get_py_worker_pool()
+    response = pool.run(
+        source,
+        args={
+            "isTesting": isTesting,
+            "seeds": list(seeds),
+            "call_args": known_generate_args(path, isTesting),
+        },
+        timeout=batch_timeout(
+            pool.timeout, len(seeds), get_settings().RUNNER_HARD_TIMEOUT
+        ),
+        op="batch",
+    )
+    if not response.get("ok"):
+        return [worker_error_response(response)]
+    return [CodeRunResponse.model_validate(item) for item in response["data"]]
+
+
+# Error prefix and HTTP status for each failure `kind` a Python worker reports
+PY_WORKER_ERRORS = {
+    "compile": ("Import error", status.HTTP_500_INTERNAL_SERVER_ERROR),
+    "missing_source": ("Python worker error", status.HTTP_500_INTERNAL_SERVER_ERROR),
+    "protocol": ("Python worker protocol error", status.HTTP_500_INTERNAL_SERVER_ERROR),
+    "runtime": ("Error executing 'generate'", status.HTTP_500_INTERNAL_SERVER_ERROR),
+    "limit": (None, status.HTTP_422_UNPROCESSABLE_ENTITY),
+}
+
+
+def worker_error_response(response: dict[str, Any]) -> "CodeRunResponse":
+    """Translate a failed Python worker response into a failed CodeRunResponse."""
+    prefix, status_code = PY_WORKER_ERRORS.get(
+        response.get("kind", ""),
+        ("Unexpected error during Python execution", 500),
+    )
+    error = response.get("error", "Unknown worker error")
+    return CodeRunResponse(
+        success=False,
+        error=f"{prefix}: {error}" if prefix else error,
+        quiz_response=None,
+        http_status_code=status_code,
+    )
+
+
 def test():
     path = r"code_runner\test.py"
     print(run_generate_py(path, isTesting=True))
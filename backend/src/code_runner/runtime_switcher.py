@@ -1,41 +1,126 @@
-from .run_js import execute_javascript as execute_js
-from .run_py import run_generate_py as execute_py
+from .run_js import execute_javascript_pooled as execute_js
+from .run_js import execute_javascript_pooled_batch as execute_js_batch
+from .forkserver import run_generate_py_forked, run_generate_py_forked_batch
+from .subinterpreters import (
+    run_generate_py_subinterpreter,
+    run_generate_py_subinterpreter_batch,
+)
+from .run_py import (
+    run_generate_py,
+    run_generate_py_batch,
+    run_generate_py_pooled,
+    run_generate_py_pooled_batch,
+)
 from pathlib import Path
-from typing import Literal, TypeAlias
+from typing import Literal, Optional, TypeAlias
 from pydantic import BaseModel
 from typing import Callable
 from pydantic import BaseModel, Field
-from .utils import validate_filepath
-from .models import CodeRunException, CodeRunResponse
+from .utils import ServerFile, hash_source, server_filename, validate_server_file
+from .models import CodeRunException, CodeRunResponse, ServerSource
+from .variant_cache import VARIANT_CACHE
 from src.api.core import logger
+from src.api.core.config import get_settings
 
-RunnerFunc: TypeAlias = Callable[[str, bool], CodeRunResponse]
+RunnerFunc: TypeAlias = Callable[[ServerFile, bool, Optional[int]], CodeRunResponse]
+BatchRunnerFunc: TypeAlias = Callable[
+    [ServerFile, list[int], bool], list[CodeRunResponse]
+]
 
 
 class Generator(BaseModel):
     runner: RunnerFunc = Field(
         ..., description="Function that executes code for this runtime"
     )
+    batch_runner: BatchRunnerFunc = Field(
+        ..., description="Function that executes code once per seed for this runtime"
+    )
     extensions: list[str] = Field(
         ..., description="Supported file extensions for this runtime"
     )
 
 
+settings = get_settings()
+
+# Python execution backends selectable through PY_EXECUTION_BACKEND
+PYTHON_RUNNERS: dict[str, RunnerFunc] = {
+    "inprocess": run_generate_py,
+    "pool": run_generate_py_pooled,
+    "forkserver": run_generate_py_forked,
+    "subinterpreter": run_generate_py_subinterpreter,
+}
+PYTHON_BATCH_RUNNERS: dict[str, BatchRunnerFunc] = {
+    "inprocess": run_generate_py_batch,
+    "pool": run_generate_py_pooled_batch,
+    "forkserver": run_generate_py_forked_batch,
+    "subinterpreter": run_generate_py_subinterpreter_batch,
+}
+
 GENERATOR_MAPPING = {
-    "python": Generator(runner=execute_py, extensions=[".py"]),
-    "javascript": Generator(runner=execute_js, extensions=[".mjs", ".js"]),
+    "python": Generator(
+        runner=PYTHON_RUNNERS[settings.PY_EXECUTION_BACKEND],
+        batch_runner=PYTHON_BATCH_RUNNERS[settings.PY_EXECUTION_BACKEND],
+        extensions=[".py"],
+    ),
+    "javascript": Generator(
+        runner=execute_js, batch_runner=execute_js_batch, extensions=[".mjs", ".js"]
+    ),
 }
 
 
+def server_file_hash(path: ServerFile) -> Optional[str]:
+    """Content hash used to key memoized variants, or None if the file cannot be read."""
+    if isinstance(path, ServerSource):
+        return hash_source(path.content)
+    try:
+        return hash_source(Path(path).read_bytes())
+    except OSError:
+        return None
+
+
+def runner_target(path: ServerFile) -> ServerFile:
+    """What runners receive: in-memory sources as-is, paths normalized to POSIX strings."""
+    if isinstance(path, ServerSource):
+        return path
+    return Path(path).as_posix()
+
+
+def is_pre_analyzed(path: ServerFile) -> bool:
+    """
+    Whether `path` carries a passing upload-time analysis, so it needs no validation.
+
+    Raises:
+        CodeRunException: 422 if the analysis found the file broken.
+    """
+    if not isinstance(path, ServerSource) or path.analysis is None:
+        return False
+    if not path.analysis.valid:
+        raise CodeRunException(
+            error=path.analysis.error or "Server file failed static analysis.",
+            http_status_code=422,
+        )
+    return True
+
+
 def run_generate(
-    path: str | Path,
+    path: ServerFile,
     language: Literal["python", "javascript"],
     isTesting: bool = False,
+    seed: Optional[int] = None,
 ):
-    """Run code generation for a given language and path with logging."""
-    path = Path(path)
+    """
+    Run code generation for a given language and path with logging.
+
+    `path` may also be a `ServerSource`, in which case the contents are executed
+    directly and nothing is read from disk. A source analyzed at upload skips
+    validation, or is rejected straight away if the analysis failed.
+
+    Seeded, non-testing runs are memoized by (file hash, language, seed), so
+    re-rendering the same variant does not execute user code again.
+    """
+    name = server_filename(path)
     logger.debug(
-        f"[Runtime Switcher] Starting execution | language={language} | path='{path}' | testing={isTesting}"
+        f"[Runtime Switcher] Starting execution | language={language} | path='{name}' | testing={isTesting}"
     )
 
     try:
@@ -43,21 +128,33 @@ def run_generate(
         runner = generator.runner
         valid_extensions = generator.extensions
 
-        logger.debug(
-            f"[Runtime Switcher] Validating file path '{path}' with extensions {valid_extensions}"
-        )
-        validate_filepath(path, extensions=valid_extensions)
+        if not is_pre_analyzed(path):
+            logger.debug(
+                f"[Runtime Switcher] Validating file path '{name}' with extensions {valid_extensions}"
+            )
+            validate_server_file(path, extensions=valid_extensions)
+
+        code_hash = server_file_hash(path) if seed is not None and not isTesting else None
+        if code_hash is not None:
+            cached = VARIANT_CACHE.get(code_hash, language, seed)  # type: ignore[arg-type]
+            if cached is not None:
+                logger.debug(f"[Runtime Switcher] Variant cache hit | seed={seed}")
+                return CodeRunResponse(
+                    success=True, quiz_response=cached, http_status_code=200
+                )
 
         # Normalize path just in case
-        posix_path = path.as_posix()
+        target = runner_target(path)
         logger.info(
-            f"[Runtime Switcher] Executing {language.upper()} runner on '{posix_path}'"
+            f"[Runtime Switcher] Executing {language.upper()} runner on '{name}'"
         )
 
-        result = runner(posix_path, isTesting)
+        result = runner(target, isTesting, seed)
         logger.debug(
-            f"[Runtime Switcher] Execution completed successfully for {language}"
+            f"[Runtime Switcher] Execution completed for {language} | metrics={result.metrics}"
         )
+        if code_hash is not None and result.success and result.quiz_response:
+            VARIANT_CACHE.put(code_hash, language, seed, result.quiz_response)  # type: ignore[arg-type]
         return result
 
     except CodeRunException as e:
@@ -69,7 +166,67 @@ def run_generate(
 
     except Exception as e:
         logger.exception(
-            f"[Runtime Switcher] Unexpected error during {language} execution | path='{path}'"
+            f"[Runtime Switcher] Unexpected error during {language} execution | path='{name}'"
+        )
+        raise CodeRunException(error=str(e), http_status_code=500)
+
+
+def run_generate_batch(
+    path: ServerFile,
+    language: Literal["python", "javascript"],
+    seeds: list[int],
+    isTesting: bool = False,
+    cache: bool = True,
+) -> list[CodeRunResponse]:
+    """
+    Run code generation once per seed, loading the file a single time.
+    Variants already in the variant cache are not generated again; pass
+    `cache=False` for bulk sampling that should neither read nor fill it.
+    """
+    name = server_filename(path)
+    logger.debug(
+        f"[Runtime Switcher] Starting batch | language={language} | path='{name}' | variants={len(seeds)}"
+    )
+
+    try:
+        generator = GENERATOR_MAPPING[language]
+        if not is_pre_analyzed(path):
+            validate_server_file(path, extensions=generator.extensions)
+        target = runner_target(path)
+
+        code_hash = None if isTesting or not cache else server_file_hash(path)
+        if code_hash is None:
+            return generator.batch_runner(target, seeds, isTesting)
+
+        responses: dict[int, CodeRunResponse] = {}
+        for seed in seeds:
+            cached = VARIANT_CACHE.get(code_hash, language, seed)
+            if cached is not None:
+                responses[seed] = CodeRunResponse(
+                    success=True, quiz_response=cached, http_status_code=200
+                )
+        missing = [seed for seed in seeds if seed not in responses]
+        if missing:
+            generated = generator.batch_runner(target, missing, isTesting)
+            if len(generated) != len(missing):
+                # The file could not be loaded; the runner returned a single failure
+                return generated
+            for seed, result in zip(missing, generated):
+                responses[seed] = result
+                if result.success and result.quiz_response:
+                    VARIANT_CACHE.put(code_hash, language, seed, result.quiz_response)
+        return [responses[seed] for seed in seeds]
+
+    except CodeRunException as e:
+        logger.error(
+            f"[Runtime Switcher] Known CodeRunException in {language} batch | {e}",
+            exc_info=True,
+        )
+        raise
+
+    except Exception as e:
+        logger.exception(
+            f"[Runtime Switcher] Unexpected error during {language} batch | path='{name}'"
         )
         raise CodeRunException(error=str(e), http_status_code=500)
 
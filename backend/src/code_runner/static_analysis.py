@@ -0,0 +1,213 @@
+"""
+Static analysis of question server files, done once when a file is written.
+
+Checks that a server file parses and defines `generate`, and records the
+signature of `generate` and the modules the file imports, without running any
+question code. The result is stored as the question's runner metadata, so the
+run path can reject broken files immediately and hand valid ones to the runners
+with nothing left to re-validate.
+
+Python files are parsed with `ast`. JavaScript files are compiled (not run) on
+the Node.js worker pool for the syntax check; `generate` and imports are found
+by scanning the source with comments removed.
+"""
+
+# --- Standard Library ---
+import ast
+import re
+from typing import List, Optional, Tuple
+
+# --- Internal ---
+from src.api.core import logger
+from src.code_runner.generate_call import static_generate_args
+from src.code_runner.models import CodeRunException, ServerAnalysis, ServerSource
+from src.code_runner.utils import ServerFile, hash_source
+
+SERVER_LANGUAGES = {"server.py": "python", "server.js": "javascript"}
+
+MISSING_GENERATE = {
+    "python": "Function 'generate' not found or not callable in the Python module.",
+    "javascript": "The JavaScript file does not define a function named `generate`.",
+}
+
+# Strings are kept (imports live in them), comments are blanked
+_JS_STRINGS_OR_COMMENTS = re.compile(
+    r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|//[^\n]*|/\*.*?\*/",
+    re.DOTALL,
+)
+_JS_FUNCTION = re.compile(
+    r"(?<![\w$.])(?:async\s+)?function\s*\*?\s*generate\s*\(([^)]*)\)"
+)
+_JS_ASSIGNMENT = re.compile(
+    r"(?:(?<![\w$.])|(?:globalThis|this|window)\.)generate\s*=(?![=>])"
+)
+_JS_IMPORTS = re.compile(
+    r"(?<![\w$.])(?:require\s*\(\s*|import\s*\(\s*|import\s+(?:[\w$*{},\s]+\s+from\s+)?)"
+    r"(['\"])([^'\"]+)\1"
+)
+
+
+def _python_signature(node: ast.FunctionDef) -> Tuple[int, int]:
+    """(number of parameters, number of required positional parameters)."""
+    args = node.args
+    positional = len(args.posonlyargs) + len(args.args)
+    arity = positional + len(args.kwonlyargs) + bool(args.vararg) + bool(args.kwarg)
+    return arity, positional - len(args.defaults)
+
+
+def _python_imports(tree: ast.Module) -> List[str]:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.partition(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.partition(".")[0])
+    return sorted(names)
+
+
+def _binds_generate(node: ast.AST) -> bool:
+    """Whether `node` binds `generate` (or may, through `import *`)."""
+    for child in ast.walk(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if child.name == "generate":
+                return True
+        elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+            if child.id == "generate":
+                return True
+        elif isinstance(child, ast.alias):
+            if (child.asname or child.name) in ("generate", "*"):
+                return True
+    return False
+
+
+def analyze_python_source(source: str | bytes, filename: str = "server.py") -> ServerAnalysis:
+    """Parse a Python server file and describe its `generate` function."""
+    code_hash = hash_source(source)
+    try:
+        tree = ast.parse(source, filename=filename)
+    except (SyntaxError, ValueError) as e:
+        line = f" line {e.lineno}" if getattr(e, "lineno", None) else ""
+        return ServerAnalysis(
+            language="python",
+            code_hash=code_hash,
+            valid=False,
+            error=f"Syntax error in '{filename}'{line}: {getattr(e, 'msg', e)}",
+        )
+
+    # The last module-level binding of `generate` is the one the runner calls. Its
+    # signature is only known when that binding is a plain, undecorated `def`.
+    has_generate = False
+    signature: Optional[Tuple[int, int]] = None
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name != "generate":
+                continue
+            has_generate = True
+            plain = isinstance(node, ast.FunctionDef) and not node.decorator_list
+            signature = _python_signature(node) if plain else None  # type: ignore[arg-type]
+        elif _binds_generate(node):
+            has_generate = True
+            signature = None
+
+    return ServerAnalysis(
+        language="python",
+        code_hash=code_hash,
+        valid=has_generate,
+        error=None if has_generate else MISSING_GENERATE["python"],
+        has_generate=has_generate,
+        arity=signature[0] if signature else None,
+        required_args=signature[1] if signature else None,
+        imports=_python_imports(tree),
+    )
+
+
+def check_javascript_syntax(source: str) -> Optional[str]:
+    """
+    Compile `source` on the Node.js worker pool without running it.
+
+    Returns:
+        Optional[str]: The syntax error, or None if it compiled or could not be checked.
+    """
+    from src.code_runner.run_js import get_js_worker_pool
+
+    try:
+        response = get_js_worker_pool().run(source, op="analyze")
+    except CodeRunException as e:
+        logger.warning("[Static Analysis] Skipping JavaScript syntax check: %s", e)
+        return None
+    if response.get("kind") == "compile":
+        return response.get("error") or "Could not compile the JavaScript file."
+    return None
+
+
+def analyze_javascript_source(
+    source: str | bytes, filename: str = "server.js", check_syntax: bool = True
+) -> ServerAnalysis:
+    """Syntax-check a JavaScript server file and describe its `generate` function."""
+    code_hash = hash_source(source)
+    if isinstance(source, bytes):
+        source = source.decode("utf-8")
+
+    error = check_javascript_syntax(source) if check_syntax else None
+    if error is not None:
+        return ServerAnalysis(
+            language="javascript",
+            code_hash=code_hash,
+            valid=False,
+            error=f"Syntax error in '{filename}': {error}",
+        )
+
+    code = _JS_STRINGS_OR_COMMENTS.sub(lambda m: m.group(1) or " ", source)
+    imports = sorted({m.group(2) for m in _JS_IMPORTS.finditer(code)})
+    # Strings are blanked for the `generate` search so text cannot fake a definition
+    code = _JS_STRINGS_OR_COMMENTS.sub(lambda m: '""' if m.group(1) else " ", code)
+    function = _JS_FUNCTION.search(code)
+    has_generate = bool(function or _JS_ASSIGNMENT.search(code))
+    arity = None
+    if function and not _JS_ASSIGNMENT.search(code):
+        arity = len([p for p in function.group(1).split(",") if p.strip()])
+
+    return ServerAnalysis(
+        language="javascript",
+        code_hash=code_hash,
+        valid=has_generate,
+        error=None if has_generate else MISSING_GENERATE["javascript"],
+        has_generate=has_generate,
+        arity=arity,
+        imports=imports,
+    )
+
+
+def analyze_server_source(filename: str, content: str | bytes) -> Optional[ServerAnalysis]:
+    """Analyze a server file by name; None for files that are not server files."""
+    language = SERVER_LANGUAGES.get(filename)
+    if language == "python":
+        return analyze_python_source(content, filename)
+    if language == "javascript":
+        try:
+            return analyze_javascript_source(content, filename)
+        except UnicodeDecodeError as e:
+            return ServerAnalysis(
+                language="javascript",
+                code_hash=hash_source(content),
+                valid=False,
+                error=f"Could not read JavaScript file: {e}",
+            )
+    return None
+
+
+def known_generate_args(path: ServerFile, isTesting: bool) -> Optional[Tuple[int, ...]]:
+    """
+    Arguments for `generate` taken from the source's upload-time analysis, or None
+    when they have to be worked out from the live function.
+    """
+    analysis = path.analysis if isinstance(path, ServerSource) else None
+    if (
+        analysis is None
+        or not analysis.valid
+        or analysis.language != "python"
+        or analysis.arity is None
+        or analysis.required_args is None
+    ):
+        return None
+    return static_generate_args(analysis.arity, analysis.required_args, isTesting)
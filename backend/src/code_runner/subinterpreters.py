@@ -0,0 +1,437 @@
+"""
+Subinterpreter execution backend for Python question code.
+
+A pool of isolated subinterpreters (PEP 684, one GIL each) runs question code
+in parallel threads of the API process. Every subinterpreter has its own
+`sys.modules`, and every run executes the module body in a fresh namespace, so
+runs are isolated from the API and from each other without a process per run.
+
+Most third-party extension modules (numpy included) cannot be loaded into an
+isolated subinterpreter and may crash the process if they try. An import guard
+therefore only allows the standard library plus `PY_SUBINTERPRETER_ALLOWED_IMPORTS`;
+code that imports anything else is transparently re-run on the
+`PY_SUBINTERPRETER_FALLBACK` backend, as is everything when the interpreter does
+not provide subinterpreters at all.
+
+Subinterpreters cannot be interrupted: a run that never returns keeps its slot,
+and only the async runner's hard timeout answers the client.
+"""
+
+# --- Standard Library ---
+import importlib
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Third-Party ---
+from starlette import status
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.core.config import get_settings
+from src.code_runner import generate_call
+from src.code_runner.models import CodeRunResponse, RunMetrics
+from src.code_runner.run_py import read_python_source, validate_generate_result
+from src.code_runner.static_analysis import known_generate_args
+from src.code_runner.utils import ServerFile, hash_source, server_filename
+from src.code_runner.worker_pool import register_pool
+
+try:
+    import _interpreters  # type: ignore[import-not-found]
+except ImportError:  # Python < 3.13 or a build without subinterpreter support
+    _interpreters = None
+
+# Prefix of the ImportError raised by the guard inside a subinterpreter
+BLOCKED_IMPORT = "[subinterpreter] blocked import: "
+
+# Set up once per subinterpreter, after generate_call.py has been executed in it.
+# Requests are passed as `req_*` globals and the JSON reply is written to `reply_fd`.
+_SUBINTERPRETER_SETUP = """
+import json, os, random, sys, time, types
+
+sys.path[:] = _sys_path
+_CODE = {}
+
+
+class _ImportGuard:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        root = name.partition(".")[0]
+        if root in sys.stdlib_module_names or root in _allowed_imports:
+            return None
+        raise ImportError(_blocked_import + root)
+
+
+sys.meta_path.insert(0, _ImportGuard)
+
+
+def _to_jsonable(value):
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _is_blocked(error):
+    return isinstance(error, ImportError) and str(error).startswith(_blocked_import)
+
+
+def _run_one(code, seed):
+    if seed is not None:
+        random.seed(seed)
+    module = types.ModuleType("generate")
+    module.__file__ = req_filename
+    try:
+        exec(code, module.__dict__)
+    except Exception as e:
+        if _is_blocked(e):
+            raise
+        return {"status": "import", "error": f"Error executing module '{req_filename}': {e}"}
+    generate = getattr(module, "generate", None)
+    if not callable(generate):
+        return {"status": "missing"}
+    try:
+        result, logs = call_generate(generate, req_testing, _max_log_bytes, req_call_args)
+    except Exception as e:
+        if _is_blocked(e):
+            raise
+        return {"status": "error", "error": str(e)}
+    return {"status": "ok", "result": result, "logs": logs}
+
+
+def _run_request():
+    for stale in req_evict:
+        _CODE.pop(stale, None)
+    code = _CODE.get(req_hash)
+    if code is None:
+        try:
+            code = compile(req_source, req_filename, "exec")
+        except SyntaxError as e:
+            return {"kind": "compile", "error": f"Syntax error in '{req_filename}': {e}"}
+        _CODE[req_hash] = code
+        while len(_CODE) > _max_modules:
+            _CODE.pop(next(iter(_CODE)))
+
+    runs = []
+    for seed in req_seeds:
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            run = _run_one(code, seed)
+        except ImportError as e:  # only blocked imports propagate
+            return {"kind": "blocked", "error": str(e)}
+        run["metrics"] = {
+            "wall_time_ms": round((time.perf_counter() - started) * 1000, 3),
+            "cpu_time_ms": round((time.thread_time() - cpu_started) * 1000, 3),
+        }
+        runs.append(run)
+    return {"kind": "ok", "runs": runs}
+"""
+
+_SUBINTERPRETER_RUN = """
+_reply = json.dumps(_run_request(), default=_to_jsonable).encode("utf-8")
+os.ftruncate(reply_fd, 0)
+os.lseek(reply_fd, 0, 0)
+while _reply:
+    _reply = _reply[os.write(reply_fd, _reply):]
+"""
+
+
+def subinterpreters_available() -> bool:
+    return _interpreters is not None
+
+
+class SubinterpreterSlot:
+    """One isolated subinterpreter plus the file it writes its replies to."""
+
+    def __init__(
+        self,
+        allowed_imports: List[str],
+        max_modules: int,
+        max_log_bytes: Optional[int] = None,
+    ):
+        assert _interpreters is not None
+        self.id = _interpreters.create("isolated")
+        self.reply = tempfile.TemporaryFile()
+        self.runs = 0
+        self.pending_evictions: set[str] = set()
+        _interpreters.set___main___attrs(
+            self.id,
+            {
+                "_sys_path": tuple(sys.path),
+                "_allowed_imports": tuple(allowed_imports),
+                "_blocked_import": BLOCKED_IMPORT,
+                "_max_modules": max_modules,
+                "_max_log_bytes": max_log_bytes,
+                "reply_fd": self.reply.fileno(),
+            },
+        )
+        self._exec(Path(generate_call.__file__).read_text(encoding="utf-8"))
+        self._exec(_SUBINTERPRETER_SETUP)
+
+    def _exec(self, script: str) -> None:
+        assert _interpreters is not None
+        error = _interpreters.exec(self.id, script)
+        if error is not None:
+            raise RuntimeError(f"Subinterpreter {self.id} failed: {error.formatted}")
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        assert _interpreters is not None
+        _interpreters.set___main___attrs(
+            self.id,
+            {
+                **{f"req_{key}": value for key, value in request.items()},
+                "req_evict": tuple(self.pending_evictions),
+            },
+        )
+        self.pending_evictions.clear()
+        self._exec(_SUBINTERPRETER_RUN)
+        self.runs += 1
+        self.reply.seek(0)
+        return json.loads(self.reply.read())
+
+    def destroy(self) -> None:
+        assert _interpreters is not None
+        try:
+            _interpreters.destroy(self.id)
+        except Exception as e:
+            logger.warning("[Subinterpreters] Could not destroy %s: %s", self.id, e)
+        self.reply.close()
+
+
+class SubinterpreterPool:
+    """
+    A bounded pool of isolated subinterpreters, created lazily up to `size`.
+
+    Each call checks out one subinterpreter and runs in the calling thread; since
+    every subinterpreter has its own GIL, calls from different threads run in parallel.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        allowed_imports: List[str],
+        max_modules: int = 64,
+        max_runs: int = 1000,
+        max_log_bytes: Optional[int] = None,
+    ):
+        self.name = "Python subinterpreters"
+        self.size = size
+        self.allowed_imports = list(allowed_imports)
+        self.max_modules = max_modules
+        self.max_runs = max_runs
+        self.max_log_bytes = max_log_bytes
+        self.fallbacks = 0
+        self._idle: "queue.LifoQueue[SubinterpreterSlot]" = queue.LifoQueue()
+        self._slots: List[SubinterpreterSlot] = []
+        self._available = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _acquire(self) -> SubinterpreterSlot:
+        self._available.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            slot = SubinterpreterSlot(
+                self.allowed_imports, self.max_modules, self.max_log_bytes
+            )
+        except Exception:
+            self._available.release()
+            raise
+        with self._lock:
+            self._slots.append(slot)
+        return slot
+
+    def _release(self, slot: SubinterpreterSlot, healthy: bool) -> None:
+        try:
+            if not healthy or self._closed or slot.runs >= self.max_runs:
+                with self._lock:
+                    if slot in self._slots:
+                        self._slots.remove(slot)
+                slot.destroy()
+            else:
+                self._idle.put(slot)
+        finally:
+            self._available.release()
+
+    def run(
+        self,
+        source: str,
+        filename: str,
+        seeds: List[Optional[int]],
+        isTesting: bool = False,
+        call_args: Optional[Tuple[Any, ...]] = None,
+    ) -> Dict[str, Any]:
+        """Execute `source` once per seed in one subinterpreter and return its reply."""
+        slot = self._acquire()
+        healthy = False
+        try:
+            reply = slot.run(
+                {
+                    "hash": hash_source(source),
+                    "source": source,
+                    "filename": filename,
+                    "seeds": tuple(seeds),
+                    "testing": isTesting,
+                    "call_args": call_args,
+                }
+            )
+            healthy = True
+            return reply
+        finally:
+            self._release(slot, healthy)
+
+    def evict(self, code_hash: str) -> bool:
+        with self._lock:
+            for slot in self._slots:
+                slot.pending_evictions.add(code_hash)
+            return bool(self._slots)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": self.size,
+                "interpreters": len(self._slots),
+                "idle": self._idle.qsize(),
+                "fallbacks": self.fallbacks,
+                "max_runs": self.max_runs,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                if slot in self._slots:
+                    self._slots.remove(slot)
+            slot.destroy()
+
+
+_subinterpreter_pool: Optional[SubinterpreterPool] = None
+_subinterpreter_pool_lock = threading.Lock()
+
+
+def get_subinterpreter_pool() -> SubinterpreterPool:
+    """Return the process-wide subinterpreter pool, creating it on first use."""
+    global _subinterpreter_pool
+    with _subinterpreter_pool_lock:
+        if _subinterpreter_pool is None or _subinterpreter_pool.closed:
+            settings = get_settings()
+            _subinterpreter_pool = register_pool(
+                SubinterpreterPool(
+                    size=settings.PY_SUBINTERPRETER_POOL_SIZE or os.cpu_count() or 1,
+                    allowed_imports=settings.PY_SUBINTERPRETER_ALLOWED_IMPORTS,
+                    max_modules=settings.RUNNER_CACHE_MAX_ENTRIES,
+                    max_log_bytes=settings.RUNNER_MAX_LOG_BYTES,
+                )
+            )
+        return _subinterpreter_pool
+
+
+def _fallback_runners():
+    # Imported lazily: the runtime switcher itself imports this module
+    runtime_switcher = importlib.import_module("src.code_runner.runtime_switcher")
+    backend = get_settings().PY_SUBINTERPRETER_FALLBACK
+    return (
+        runtime_switcher.PYTHON_RUNNERS[backend],
+        runtime_switcher.PYTHON_BATCH_RUNNERS[backend],
+    )
+
+
+def to_code_run_response(run: Dict[str, Any], isTesting: bool) -> CodeRunResponse:
+    """Turn one subinterpreter run into the same response the in-process runner gives."""
+    if run["status"] == "ok":
+        response = validate_generate_result(run["result"], run["logs"], isTesting)
+    elif run["status"] == "missing":
+        response = CodeRunResponse(
+            success=False,
+            error="Function 'generate' not found or not callable in the Python module.",
+            quiz_response=None,
+            http_status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    else:
+        prefix = (
+            "Import error" if run["status"] == "import" else "Error executing 'generate'"
+        )
+        response = CodeRunResponse(
+            success=False,
+            error=f"{prefix}: {run['error']}",
+            quiz_response=None,
+            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    if run.get("metrics"):
+        response.metrics = RunMetrics(**run["metrics"])
+    return response
+
+
+def _run_subinterpreter(
+    path: ServerFile, seeds: List[Optional[int]], isTesting: bool
+) -> Optional[List[CodeRunResponse]]:
+    """Run on the pool; None means the caller must use the fallback backend."""
+    if not subinterpreters_available():
+        return None
+    source = read_python_source(path)
+    if isinstance(source, CodeRunResponse):
+        return [source]
+
+    pool = get_subinterpreter_pool()
+    reply = pool.run(
+        source,
+        server_filename(path),
+        seeds,
+        isTesting,
+        known_generate_args(path, isTesting),
+    )
+    if reply["kind"] == "blocked":
+        pool.fallbacks += 1
+        logger.info("[Subinterpreters] %s, using fallback backend", reply["error"])
+        return None
+    if reply["kind"] == "compile":
+        return [
+            CodeRunResponse(
+                success=False,
+                error=f"Import error: {reply['error']}",
+                quiz_response=None,
+                http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        ]
+    return [to_code_run_response(run, isTesting) for run in reply["runs"]]
+
+
+def run_generate_py_subinterpreter(
+    path: ServerFile, isTesting: bool = False, seed: Optional[int] = None
+) -> CodeRunResponse:
+    """Run a Python question file in a pooled subinterpreter (see module docstring)."""
+    responses = _run_subinterpreter(path, [seed], isTesting)
+    if responses is None:
+        runner, _ = _fallback_runners()
+        return runner(path, isTesting, seed)
+    return responses[0]
+
+
+def run_generate_py_subinterpreter_batch(
+    path: ServerFile, seeds: List[int], isTesting: bool = False
+) -> List[CodeRunResponse]:
+    """Run `generate` once per seed inside one pooled subinterpreter."""
+    responses = _run_subinterpreter(path, list(seeds), isTesting)
+    if responses is None:
+        _, batch_runner = _fallback_runners()
+        return batch_runner(path, seeds, isTesting)
+    return responses
@@ -1,4 +1,5 @@
 # --- Standard Library ---
+import hashlib
 from pathlib import Path
 from typing import List, Optional, Union
 
@@ -9,7 +10,17 @@ import execjs
 from typing import Any
 
 # --- Internal ---
-from src.code_runner.models import CodeRunResponse, CodeRunException
+from src.code_runner.models import CodeRunResponse, CodeRunException, ServerSource
+
+# A server file given either as a path on disk or as in-memory contents
+ServerFile = Union[str, Path, ServerSource]
+
+
+def hash_source(source: str | bytes) -> str:
+    """Return the SHA-256 hex digest used to key cached server modules."""
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    return hashlib.sha256(source).hexdigest()
 
 
 def normalize_path(path: Union[str, Path] | None) -> Path:
@@ -66,11 +77,76 @@ def validate_filepath(path: str | Path, extensions: Optional[List[str]]) -> Path
         )
 
 
-def append_javascript_logs(path: Path) -> str:
+def read_javascript_source(path: Path) -> str:
+    """Read a JavaScript file as UTF-8 text, raising CodeRunException on failure."""
     try:
-        user_js = path.read_text(encoding="utf-8")
+        return path.read_text(encoding="utf-8")
+
+    except UnicodeDecodeError:
+        raise CodeRunException(
+            error="File is not valid UTF-8 text.",
+            http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    except OSError as e:
+        raise CodeRunException(
+            error=f"Failed to read file: {e}",
+            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def server_filename(file: ServerFile) -> str:
+    """Name shown in tracebacks and logs for a server file."""
+    if isinstance(file, ServerSource):
+        return file.filename
+    return str(file)
+
+
+def validate_server_file(file: ServerFile, extensions: Optional[List[str]]) -> None:
+    """
+    Validate a server file given as a path (see `validate_filepath`) or as contents.
+
+    Raises:
+        CodeRunException: If the file is missing or has an unsupported extension.
+    """
+    if not isinstance(file, ServerSource):
+        validate_filepath(file, extensions)
+        return
+    suffix = Path(file.filename).suffix
+    if extensions and suffix not in set(extensions):
+        raise CodeRunException(
+            error=f"Unsupported file extension '{suffix}'. Expected one of {extensions}",
+            http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
 
-        js_code = f"""
+def read_server_source(file: ServerFile, extensions: Optional[List[str]]) -> str:
+    """
+    Validate a server file and return its text without touching disk for in-memory sources.
+
+    Raises:
+        CodeRunException: If the file is invalid or not UTF-8.
+    """
+    validate_server_file(file, extensions)
+    if not isinstance(file, ServerSource):
+        return read_javascript_source(normalize_path(file))
+    try:
+        return file.content.decode("utf-8")
+    except UnicodeDecodeError:
+        raise CodeRunException(
+            error="File is not valid UTF-8 text.",
+            http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+
+def append_javascript_logs(path: Path) -> str:
+    user_js = read_javascript_source(path)
+    return wrap_javascript_logs(user_js)
+
+
+def wrap_javascript_logs(user_js: str) -> str:
+    """Wrap user JavaScript with console capture and the `callWithLogs` shim."""
+    js_code = f"""
             var logs = [];
 
             // capture console.log into logs array
@@ -133,19 +209,7 @@ def append_javascript_logs(path: Path) -> str:
             }}
         """
 
-        return js_code
-
-    except UnicodeDecodeError:
-        raise CodeRunException(
-            error="File is not valid UTF-8 text.",
-            http_status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-        )
-
-    except OSError as e:
-        raise CodeRunException(
-            error=f"Failed to read file: {e}",
-            http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return js_code
 
 
 def compile_js_code(js_code: str):
@@ -0,0 +1,170 @@
+# --- Standard Library ---
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.core.config import get_settings
+from src.code_runner.models import QuizData
+from src.code_runner.module_cache import register_cache
+
+VariantKey = Tuple[str, str, int]  # (server file hash, language, seed)
+
+
+class VariantCache:
+    """
+    Bounded memo of generated `QuizData` keyed by (server file hash, language, seed).
+
+    A seeded run of unchanged server code always yields the same variant, so the
+    result can be served again without executing user code. The in-memory tier is
+    an LRU of at most `max_entries` variants. When `db_path` is set, variants are
+    also written to a SQLite table so they survive restarts and are shared between
+    API processes on the same host.
+    """
+
+    def __init__(
+        self,
+        name: str = "Variants",
+        max_entries: int = 4096,
+        db_path: Optional[str | Path] = None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.db_path = str(db_path) if db_path else None
+        self._entries: "OrderedDict[VariantKey, QuizData]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------------------
+    # Persistent tier
+    # -------------------------------------------------------------------------
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS variant_cache ("
+                " code_hash TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " seed INTEGER NOT NULL,"
+                " data TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (code_hash, language, seed))"
+            )
+            self._db.commit()
+        return self._db
+
+    def _read_disk(self, key: VariantKey) -> Optional[QuizData]:
+        db = self._connection()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT data FROM variant_cache WHERE code_hash = ? AND language = ? AND seed = ?",
+            key,
+        ).fetchone()
+        return QuizData.model_validate_json(row[0]) if row else None
+
+    def _write_disk(self, key: VariantKey, quiz_data: QuizData) -> None:
+        db = self._connection()
+        if db is None:
+            return
+        db.execute(
+            "INSERT OR REPLACE INTO variant_cache VALUES (?, ?, ?, ?, ?)",
+            (*key, quiz_data.model_dump_json(), time.time()),
+        )
+        db.commit()
+
+    # -------------------------------------------------------------------------
+    # Cache API
+    # -------------------------------------------------------------------------
+    def get(self, code_hash: str, language: str, seed: int) -> Optional[QuizData]:
+        """Return the memoized variant, promoting disk hits into memory."""
+        key = (code_hash, language, seed)
+        with self._lock:
+            quiz_data = self._entries.get(key)
+            if quiz_data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return quiz_data.model_copy(deep=True)
+            try:
+                quiz_data = self._read_disk(key)
+            except sqlite3.Error as e:
+                logger.warning("[VariantCache] Could not read %s: %s", self.db_path, e)
+                quiz_data = None
+            if quiz_data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, quiz_data)
+            return quiz_data.model_copy(deep=True)
+
+    def put(self, code_hash: str, language: str, seed: int, quiz_data: QuizData) -> None:
+        key = (code_hash, language, seed)
+        with self._lock:
+            self._remember(key, quiz_data.model_copy(deep=True))
+            try:
+                self._write_disk(key, quiz_data)
+            except sqlite3.Error as e:
+                logger.warning("[VariantCache] Could not write %s: %s", self.db_path, e)
+
+    def _remember(self, key: VariantKey, quiz_data: QuizData) -> None:
+        self._entries[key] = quiz_data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, code_hash: str) -> bool:
+        """Forget every variant generated from the server file with `code_hash`."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == code_hash]
+            for key in stale:
+                del self._entries[key]
+            removed = 0
+            db = self._connection()
+            if db is not None:
+                try:
+                    removed = db.execute(
+                        "DELETE FROM variant_cache WHERE code_hash = ?", (code_hash,)
+                    ).rowcount
+                    db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(
+                        "[VariantCache] Could not invalidate %s: %s", self.db_path, e
+                    )
+            return bool(stale) or removed > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM variant_cache")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "max_entries": self.max_entries,
+                "db_path": self.db_path,
+            }
+
+
+VARIANT_CACHE = register_cache(
+    VariantCache(
+        max_entries=get_settings().VARIANT_CACHE_MAX_ENTRIES,
+        db_path=get_settings().VARIANT_CACHE_DB_PATH,
+    )
+)
@@ -0,0 +1,363 @@
+"""
+Pre-generated variant pools for adaptive questions.
+
+In "pool" mode `/run_server` hands out a variant generated ahead of time instead
+of running `generate()` while the student waits. Every variant is generated with
+its own random seed, so it can still be reproduced later by requesting that seed.
+
+`VariantPool` stores up to `VARIANT_POOL_SIZE` variants per (server file hash,
+language) as zlib-compressed JSON, in memory and, when `VARIANT_POOL_DB_PATH` is
+set, in SQLite so pools survive restarts. Pools are keyed by content hash, so a
+changed server file starts a new pool and the old one is evicted together with the
+other runner caches. Only the pools of the questions being refilled are kept in
+memory; with SQLite the refiller and `take` reach the pool from a worker thread,
+so disk I/O never runs on the event loop.
+
+`VariantPoolRefiller` is the background scheduler: questions are registered the
+first time they are served in pool mode, and every variant taken wakes an asyncio
+task that tops the pools back up in small batches. Refills go through the same
+admission gate as requests and back off whenever requests are waiting for it.
+"""
+
+# --- Standard Library ---
+import asyncio
+import secrets
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# --- Internal ---
+from src.api.core import logger
+from src.api.core.config import get_settings
+from src.code_runner.async_runner import get_admission_gate, run_generate_batch_async
+from src.code_runner.models import CodeRunException, QuizData, ServerSource
+from src.code_runner.module_cache import register_cache
+from src.code_runner.utils import hash_source
+
+PoolKey = Tuple[str, str]  # (server file hash, language)
+PooledVariant = Tuple[int, bytes]  # (seed, compressed QuizData JSON)
+
+
+def pack_variant(quiz_data: QuizData) -> bytes:
+    return zlib.compress(quiz_data.model_dump_json().encode("utf-8"))
+
+
+def unpack_variant(data: bytes) -> QuizData:
+    return QuizData.model_validate_json(zlib.decompress(data))
+
+
+class VariantPool:
+    """Bounded FIFO pools of pre-generated variants keyed by (server file hash, language)."""
+
+    def __init__(
+        self,
+        name: str = "Variant pools",
+        size: int = 20,
+        db_path: Optional[str | Path] = None,
+    ):
+        self.name = name
+        self.size = size
+        self.db_path = str(db_path) if db_path else None
+        self._pools: Dict[PoolKey, Deque[PooledVariant]] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------------------
+    # Persistent tier
+    # -------------------------------------------------------------------------
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS variant_pool ("
+                " code_hash TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " seed INTEGER NOT NULL,"
+                " data BLOB NOT NULL,"
+                " PRIMARY KEY (code_hash, language, seed))"
+            )
+            self._db.commit()
+        return self._db
+
+    def _pool(self, key: PoolKey) -> Deque[PooledVariant]:
+        """The in-memory pool for `key`, loaded from disk the first time it is used."""
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        pool = deque()
+        db = self._connection()
+        if db is not None:
+            try:
+                rows = db.execute(
+                    "SELECT seed, data FROM variant_pool WHERE code_hash = ? AND language = ?"
+                    " ORDER BY rowid LIMIT ?",
+                    (*key, self.size),
+                ).fetchall()
+                pool.extend((seed, bytes(data)) for seed, data in rows)
+            except sqlite3.Error as e:
+                logger.warning("[VariantPool] Could not read %s: %s", self.db_path, e)
+        self._pools[key] = pool
+        return pool
+
+    def _write_disk(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        db = self._connection()
+        if db is None or not rows:
+            return
+        try:
+            db.executemany(sql, rows)
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning("[VariantPool] Could not write %s: %s", self.db_path, e)
+
+    # -------------------------------------------------------------------------
+    # Pool API
+    # -------------------------------------------------------------------------
+    def take(self, code_hash: str, language: str) -> Optional[Tuple[int, QuizData]]:
+        """Remove and return the oldest pooled variant with its seed, or None if empty."""
+        key = (code_hash, language)
+        with self._lock:
+            pool = self._pool(key)
+            if not pool:
+                self.misses += 1
+                return None
+            seed, data = pool.popleft()
+            self.hits += 1
+            self._write_disk(
+                "DELETE FROM variant_pool WHERE code_hash = ? AND language = ? AND seed = ?",
+                [(*key, seed)],
+            )
+        return seed, unpack_variant(data)
+
+    def add(self, code_hash: str, language: str, variants: List[Tuple[int, QuizData]]) -> int:
+        """Add generated variants up to the pool size; returns how many were kept."""
+        key = (code_hash, language)
+        with self._lock:
+            pool = self._pool(key)
+            room = max(self.size - len(pool), 0)
+            kept = [(seed, pack_variant(q)) for seed, q in variants[:room]]
+            pool.extend(kept)
+            self._write_disk(
+                "INSERT OR REPLACE INTO variant_pool VALUES (?, ?, ?, ?)",
+                [(*key, seed, data) for seed, data in kept],
+            )
+            return len(kept)
+
+    def level(self, code_hash: str, language: str) -> int:
+        with self._lock:
+            return len(self._pool((code_hash, language)))
+
+    def unload(self, code_hash: str, language: str) -> None:
+        """Drop a pool from memory; with SQLite it is loaded again when next used."""
+        with self._lock:
+            self._pools.pop((code_hash, language), None)
+
+    def evict(self, code_hash: str) -> bool:
+        """Drop the pools generated from the server file with `code_hash`."""
+        with self._lock:
+            stale = [key for key in self._pools if key[0] == code_hash]
+            for key in stale:
+                del self._pools[key]
+            removed = 0
+            db = self._connection()
+            if db is not None:
+                try:
+                    removed = db.execute(
+                        "DELETE FROM variant_pool WHERE code_hash = ?", (code_hash,)
+                    ).rowcount
+                    db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(
+                        "[VariantPool] Could not invalidate %s: %s", self.db_path, e
+                    )
+            return bool(stale) or removed > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pools.clear()
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM variant_pool")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "pools": len(self._pools),
+                "variants": sum(len(p) for p in self._pools.values()),
+                "bytes": sum(len(d) for p in self._pools.values() for _, d in p),
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": self.size,
+                "db_path": self.db_path,
+            }
+
+
+class VariantPoolRefiller:
+    """
+    Background task that keeps the pools of registered questions full.
+
+    Args:
+        pool (VariantPool): Where generated variants go.
+        batch_size (int): Variants generated per runner call.
+        max_questions (int): Questions tracked at once; the least recently served
+            one stops being refilled, and its pool leaves memory, first.
+        backoff (float): Seconds to wait while requests are queued for runners.
+    """
+
+    def __init__(
+        self,
+        pool: VariantPool,
+        batch_size: int = 5,
+        max_questions: int = 256,
+        backoff: float = 0.5,
+    ):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_questions = max_questions
+        self.backoff = backoff
+        self._targets: "OrderedDict[PoolKey, ServerSource]" = OrderedDict()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.generated = 0
+        self.failures = 0
+
+    def watch(self, source: ServerSource, language: str) -> PoolKey:
+        """Keep the pool of `source` full from now on, and wake the refill task."""
+        key = (hash_source(source.content), language)
+        self._targets[key] = source
+        self._targets.move_to_end(key)
+        while len(self._targets) > self.max_questions:
+            dropped, _ = self._targets.popitem(last=False)
+            self.pool.unload(*dropped)
+        self._ensure_running()
+        assert self._wakeup is not None
+        self._wakeup.set()
+        return key
+
+    async def take(
+        self, source: ServerSource, language: str
+    ) -> Optional[Tuple[int, QuizData]]:
+        """Serve a pooled variant of `source`, registering it for refills."""
+        code_hash, _ = self.watch(source, language)
+        return await self._pool_call(self.pool.take, code_hash, language)
+
+    async def _pool_call(self, method, *args):
+        """Call a pool method, in a worker thread when it may touch SQLite."""
+        if self.pool.db_path is None:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _needing_refill(self) -> List[PoolKey]:
+        # Most recently served first
+        return [
+            key
+            for key in list(reversed(self._targets))
+            if await self._pool_call(self.pool.level, *key) < self.pool.size
+        ]
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            for key in await self._needing_refill():
+                await self._refill(key)
+
+    async def _refill(self, key: PoolKey) -> None:
+        code_hash, language = key
+        while True:
+            source = self._targets.get(key)
+            if source is None:
+                return
+            level = await self._pool_call(self.pool.level, code_hash, language)
+            missing = self.pool.size - level
+            if missing <= 0:
+                return
+            gate = get_admission_gate().stats()
+            if gate["queued"] or gate["running"] >= gate["max_concurrency"]:
+                # Students are waiting on runners; pools can wait
+                await asyncio.sleep(self.backoff)
+                continue
+            seeds = [secrets.randbits(31) for _ in range(min(missing, self.batch_size))]
+            try:
+                responses = await run_generate_batch_async(source, language, seeds)  # type: ignore[arg-type]
+            except CodeRunException as e:
+                if e.response.http_status_code == 429:
+                    await asyncio.sleep(self.backoff)
+                    continue
+                responses = [e.response]
+            variants = [
+                (seed, r.quiz_response)
+                for seed, r in zip(seeds, responses)
+                if r.success and r.quiz_response is not None
+            ]
+            if not variants:
+                # A question that cannot generate is not retried until it is served again
+                self.failures += 1
+                self._targets.pop(key, None)
+                logger.warning(
+                    "[VariantPool] Stopped refilling %s pool %s: %s",
+                    language,
+                    code_hash[:12],
+                    responses[0].error if responses else "no variants",
+                )
+                return
+            self.generated += await self._pool_call(
+                self.pool.add, code_hash, language, variants
+            )
+            if key not in self._targets:
+                # Trimmed from the targets while this batch was generated
+                self.pool.unload(code_hash, language)
+
+    def evict(self, code_hash: str) -> bool:
+        """Stop refilling and drop the pools of the server file with `code_hash`."""
+        for key in [key for key in self._targets if key[0] == code_hash]:
+            del self._targets[key]
+        return self.pool.evict(code_hash)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.pool.stats(),
+            "questions": len(self._targets),
+            "generated": self.generated,
+            "failures": self.failures,
+            "refilling": self._task is not None and not self._task.done(),
+        }
+
+
+VARIANT_POOL = VariantPool(
+    size=get_settings().VARIANT_POOL_SIZE,
+    db_path=get_settings().VARIANT_POOL_DB_PATH,
+)
+
+VARIANT_POOL_REFILLER = register_cache(
+    VariantPoolRefiller(
+        VARIANT_POOL,
+        batch_size=get_settings().VARIANT_POOL_REFILL_BATCH,
+        max_questions=get_settings().VARIANT_POOL_MAX_QUESTIONS,
+    )
+)
@@ -0,0 +1,264 @@
+"""
+Variant-space analysis: what a question's generator actually produces.
+
+`generate()` is run for `n` consecutive seeds, in chunks spread over the runner
+workers, and every value in `params` and `correct_answers` is collected into a
+column (nested lists and dicts are flattened to paths such as
+`correct_answers.roots[1]`). Numeric columns become NumPy arrays summarized by
+min/max, mean, quantiles and a histogram, with counts of non-finite, zero and
+negative values; other columns report their most frequent values. Failed seeds
+and variants identical to an earlier one are counted too.
+
+Samples bypass the variant cache so they do not push out variants students are
+being served; instead the finished report is cached per (server file hash,
+language, seed, n) and dropped when the file changes.
+"""
+
+# --- Standard Library ---
+import asyncio
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+# --- Third-Party ---
+import numpy as np
+
+# --- Internal ---
+from src.api.core.config import get_settings
+from src.code_runner.async_runner import run_generate_batch_async
+from src.code_runner.models import (
+    CodeRunException,
+    CodeRunResponse,
+    ColumnStats,
+    QuizData,
+    VariantSpaceReport,
+)
+from src.code_runner.module_cache import register_cache
+from src.code_runner.runtime_switcher import server_file_hash
+from src.code_runner.utils import ServerFile
+
+SAMPLED_FIELDS = ("params", "correct_answers")
+HISTOGRAM_BINS = 10
+TOP_VALUES = 5
+MAX_REPORTED_ERRORS = 5
+
+ReportKey = Tuple[str, str, int, int]  # (server file hash, language, seed, n)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def flatten_values(path: str, value: Any) -> Iterator[Tuple[str, Any]]:
+    """Yield (path, leaf) for every scalar inside a JSON-like value."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from flatten_values(f"{path}.{key}", child)
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from flatten_values(f"{path}[{i}]", child)
+    else:
+        yield path, value
+
+
+def summarize_column(path: str, values: List[Any], samples: int) -> ColumnStats:
+    """Summarize the values one path took across `samples` successful variants."""
+    count = len(values)
+    if count and all(_is_number(v) for v in values):
+        array = np.asarray(values, dtype=np.float64)
+        finite = array[np.isfinite(array)]
+        stats = ColumnStats(
+            path=path,
+            kind="number",
+            count=count,
+            missing=samples - count,
+            distinct=int(np.unique(array).size),
+            non_finite=int(count - finite.size),
+            zeros=int(np.count_nonzero(array == 0)),
+            negatives=int(np.count_nonzero(array < 0)),
+        )
+        if finite.size:
+            p5, p50, p95 = np.percentile(finite, [5, 50, 95])
+            counts, edges = np.histogram(finite, bins=HISTOGRAM_BINS)
+            stats.min = float(finite.min())
+            stats.max = float(finite.max())
+            stats.mean = float(finite.mean())
+            stats.std = float(finite.std())
+            stats.quantiles = {"p5": float(p5), "p50": float(p50), "p95": float(p95)}
+            stats.histogram = {
+                "edges": edges.tolist(),
+                "counts": counts.astype(float).tolist(),
+            }
+        return stats
+
+    # Strings, booleans, nulls or a mix of types: count by JSON form
+    counter = Counter(json.dumps(v, sort_keys=True, default=str) for v in values)
+    return ColumnStats(
+        path=path,
+        kind="other",
+        count=count,
+        missing=samples - count,
+        distinct=len(counter),
+        top=[(json.loads(v), c) for v, c in counter.most_common(TOP_VALUES)],
+    )
+
+
+def build_variant_space_report(
+    language: Literal["python", "javascript"],
+    code_hash: str,
+    seed: int,
+    responses: List[CodeRunResponse],
+    wall_time_ms: float,
+) -> VariantSpaceReport:
+    """Collect sampled variants into columns and summarize each one."""
+    variants: List[QuizData] = []
+    errors: List[str] = []
+    for response in responses:
+        if response.success and response.quiz_response is not None:
+            variants.append(response.quiz_response)
+        elif len(errors) < MAX_REPORTED_ERRORS and (response.error or "") not in errors:
+            errors.append(response.error or "No quiz data")
+
+    columns: Dict[str, List[Any]] = {}
+    seen = set()
+    duplicates = 0
+    for variant in variants:
+        fingerprint = json.dumps(
+            [getattr(variant, field) for field in SAMPLED_FIELDS],
+            sort_keys=True,
+            default=str,
+        )
+        duplicates += fingerprint in seen
+        seen.add(fingerprint)
+        for field in SAMPLED_FIELDS:
+            for path, value in flatten_values(field, getattr(variant, field)):
+                columns.setdefault(path, []).append(value)
+
+    return VariantSpaceReport(
+        language=language,
+        code_hash=code_hash,
+        seed=seed,
+        samples=len(responses),
+        failures=len(responses) - len(variants),
+        errors=errors,
+        duplicates=duplicates,
+        columns={
+            path: summarize_column(path, values, len(variants))
+            for path, values in columns.items()
+        },
+        wall_time_ms=round(wall_time_ms, 3),
+    )
+
+
+class VariantSpaceCache:
+    """LRU of finished reports keyed by (server file hash, language, seed, n)."""
+
+    def __init__(self, name: str = "Variant space reports", max_entries: int = 64):
+        self.name = name
+        self.max_entries = max_entries
+        self._reports: "OrderedDict[ReportKey, VariantSpaceReport]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ReportKey) -> Optional[VariantSpaceReport]:
+        with self._lock:
+            report = self._reports.get(key)
+            if report is None:
+                self.misses += 1
+                return None
+            self._reports.move_to_end(key)
+            self.hits += 1
+            return report
+
+    def put(self, key: ReportKey, report: VariantSpaceReport) -> None:
+        with self._lock:
+            self._reports[key] = report
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_entries:
+                self._reports.popitem(last=False)
+
+    def evict(self, code_hash: str) -> bool:
+        with self._lock:
+            stale = [key for key in self._reports if key[0] == code_hash]
+            for key in stale:
+                del self._reports[key]
+            return bool(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._reports),
+                "hits": self.hits,
+                "misses": self.misses,
+                "max_entries": self.max_entries,
+            }
+
+
+VARIANT_SPACE_CACHE = register_cache(
+    VariantSpaceCache(max_entries=get_settings().VARIANT_SPACE_CACHE_ENTRIES)
+)
+
+
+async def analyze_variant_space(
+    path: ServerFile,
+    language: Literal["python", "javascript"],
+    n: int,
+    seed: int = 0,
+    chunk_size: Optional[int] = None,
+) -> VariantSpaceReport:
+    """
+    Sample `generate()` for seeds `seed .. seed + n - 1` and summarize the results.
+
+    Chunks of `chunk_size` seeds run concurrently through the admission gate, so
+    a large sample is spread over the runner workers like any other batch.
+
+    Raises:
+        CodeRunException: If the server file cannot be loaded or the runners are busy.
+    """
+    code_hash = server_file_hash(path)
+    key = (code_hash, language, seed, n) if code_hash else None
+    if key is not None:
+        cached = VARIANT_SPACE_CACHE.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True})
+
+    start = time.perf_counter()
+    chunk_size = chunk_size or get_settings().VARIANT_SPACE_CHUNK_SIZE
+    seeds = list(range(seed, seed + n))
+    chunks = [seeds[i : i + chunk_size] for i in range(0, n, chunk_size)]
+    results = await asyncio.gather(
+        *(
+            run_generate_batch_async(path, language, chunk, cache=False)
+            for chunk in chunks
+        )
+    )
+
+    responses: List[CodeRunResponse] = []
+    for chunk, chunk_responses in zip(chunks, results):
+        if len(chunk_responses) != len(chunk):
+            # The file could not be loaded; the runner returned a single failure
+            failure = chunk_responses[0]
+            raise CodeRunException(
+                error=failure.error or "Server file could not be loaded",
+                http_status_code=failure.http_status_code or 500,
+            )
+        responses.extend(chunk_responses)
+
+    report = build_variant_space_report(
+        language,
+        code_hash or "",
+        seed,
+        responses,
+        (time.perf_counter() - start) * 1000,
+    )
+    if key is not None:
+        VARIANT_SPACE_CACHE.put(key, report)
+    return report
@@ -0,0 +1,432 @@
+# --- Standard Library ---
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+# --- Third-Party ---
+from starlette import status
+
+# --- Internal ---
+from src.api.core import logger
+from src.code_runner.models import CodeRunException
+from src.code_runner.module_cache import Evictable, register_cache, unregister_cache
+from src.code_runner.utils import hash_source
+
+
+class WorkerTimeout(Exception):
+    """Raised when a worker does not answer within the allotted time."""
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker exits or writes something that is not a response."""
+
+
+class WorkerCancelled(Exception):
+    """Raised when the caller abandons a run while a worker is executing it."""
+
+
+# Set by the async runner so a run can be aborted from the event loop thread
+# (client disconnect or hard timeout) while a pool thread waits on a worker.
+CANCEL_EVENT: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "worker_pool_cancel_event", default=None
+)
+
+# How often a waiting call checks its cancel event
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class PoolWorker:
+    """
+    A single long-lived worker process speaking newline-delimited JSON over stdio.
+
+    Every request is one JSON object on the worker's stdin and every response is one
+    JSON object on its stdout. Anything the worker writes to stderr is passed through.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        cwd: Optional[str | Path] = None,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        self.command = list(command)
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,
+            cwd=cwd,
+            env={**os.environ, **env} if env else None,
+        )
+        self.runs = 0
+        # Content hashes this worker has already compiled and keeps resident
+        self.loaded: set[str] = set()
+        # Hashes to drop from the worker's cache with the next request
+        self.pending_evictions: set[str] = set()
+        self._buffer = b""
+        self._ids = itertools.count(1)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send one request and block until its response arrives, `timeout` elapses,
+        or `cancel` is set.
+        """
+        request_id = next(self._ids)
+        message = json.dumps({**payload, "id": request_id}) + "\n"
+        try:
+            assert self.process.stdin
+            self.process.stdin.write(message.encode("utf-8"))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashed(f"Could not write to worker {self.pid}: {e}")
+
+        line = self._read_line(deadline=time.monotonic() + timeout, cancel=cancel)
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise WorkerCrashed(f"Worker {self.pid} sent an invalid response: {e}")
+        if response.get("id") != request_id:
+            raise WorkerCrashed(
+                f"Worker {self.pid} answered request {response.get('id')}, expected {request_id}"
+            )
+        return response
+
+    def _read_line(
+        self, deadline: float, cancel: Optional[threading.Event] = None
+    ) -> bytes:
+        assert self.process.stdout
+        fd = self.process.stdout.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while b"\n" not in self._buffer:
+                if cancel is not None and cancel.is_set():
+                    raise WorkerCancelled(f"Run on worker {self.pid} was cancelled")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WorkerTimeout(f"Worker {self.pid} timed out")
+                if cancel is not None:
+                    remaining = min(remaining, CANCEL_POLL_INTERVAL)
+                if not selector.select(timeout=remaining):
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    raise WorkerCrashed(
+                        f"Worker {self.pid} exited with code {self.process.poll()}"
+                    )
+                self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.warning("[WorkerPool] Worker %s did not exit after kill", self.pid)
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                if stream:
+                    stream.close()
+            except OSError:
+                pass
+
+
+class WorkerPool:
+    """
+    A bounded pool of long-lived worker processes that keep question code resident.
+
+    Workers are started lazily up to `size`. Each call checks out an idle worker,
+    sends it the module's content hash (and the source only when that worker has not
+    compiled it yet), and waits at most `timeout` seconds. A worker that times out or
+    crashes is killed and replaced; a healthy worker is recycled after `max_runs` calls.
+    When every worker is busy, at most `max_queue` callers wait for one; further
+    callers are rejected with 503 so a burst cannot pile up unbounded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        command: Sequence[str],
+        size: int = 4,
+        timeout: float = 10.0,
+        max_runs: int = 500,
+        max_queue: Optional[int] = None,
+        cwd: Optional[str | Path] = None,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.name = name
+        self.command = list(command)
+        self.size = size
+        self.timeout = timeout
+        self.max_runs = max_runs
+        self.max_queue = max_queue
+        self.cwd = cwd
+        self.env = env
+        self.module_hits = 0
+        self.module_misses = 0
+
+        self._idle: deque[PoolWorker] = deque()
+        self._workers: List[PoolWorker] = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._closed = False
+
+    # -------------------------------------------------------------------------
+    # Worker lifecycle
+    # -------------------------------------------------------------------------
+    def _spawn(self) -> PoolWorker:
+        try:
+            worker = PoolWorker(self.command, cwd=self.cwd, env=self.env)
+        except FileNotFoundError:
+            raise CodeRunException(
+                error=f"Could not start {self.name} worker: '{self.command[0]}' is not installed.",
+                http_status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            )
+        logger.debug("[WorkerPool] Started %s worker pid=%s", self.name, worker.pid)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _discard(self, worker: PoolWorker) -> None:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def _wait_for_slot(self) -> None:
+        if self._slots.acquire(blocking=False):
+            return
+        with self._lock:
+            if self.max_queue is not None and self._waiting >= self.max_queue:
+                raise CodeRunException(
+                    error=f"The {self.name} runner is busy ({self._waiting} runs queued), try again shortly.",
+                    http_status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            self._waiting += 1
+        try:
+            self._slots.acquire()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def _acquire(self) -> PoolWorker:
+        self._wait_for_slot()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise CodeRunException(
+                    error=f"The {self.name} worker pool has been shut down.",
+                    http_status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                self._workers.remove(worker)
+        try:
+            return self._spawn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: PoolWorker, healthy: bool) -> None:
+        try:
+            if not healthy or self._closed or not worker.is_alive():
+                self._discard(worker)
+            elif worker.runs >= self.max_runs:
+                logger.debug(
+                    "[WorkerPool] Recycling %s worker pid=%s after %s runs",
+                    self.name,
+                    worker.pid,
+                    worker.runs,
+                )
+                self._discard(worker)
+            else:
+                with self._lock:
+                    self._idle.append(worker)
+        finally:
+            self._slots.release()
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+    def run(
+        self,
+        source: str,
+        args: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        op: str = "run",
+    ) -> Dict[str, Any]:
+        """
+        Execute `source` on a pooled worker and return the worker's response.
+
+        Args:
+            source (str): Full source of the question's server file.
+            args (Optional[Dict[str, Any]]): Operation arguments forwarded to the worker.
+            timeout (Optional[float]): Per-call timeout in seconds; defaults to the pool timeout.
+            op (str): Worker operation name.
+
+        Returns:
+            Dict[str, Any]: The worker response (`ok`, plus `data` or `error`/`kind`).
+
+        Raises:
+            CodeRunException: If the worker times out, crashes, or cannot be started.
+        """
+        code_hash = hash_source(source)
+        timeout = timeout or self.timeout
+        cancel = CANCEL_EVENT.get()
+        worker = self._acquire()
+        healthy = False
+        try:
+            payload: Dict[str, Any] = {"op": op, "hash": code_hash, "args": args or {}}
+            if worker.pending_evictions:
+                payload["evict"] = sorted(worker.pending_evictions)
+                worker.pending_evictions.clear()
+            with self._lock:
+                if code_hash in worker.loaded:
+                    self.module_hits += 1
+                else:
+                    self.module_misses += 1
+                    payload["source"] = source
+            response = worker.request(payload, timeout, cancel)
+            payload.pop("evict", None)
+
+            # The worker evicted the module from its own cache, send it again
+            if response.get("kind") == "missing_source":
+                worker.loaded.discard(code_hash)
+                response = worker.request(
+                    {**payload, "source": source}, timeout, cancel
+                )
+
+            if response.get("kind") != "compile":
+                worker.loaded.add(code_hash)
+            worker.runs += 1
+            healthy = True
+            return response
+        except WorkerTimeout:
+            logger.warning(
+                "[WorkerPool] %s worker pid=%s exceeded %ss, killing it",
+                self.name,
+                worker.pid,
+                timeout,
+            )
+            raise CodeRunException(
+                error=f"{self.name} execution timed out after {timeout} seconds.",
+                http_status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            )
+        except WorkerCancelled:
+            logger.info(
+                "[WorkerPool] Run on %s worker pid=%s cancelled, killing it",
+                self.name,
+                worker.pid,
+            )
+            raise CodeRunException(
+                error=f"{self.name} execution was cancelled.",
+                http_status_code=499,
+            )
+        except WorkerCrashed as e:
+            logger.error("[WorkerPool] %s worker crashed: %s", self.name, e)
+            raise CodeRunException(
+                error=f"{self.name} worker crashed during execution: {e}",
+                http_status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        finally:
+            self._release(worker, healthy)
+
+    def evict(self, code_hash: str) -> bool:
+        """Ask every worker holding `code_hash` to drop it with its next request."""
+        evicted = False
+        with self._lock:
+            for worker in self._workers:
+                if code_hash in worker.loaded:
+                    worker.loaded.discard(code_hash)
+                    worker.pending_evictions.add(code_hash)
+                    evicted = True
+        return evicted
+
+    def prestart(self) -> None:
+        """Start workers up to the pool size ahead of the first request."""
+        with self._lock:
+            missing = self.size - len(self._workers)
+        for _ in range(max(missing, 0)):
+            worker = self._spawn()
+            with self._lock:
+                self._idle.append(worker)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": self.size,
+                "workers": len(self._workers),
+                "idle": len(self._idle),
+                "queued": self._waiting,
+                "max_queue": self.max_queue,
+                "module_hits": self.module_hits,
+                "module_misses": self.module_misses,
+                "max_runs": self.max_runs,
+                "timeout": self.timeout,
+            }
+
+    def shutdown(self) -> None:
+        """Kill every worker; later calls fail with 503."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+            self._idle.clear()
+        for worker in workers:
+            worker.kill()
+        logger.debug("[WorkerPool] Shut down %s pool", self.name)
+
+
+_POOLS: List[Any] = []
+
+
+PoolT = TypeVar("PoolT", bound=Evictable)
+
+
+def register_pool(pool: PoolT) -> PoolT:
+    """Track a pool so it is torn down on application shutdown and sees invalidations."""
+    _POOLS.append(pool)
+    register_cache(pool)
+    return pool
+
+
+def shutdown_worker_pools() -> None:
+    while _POOLS:
+        pool = _POOLS.pop()
+        unregister_cache(pool)
+        pool.shutdown()
+
+
+atexit.register(shutdown_worker_pools)
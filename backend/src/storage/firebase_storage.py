@@ -97,9 +97,11 @@ class FirebaseStorage(StorageService):
     def read_file(
         self, target: str | Path, filename: Optional[str] = None
     ) -> bytes | None:
-        if self.does_file_exist(target, filename):
+        # A single download request; a missing blob surfaces as NotFound
+        try:
             return self.get_blob(target, filename).download_as_bytes()
-        return None
+        except NotFound:
+            return None
 
     def get_blob(self, blob_name: str | Path, filename: Optional[str] = None) -> Blob:
         if isinstance(blob_name, Path):
@@ -262,7 +262,7 @@ class LocalStorageService(StorageService):
         Args:
             identifier: Unique identifier for the stored resource.
         """
-        target = Path(self.get_storage_path(target))
+        target = Path(self.get_storage_path(target, relative=False))
         logger.info(f"Target to delete {target}")
         if target.exists():
             for f in target.iterdir():